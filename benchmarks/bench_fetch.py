@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Fetch Resilience Benchmark
+Runs HttpEngine against the fault-injecting server with and without retries
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fault_server import Faults, start
+from golfdeals.http import HttpEngine
+from golfdeals.limits import RetryPolicy
+
+URLS = 200
+
+
+def run(base, label, **engine_options):
+    urls = [f"{base}/category-{i}.htm" for i in range(URLS)]
+    with HttpEngine(concurrency=16, per_host=8, timeout=2, **engine_options) as engine:
+        start_time = time.perf_counter()
+        results = engine.fetch_many(urls)
+        elapsed = time.perf_counter() - start_time
+    ok = sum(result.ok for result in results)
+    attempts = sum(result.attempts for result in results)
+    print(f"{label:<22} {ok:>4}/{len(urls)} ok  {attempts:>4} requests  {elapsed:6.2f} s")
+    return results
+
+
+def main():
+    faults = Faults(error_rate=0.2, throttle_rate=0.1, stall_rate=0.02, latency=0.02, stall=5)
+    server, base, _ = start(faults)
+    try:
+        run(base, "single attempt", retry=RetryPolicy(attempts=1))
+        run(base, "3 attempts", retry=RetryPolicy(attempts=3, base_delay=0.1))
+        run(base, "3 attempts, 50 req/s", retry=RetryPolicy(attempts=3, base_delay=0.1), rate=50)
+    finally:
+        server.shutdown()
+
+    server, base, counts = start(Faults(down=True))
+    try:
+        results = run(base, "host down, breaker", retry=RetryPolicy(attempts=3, base_delay=0.1),
+                      breaker_threshold=5)
+        fast = sum(result.error.startswith('circuit open') for result in results)
+        print(f"{'':<22} {counts['requests']} requests reached the server, {fast} failed fast")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Parse Pool Benchmark
+Parses the saved fixtures inline and through ParsePool at each worker count
+"""
+
+import asyncio
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from golfdeals.parsing import GCW_RULES, GOLF_TOWN_RULES, parse_page
+from golfdeals.pipeline import ParsePool, default_workers
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_pages(copies):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        rules = GCW_RULES if os.path.basename(path).startswith('gcw') else GOLF_TOWN_RULES
+        pages.append((text, path, rules))
+    return pages * copies
+
+
+async def parse_all(pool, pages):
+    return await asyncio.gather(*(pool.parse(text, url, rules) for text, url, rules in pages))
+
+
+def main(copies=200):
+    pages = load_pages(copies)
+    if not pages:
+        sys.exit("No fixtures found - run benchmarks/make_fixtures.py first")
+    size = sum(len(text) for text, _, _ in pages) / 1e6
+
+    start = time.perf_counter()
+    expected = sum(len(parse_page(text, url, rules).deals) for text, url, rules in pages)
+    inline = time.perf_counter() - start
+    print(f"{len(pages)} pages, {size:.1f} MB, {default_workers()} core(s) available")
+    print(f"{'inline':>11} {inline:8.3f} s  {len(pages) / inline:8.0f} pages/s")
+
+    cores = default_workers()
+    for workers in sorted({1, 2, cores, 2 * cores}):
+        with ParsePool(workers) as pool:
+            asyncio.run(parse_all(pool, pages[:workers]))  # start the workers
+            start = time.perf_counter()
+            results = asyncio.run(parse_all(pool, pages))
+            elapsed = time.perf_counter() - start
+        if sum(len(result.deals) for result in results) != expected:
+            sys.exit(f"❌ Pool with {workers} workers found a different number of deals")
+        print(f"{workers:>3} workers{elapsed:8.3f} s  {len(pages) / elapsed:8.0f} pages/s  "
+              f"{inline / elapsed:5.2f}x inline")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmark
+Compares golfdeals.parsing against the original per-call re.finditer parsers
+
+Both are scored against the products make_fixtures.py wrote to each page.
+The legacy parsers scan raw markup, so their names come out wrapped in
+tags; the engine reads extracted tile text.
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from golfdeals.extract import BACKEND
+from golfdeals.parsing import GCW_RULES, GOLF_TOWN_RULES, parse_page
+from make_fixtures import expected_deals
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def legacy_parse_gcw_deals(text, url):
+    """Parser as it shipped in find_deals_simple.py before the engine"""
+    deals = []
+    pattern = r'([^·]+?)·\s*Our Price[:\s]*\$([0-9,]+\.?\d*)\s*·\s*Sale Price[:\s]*\$([0-9,]+\.?\d*)\s*·\s*You save \$([0-9,]+\.?\d*)'
+    for match in re.finditer(pattern, text, re.IGNORECASE):
+        try:
+            product_name = match.group(1).strip()
+            product_name = re.sub(r'(Deal of the Day Price:|You save.*)', '', product_name).strip()
+            original_price = float(match.group(2).replace(',', ''))
+            sale_price = float(match.group(3).replace(',', ''))
+            savings = float(match.group(4).replace(',', ''))
+            discount_pct = (savings / original_price * 100) if original_price > 0 else 0
+            if product_name and original_price > 0:
+                deals.append({
+                    'product_name': product_name,
+                    'original_price': original_price,
+                    'sale_price': sale_price,
+                    'savings': savings,
+                    'discount_pct': round(discount_pct, 1),
+                    'url': url,
+                    'source': 'Golf Clearance Warehouse'
+                })
+        except:
+            pass
+    return deals
+
+
+def legacy_parse_golf_town_deals(text, url):
+    """Parser as it shipped in find_deals_simple.py before the engine"""
+    deals = []
+    pattern = r'([^·]+?)·\s*\$([0-9,]+\.?\d*)\s+\$([0-9,]+\.?\d*)\s+\((\d+)%\s+off\)'
+    for match in re.finditer(pattern, text):
+        try:
+            product_name = match.group(1).strip()
+            product_name = re.sub(r'(Clearance|Final Sale|Waterproof)', '', product_name).strip()
+            original_price = float(match.group(2).replace(',', ''))
+            sale_price = float(match.group(3).replace(',', ''))
+            discount_pct = int(match.group(4))
+            savings = original_price - sale_price
+            if product_name and original_price > 0:
+                deals.append({
+                    'product_name': product_name,
+                    'original_price': original_price,
+                    'sale_price': sale_price,
+                    'savings': savings,
+                    'discount_pct': discount_pct,
+                    'url': url,
+                    'source': 'Golf Town'
+                })
+        except:
+            pass
+    return deals
+
+
+def load_corpus():
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        gcw = os.path.basename(path).startswith('gcw')
+        corpus.append((path, text, gcw))
+    return corpus
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(repeat=20):
+    corpus = load_corpus()
+    if not corpus:
+        sys.exit("No fixtures found - run benchmarks/make_fixtures.py first")
+
+    def legacy():
+        for path, text, gcw in corpus:
+            (legacy_parse_gcw_deals if gcw else legacy_parse_golf_town_deals)(text, path)
+
+    def engine():
+        for path, text, gcw in corpus:
+            parse_page(text, path, GCW_RULES if gcw else GOLF_TOWN_RULES)
+
+    print(f"{'page':<22} {'products':>8} {'legacy ok':>10} {'engine ok':>10} {'engine failed':>14}")
+    for path, text, gcw in corpus:
+        expected = set(expected_deals(os.path.basename(path)))
+        old = (legacy_parse_gcw_deals if gcw else legacy_parse_golf_town_deals)(text, path)
+        new = parse_page(text, path, GCW_RULES if gcw else GOLF_TOWN_RULES)
+        old_ok = sum((deal['product_name'], deal['sale_price']) in expected for deal in old)
+        new_ok = sum((deal.product_name, deal.sale_price) in expected for deal in new.deals)
+        if new_ok != len(new.deals):
+            sys.exit(f"❌ The engine read a product wrong on {path}")
+        print(f"{os.path.basename(path):<22} {len(expected):>8} {old_ok:>10} {new_ok:>10} "
+              f"{new.failures:>14}")
+
+    total = sum(len(text) for _, text, _ in corpus)
+    # The legacy patterns rescan long markup runs quadratically, so time them less often
+    old_time = best_of(legacy, max(1, repeat // 10))
+    new_time = best_of(engine, repeat)
+    print(f"Legacy parsers: {old_time * 1000:8.2f} ms  ({total / old_time / 1e6:6.1f} MB/s)")
+    print(f"Parse engine:   {new_time * 1000:8.2f} ms  ({total / new_time / 1e6:6.1f} MB/s, {BACKEND})")
+    print(f"Speedup:        {old_time / new_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
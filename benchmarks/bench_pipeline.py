@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Replays the fixture pages, and copies scaled 10x to 1000x, through parsing, rendering and JSON writes
+
+Everything runs offline. Each stage reports throughput, p50/p99 latency
+and peak traced memory, and is compared against a saved baseline:
+
+    python benchmarks/bench_pipeline.py --save-baseline   # record this machine
+    python benchmarks/bench_pipeline.py                   # compare, exit 1 on regression
+
+Baselines are machine specific, so benchmarks/baseline.json is not
+committed. The 1000x scale renders about 180k deals and takes minutes;
+``--scales 1,10,100`` gives a quick check.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from golfdeals.dashboard import generate_dashboard
+from golfdeals.finder import SimpleDealFinder
+from golfdeals.records import DealBatch
+from golfdeals.storage import save_deals_json, save_raw_deals
+from make_fixtures import FIXTURES, PAGES
+
+SCALES = (1, 10, 100, 1000)
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+PAGE_DEALS = 48
+
+
+def load_pages(scale):
+    """(filename, text) for each fixture page, recorded at 1x and regenerated with more products above"""
+    pages = []
+    for filename, (build, category, seed) in PAGES.items():
+        path = os.path.join(FIXTURES, filename)
+        if scale == 1 and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        else:
+            text = build(category, count=PAGE_DEALS * scale, seed=seed)
+        pages.append((filename, text))
+    return pages
+
+
+def repeats_for(scale, repeat):
+    return max(3, repeat // scale)
+
+
+def measure(fn, repeat):
+    """Latencies of ``repeat`` calls, then peak memory of one traced call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return times, peak
+
+
+def percentile(times, pct):
+    ordered = sorted(times)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def run_scale(finder, scale, repeat, workdir):
+    pages = load_pages(scale)
+    gcw = [(name, text) for name, text in pages if name.startswith('gcw')]
+    golf_town = [(name, text) for name, text in pages if not name.startswith('gcw')]
+    quiet = io.StringIO()
+
+    def parse(parser, group):
+        # The fixtures hold a deliberately broken price, whose warning would flood the output
+        with contextlib.redirect_stdout(quiet):
+            return [deal for name, text in group for deal in parser(text, name)]
+
+    deals = parse(finder.parse_gcw_deals, gcw) + parse(finder.parse_golf_town_deals, golf_town)
+    batch = DealBatch(deals)
+    raw_path = os.path.join(workdir, 'raw_deals.json')
+    deals_path = os.path.join(workdir, 'deals.json')
+
+    def write_json():
+        save_raw_deals(deals, raw_path)
+        save_deals_json(batch, deals_path)
+
+    stages = {
+        'parse_gcw': (lambda: parse(finder.parse_gcw_deals, gcw), sum(len(t) for _, t in gcw)),
+        'parse_golf_town': (lambda: parse(finder.parse_golf_town_deals, golf_town),
+                            sum(len(t) for _, t in golf_town)),
+        'generate_dashboard': (lambda: generate_dashboard(batch), 0),
+        'write_json': (write_json, 0),
+    }
+    results = {}
+    runs = repeats_for(scale, repeat)
+    for stage, (fn, size) in stages.items():
+        times, peak = measure(fn, runs)
+        p50 = statistics.median(times)
+        results[stage] = {
+            'deals': len(deals),
+            'runs': runs,
+            'p50': p50,
+            'p99': percentile(times, 99),
+            'deals_per_s': len(deals) / p50,
+            'mb_per_s': size / p50 / 1e6 if size else None,
+            'peak_mb': peak / 1e6,
+        }
+    # The finder records every parse in its run metrics; don't carry them into the next scale
+    finder.metrics.parses.clear()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Rows of (scale, stage, ratio) that got slower than the baseline allows"""
+    regressions = []
+    for scale, stages in results.items():
+        for stage, result in stages.items():
+            previous = baseline.get(scale, {}).get(stage)
+            if previous:
+                ratio = result['p50'] / previous['p50']
+                result['vs_baseline'] = ratio
+                if ratio > 1 + tolerance:
+                    regressions.append((scale, stage, ratio))
+    return regressions
+
+
+def print_table(results):
+    print(f"{'scale':>6} {'stage':<19} {'deals':>8} {'runs':>4} {'p50 ms':>9} {'p99 ms':>9} "
+          f"{'deals/s':>10} {'MB/s':>7} {'peak MB':>8} {'vs base':>8}")
+    for scale, stages in results.items():
+        for stage, r in stages.items():
+            mb = f"{r['mb_per_s']:7.1f}" if r['mb_per_s'] else f"{'':>7}"
+            base = f"{r['vs_baseline']:7.2f}x" if 'vs_baseline' in r else f"{'':>8}"
+            print(f"{scale + 'x':>6} {stage:<19} {r['deals']:>8} {r['runs']:>4} {r['p50'] * 1e3:>9.2f} "
+                  f"{r['p99'] * 1e3:>9.2f} {r['deals_per_s']:>10.0f} {mb} {r['peak_mb']:>8.2f} {base}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parsing, rendering and JSON writes offline")
+    parser.add_argument('--scales', type=lambda value: [int(s) for s in value.split(',')],
+                        default=list(SCALES), metavar='N,N',
+                        help=f"multiples of the fixture pages' deals (default: {','.join(map(str, SCALES))})")
+    parser.add_argument('--repeat', type=int, default=50,
+                        help="timed runs at 1x, divided by the scale with a minimum of 3 (default: 50)")
+    parser.add_argument('--baseline', default=BASELINE_FILE, metavar='PATH',
+                        help="baseline results to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as the new baseline instead of comparing")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed p50 slowdown before a stage counts as a regression (default: 0.25)")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    finder = SimpleDealFinder()
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for scale in args.scales:
+                results[str(scale)] = run_scale(finder, scale, args.repeat, workdir)
+    finally:
+        finder.close()
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print_table(results)
+        print(f"📁 Baseline saved to {args.baseline}")
+        return
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} - run with --save-baseline to record one")
+    for scale, stage, ratio in regressions:
+        print(f"❌ {stage} at {scale}x is {ratio:.2f}x slower than the baseline")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Dashboard Render Benchmark
+Writes the dashboard for synthetic deal sets and reports time, peak memory and output size
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from golfdeals.dashboard import INDEX_FILE, write_dashboard_site
+from golfdeals.records import Deal, DealBatch
+
+SIZES = (5000, 20000, 50000)
+SOURCES = ('Golf Clearance Warehouse', 'Golf Town')
+
+
+def synthetic_deals(count, seed=7):
+    rng = random.Random(seed)
+    for i in range(count):
+        original = rng.choice([34.99, 89.99, 149.99, 399.99, 1299.99])
+        pct = rng.randint(5, 80)
+        sale = round(original * (100 - pct) / 100, 2)
+        yield Deal(f"Synthetic Product {i}", original, sale, round(original - sale, 2), pct,
+                   f"https://example.com/category/{i % 40}", SOURCES[i % 2])
+
+
+def _size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def measure(count, trace=False):
+    batch = DealBatch(synthetic_deals(count))
+    with tempfile.TemporaryDirectory() as docs:
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        write_dashboard_site(batch, docs)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else 0
+        tracemalloc.stop()
+        return elapsed, peak, _size(os.path.join(docs, INDEX_FILE)), _size(os.path.join(docs, 'data'))
+
+
+def main(sizes=SIZES):
+    print(f"{'deals':>8} {'time (s)':>10} {'us/deal':>9} {'peak MB':>9} {'shell KB':>9} {'data KB':>9}")
+    for count in sizes:
+        # Timed without tracing, which slows allocation-heavy code several times over
+        elapsed, _, shell, data = measure(count)
+        _, peak, _, _ = measure(count, trace=True)
+        print(f"{count:>8} {elapsed:>10.3f} {elapsed / count * 1e6:>9.1f} {peak / 1e6:>9.2f} "
+              f"{shell / 1024:>9.1f} {data / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
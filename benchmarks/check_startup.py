@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Startup Budget Check
+Times each CLI command's imports with ``-X importtime`` and fails when one is over budget
+
+Only imports made after interpreter startup (``site``) count. Each command
+also has modules it must never load at startup, such as the HTTP stack
+for ``render``; those fail the check regardless of time.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Milliseconds, best of several runs
+BUDGETS = {
+    'help': 15,
+    'render': 60,
+    'fetch': 120,
+    'all': 150,
+    'watch': 150,
+}
+
+FORBIDDEN = {
+    'help': ('golfdeals.finder', 'golfdeals.publish', 'asyncio', 'sqlite3'),
+    'render': ('requests', 'urllib3', 'asyncio', 'golfdeals.http', 'golfdeals.parsing',
+               'lxml', 'selectolax'),
+    'fetch': ('requests', 'urllib3', 'sqlite3', 'lxml', 'selectolax'),
+    'all': ('requests', 'urllib3', 'lxml', 'selectolax'),
+    'watch': ('requests', 'urllib3', 'lxml', 'selectolax'),
+}
+
+
+def import_times(command):
+    """(milliseconds, set of module names) imported to start ``command``"""
+    if command == 'help':
+        code = "from golfdeals.cli import usage; usage()"
+    else:
+        code = f"from golfdeals.cli import build_parser; build_parser({command!r})"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    total = 0
+    modules = set()
+    after_site = False
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if after_site:
+            modules.add(name.strip())
+            if not name.startswith('  '):
+                total += int(cumulative)
+        elif name.strip() == 'site':
+            after_site = True
+    return total / 1000, modules
+
+
+def main(repeat=5):
+    failed = False
+    print(f"{'command':<8} {'ms':>7} {'budget':>7}")
+    for command, budget in BUDGETS.items():
+        runs = [import_times(command) for _ in range(repeat)]
+        elapsed = min(ms for ms, _ in runs)
+        loaded = set().union(*(modules for _, modules in runs))
+        bad = [name for name in FORBIDDEN[command] if name in loaded]
+        over = elapsed > budget
+        icon = "❌" if over or bad else "✅"
+        print(f"{command:<8} {elapsed:>7.1f} {budget:>7} {icon}"
+              + (f"  loads {', '.join(bad)}" if bad else ""))
+        failed |= over or bool(bad)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
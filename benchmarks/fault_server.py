@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Fault-Injecting Fixture Server
+Serves benchmarks/fixtures over HTTP with injected errors, throttling and stalls
+
+Every path returns a fixture page (chosen by the path's hash), unless a
+fault is rolled for that request. Pages carry an ETag, and a request
+whose If-None-Match still matches it gets a 304. Run it directly to point the finder at
+it, or call ``start()`` from a benchmark.
+"""
+
+import argparse
+import glob
+import os
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@dataclass
+class Faults:
+    """Per-request fault probabilities and timings"""
+    error_rate: float = 0.0     # answer 503
+    throttle_rate: float = 0.0  # answer 429 with Retry-After
+    stall_rate: float = 0.0     # sleep ``stall`` seconds before answering
+    latency: float = 0.0        # added to every response
+    stall: float = 30.0
+    retry_after: float = 0.2
+    down: bool = False          # every request fails with 503
+    seed: int = 0
+
+
+def _load_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages or [b'<html><body>no fixtures</body></html>']
+
+
+def make_handler(faults, counts):
+    pages = _load_pages()
+    rng = random.Random(faults.seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, body=b'', headers=()):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client gave up on a stalled request
+
+        def do_GET(self):
+            with lock:
+                roll = rng.random()
+                counts['requests'] += 1
+            time.sleep(faults.latency)
+            if faults.down or roll < faults.error_rate:
+                counts['503'] += 1
+                return self._send(503, b'unavailable')
+            roll -= faults.error_rate
+            if roll < faults.throttle_rate:
+                counts['429'] += 1
+                return self._send(429, b'slow down', [('Retry-After', str(faults.retry_after))])
+            roll -= faults.throttle_rate
+            if roll < faults.stall_rate:
+                counts['stalled'] += 1
+                time.sleep(faults.stall)
+            page = pages[zlib.crc32(self.path.encode('utf-8')) % len(pages)]
+            etag = f'"{zlib.crc32(page):08x}"'
+            if self.headers.get('If-None-Match') == etag:
+                counts['304'] += 1
+                return self._send(304, headers=[('ETag', etag)])
+            counts['200'] += 1
+            self._send(200, page, [('Content-Type', 'text/html; charset=utf-8'), ('ETag', etag)])
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start(faults=None, port=0):
+    """Serve in a background thread; returns (server, base URL, counts)"""
+    counts = dict.fromkeys(('requests', '200', '304', '429', '503', 'stalled'), 0)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(faults or Faults(), counts))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve fixtures with injected faults")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--error-rate', type=float, default=0.2)
+    parser.add_argument('--throttle-rate', type=float, default=0.1)
+    parser.add_argument('--stall-rate', type=float, default=0.05)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--stall', type=float, default=30.0)
+    parser.add_argument('--down', action='store_true')
+    args = parser.parse_args(argv)
+    faults = Faults(error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                    stall_rate=args.stall_rate, latency=args.latency, stall=args.stall,
+                    down=args.down)
+    server, url, counts = start(faults, args.port)
+    print(f"Serving fixtures with faults at {url} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(counts)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Build Benchmark Fixtures
+Writes category pages in the GCW and Golf Town layouts to benchmarks/fixtures
+
+The pages are synthetic. Their tile markup follows the selectors assumed
+in golfdeals/parsing.py, which have not been checked against saved pages
+of the live sites.
+"""
+
+import os
+import random
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+BRANDS = ['Titleist', 'TaylorMade', 'Callaway', 'FootJoy', 'Ping', 'Cobra', 'Mizuno',
+          'Adidas', 'Puma', 'Cleveland', 'Srixon', 'Ecco', 'Under Armour', 'Sun Mountain']
+MODELS = {
+    'Shoes': ['Pro SL Shoe', 'Tour360 22 Spikeless', 'Codechaos Boa', 'Fusion Pro Golf Shoe',
+              'Biom C Hybrid', 'Flex XP Golf Shoe', 'Drive Fusion Nitro'],
+    'Gloves': ['Players Glove', 'StaSof Glove', 'WeatherSof Glove', 'Tour Preferred Glove',
+               "Women's Cabretta Glove", 'RainGrip Pair'],
+    'Clubs': ['Stealth 2 Driver', 'Paradym Fairway Wood', 'G430 Max Hybrid', 'JPX 923 Irons',
+              'RTX 6 ZipCore Wedge', 'Aerojet Driver', 'Spider GT Putter'],
+}
+
+HEAD = '''<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<style>{style}</style>
+<script>{script}</script>
+</head><body>
+<nav class="site-nav">{nav}</nav>
+<ol class="breadcrumb">Home · Sale · Clearance · {title}</ol>
+'''
+
+FOOT = '''<footer>Free shipping on orders over $99 · Price match guarantee · 30 day returns
+<p>© 2025 · Privacy Policy · Terms of Use · Accessibility · Sitemap</p></footer>
+'''
+
+STYLE = ' '.join(f'.c{i}{{margin:{i}px;padding:{i % 7}px;color:#{i:06x}}}' for i in range(60))
+SCRIPT = ' '.join(f'window.dl{i}=function(e){{return e&&e.id=="{i}"}};' for i in range(60))
+
+
+def _price(value):
+    return f"{value:,.2f}"
+
+
+def _products(rng, category, count):
+    for n in range(count):
+        name = f"{rng.choice(BRANDS)} {rng.choice(MODELS[category])}"
+        if n % 9 == 4:
+            name += f" - Size {rng.choice(['S', 'M', 'L', 'ML', '9', '10.5'])}"
+        original = rng.choice([34.99, 49.99, 89.99, 149.99, 229.99, 399.99, 599.99, 1299.99])
+        pct = rng.randint(10, 80)
+        sale = round(original * (100 - pct) / 100, 2)
+        yield n, name, original, sale, pct
+
+
+def gcw_page(category, count=48, seed=1):
+    rng = random.Random(seed)
+    nav = ' '.join(f'<a href="/category-s/{i}.htm">Category {i}</a>' for i in range(60))
+    parts = [HEAD.format(title=f"Golf {category} | GCW", style=STYLE, script=SCRIPT, nav=nav)]
+    parts.append('<div class="v-product-grid">\n')
+    for n, name, original, sale, _ in _products(rng, category, count):
+        sku = f"GCW{seed}{n:04d}"
+        link = f"/{name.lower().replace(' ', '-')}-p/{sku.lower()}.htm"
+        deal = " · Deal of the Day Price:" if n % 11 == 3 else ""
+        our = _price(original) if n != count // 2 else ','
+        parts.append(
+            f'<div class="v-product" data-sku="{sku}">'
+            f'<a href="{link}" class="v-product__img"><img src="/v/vspfiles/photos/{sku}-2T.jpg" alt="{name}"></a>'
+            f'<a href="{link}" class="v-product__title productnamecolor colors_productname">{name}</a>{deal} · '
+            f'Our Price: ${our} · Sale Price: ${_price(sale)} · '
+            f'You save ${_price(original - sale)}</div>\n'
+        )
+    parts.append('</div>\n<div class="pagination">')
+    parts.extend(f'<a href="?page={p}">{p}</a>' for p in range(1, 5))
+    parts.append('</div>\n')
+    parts.append(FOOT)
+    parts.append('</body></html>\n')
+    return ''.join(parts)
+
+
+def golf_town_page(category, count=48, seed=2):
+    rng = random.Random(seed)
+    nav = ' '.join(f'<a href="/en-CA/shop/{i}/">Department {i}</a>' for i in range(60))
+    parts = [HEAD.format(title=f"Clearance {category} | Golf Town", style=STYLE, script=SCRIPT, nav=nav)]
+    parts.append('<div class="product-grid">\n')
+    for n, name, original, sale, pct in _products(rng, category, count):
+        pid = f"{seed}{n:05d}"
+        link = f"/en-CA/{name.lower().replace(' ', '-')}/{pid}.html"
+        badge = '<span class="badge">Final Sale</span>' if n % 5 == 0 else ''
+        parts.append(
+            f'<div class="product-tile" data-pid="{pid}">'
+            f'<div class="image-container"><a href="{link}"><img class="tile-image" src="/dw/image/v2/{pid}.jpg" alt=""></a></div>'
+            f'<div class="pdp-link">{badge}<a class="link" href="{link}">{name}</a></div>'
+            f'<div class="price"> · ${_price(original)} ${_price(sale)} ({pct}% off)</div></div>\n'
+        )
+    parts.append('</div>\n<div class="show-more">')
+    parts.append(f'<a href="?start={count}&amp;sz={count}" rel="next">Show More</a>')
+    parts.append('</div>\n')
+    parts.append(FOOT)
+    parts.append('</body></html>\n')
+    return ''.join(parts)
+
+
+PAGES = {
+    'gcw_shoes.html': (gcw_page, 'Shoes', 11),
+    'gcw_gloves.html': (gcw_page, 'Gloves', 12),
+    'golf_town_clubs.html': (golf_town_page, 'Clubs', 21),
+    'golf_town_shoes.html': (golf_town_page, 'Shoes', 22),
+}
+
+
+def expected_deals(filename, count=48):
+    """(name, sale price) of every product written to a fixture page"""
+    _, category, seed = PAGES[filename]
+    return [(name, sale) for _, name, _, sale, _ in _products(random.Random(seed), category, count)]
+
+
+def main():
+    os.makedirs(FIXTURES, exist_ok=True)
+    pages = {filename: build(category, seed=seed)
+             for filename, (build, category, seed) in PAGES.items()}
+    for filename, text in pages.items():
+        with open(os.path.join(FIXTURES, filename), 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"📁 {filename}: {len(text):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
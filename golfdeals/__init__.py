@@ -0,0 +1,51 @@
+"""
+Golf Deals
+Shared fetch, parse and render helpers for the deal finder scripts
+
+Submodules are imported on first attribute access, so a step that only
+renders the dashboard never loads the HTTP stack.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'HttpEngine': 'golfdeals.http',
+    'FetchResult': 'golfdeals.http',
+    'RetryPolicy': 'golfdeals.limits',
+    'ResponseCache': 'golfdeals.cache',
+    'PageCrawler': 'golfdeals.crawl',
+    'DealFinder': 'golfdeals.finder',
+    'SimpleDealFinder': 'golfdeals.finder',
+    'Retailer': 'golfdeals.retailers',
+    'register': 'golfdeals.retailers',
+    'SeenStore': 'golfdeals.crawl',
+    'HistoryStore': 'golfdeals.history',
+    'ParsePool': 'golfdeals.pipeline',
+    'RunMetrics': 'golfdeals.metrics',
+    'parse_page': 'golfdeals.parsing',
+    'parse_gcw_deals': 'golfdeals.parsing',
+    'parse_golf_town_deals': 'golfdeals.parsing',
+    'GCW_RULES': 'golfdeals.parsing',
+    'GOLF_TOWN_RULES': 'golfdeals.parsing',
+    'DEAL_FIELDS': 'golfdeals.records',
+    'make_deal': 'golfdeals.records',
+    'match_products': 'golfdeals.matching',
+    'load_raw_deals': 'golfdeals.storage',
+    'save_raw_deals': 'golfdeals.storage',
+    'save_deals_json': 'golfdeals.storage',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'golfdeals' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
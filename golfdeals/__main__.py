@@ -0,0 +1,3 @@
+from golfdeals.cli import main
+
+main()
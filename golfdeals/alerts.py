@@ -0,0 +1,241 @@
+"""
+Deal Alerts
+Ranks the best deals per source and category and flags deals that newly crossed a discount threshold
+
+``TopDeals`` keeps a bounded heap per (source, category) and counts tiers
+in the same pass. ``find_alerts`` compares this run's discounts with the
+last published deals, and ``write_alert_feeds`` publishes both as a small
+JSON file plus RSS and Atom feeds next to the dashboard, so subscribers
+never need to download the dashboard data.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from golfdeals.records import TIERS, product_key, tier_for
+
+ALERTS_FILE = 'docs/alerts.json'
+RSS_FILE = 'docs/alerts.rss'
+ATOM_FILE = 'docs/alerts.atom'
+# Minimum discounts of the excellent and great tiers
+ALERT_THRESHOLDS = tuple(minimum for name, minimum in TIERS if name in ('excellent', 'great'))
+TOP_N = 10
+# Alerts kept in the feeds, newest first
+FEED_LIMIT = 50
+FEED_TITLE = 'Golf Deals - New Discounts'
+TOP_FIELDS = ('product_name', 'original_price', 'sale_price', 'discount_pct', 'url')
+
+
+class TopDeals:
+    """Best ``n`` deals per (source, category), and tier counts, from one pass
+
+    Each group is a min-heap of at most ``n`` entries, so adding a deal is
+    O(log n) and only the kept deals are ever sorted. ``n=0`` only counts.
+    """
+
+    def __init__(self, n=TOP_N):
+        self.n = n
+        self.total = 0
+        self.tiers = dict.fromkeys((name for name, _ in TIERS), 0)
+        self._heaps = {}
+
+    def add(self, deal):
+        pct = deal['discount_pct']
+        self.tiers[tier_for(pct)] += 1
+        # The negated arrival number keeps ties in arrival order and stops
+        # comparisons before they reach the deal
+        entry = (pct, -self.total, deal)
+        self.total += 1
+        if self.n <= 0:
+            return
+        heap = self._heaps.setdefault((deal['source'], deal.get('category') or ''), [])
+        if len(heap) < self.n:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def extend(self, deals):
+        for deal in deals:
+            self.add(deal)
+        return self
+
+    def top(self):
+        """``{source: {category: [deals, best first]}}``"""
+        ranked = {}
+        for (source, category), heap in self._heaps.items():
+            ranked.setdefault(source, {})[category] = [deal for _, _, deal in
+                                                       sorted(heap, reverse=True)]
+        return ranked
+
+
+@dataclass
+class Alert:
+    """A deal whose discount reached ``threshold`` this run
+
+    ``previous_pct`` is the discount last published, or None for a product
+    that wasn't listed.
+    """
+    deal: object
+    threshold: int
+    previous_pct: float = None
+
+    @property
+    def id(self):
+        """Stable across runs for the same product, threshold and price"""
+        key = f"{product_key(self.deal)}|{self.threshold}|{self.deal['sale_price']:.2f}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    @property
+    def title(self):
+        deal = self.deal
+        return (f"{deal['discount_pct']:.0f}% off {deal['product_name']} - "
+                f"${deal['sale_price']:.2f} at {deal['source']}")
+
+
+def find_alerts(deals, previous, thresholds=ALERT_THRESHOLDS):
+    """Deals that reached a threshold they were below in ``previous``
+
+    A deal is flagged once, for the highest threshold it meets, when the
+    product was new or its previous discount was under that threshold.
+    Without ``previous`` every deal would be new, so nothing is flagged
+    and the run only sets the baseline. Best discounts come first.
+    """
+    if not previous:
+        return []
+    before = {product_key(deal): deal['discount_pct'] for deal in previous}
+    thresholds = sorted(thresholds, reverse=True)
+    alerts = []
+    for deal in deals:
+        pct = deal['discount_pct']
+        threshold = next((t for t in thresholds if pct >= t), None)
+        if threshold is None:
+            continue
+        was = before.get(product_key(deal))
+        if was is None or was < threshold:
+            alerts.append(Alert(deal, threshold, was))
+    alerts.sort(key=lambda alert: alert.deal['discount_pct'], reverse=True)
+    return alerts
+
+
+def default_site_url():
+    """The GitHub Pages URL of the repository running the workflow, if any"""
+    owner, _, name = os.environ.get('GITHUB_REPOSITORY', '').partition('/')
+    return f"https://{owner}.github.io/{name}/" if name else ''
+
+
+def _alert_entry(alert, now):
+    deal = alert.deal
+    return {
+        'id': alert.id,
+        'title': alert.title,
+        'url': deal['url'],
+        'source': deal['source'],
+        'category': deal.get('category') or '',
+        'sku': deal.get('sku') or '',
+        'original_price': deal['original_price'],
+        'sale_price': deal['sale_price'],
+        'discount_pct': deal['discount_pct'],
+        'previous_pct': alert.previous_pct,
+        'threshold': alert.threshold,
+        'date': now,
+    }
+
+
+def _load_entries(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('alerts', [])
+    except (FileNotFoundError, ValueError, AttributeError):
+        return []
+
+
+def _summary(entry):
+    if entry['previous_pct'] is None:
+        change = "new listing"
+    else:
+        change = f"was {entry['previous_pct']:.0f}% off"
+    return (f"${entry['original_price']:.2f} → ${entry['sale_price']:.2f} "
+            f"({entry['discount_pct']:.0f}% off, {change}) at {entry['source']}")
+
+
+def _write_xml(root, path):
+    from xml.etree import ElementTree
+
+    ElementTree.indent(root)
+    ElementTree.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def write_rss(entries, path=RSS_FILE, site_url='', updated=None):
+    from email.utils import format_datetime
+    from xml.etree.ElementTree import Element, SubElement
+
+    def rfc822(iso):
+        return format_datetime(datetime.fromisoformat(iso))
+
+    rss = Element('rss', version='2.0')
+    channel = SubElement(rss, 'channel')
+    SubElement(channel, 'title').text = FEED_TITLE
+    SubElement(channel, 'link').text = site_url or 'index.html'
+    SubElement(channel, 'description').text = "Golf deals that just reached a new discount tier"
+    SubElement(channel, 'lastBuildDate').text = rfc822(updated)
+    for entry in entries:
+        item = SubElement(channel, 'item')
+        SubElement(item, 'title').text = entry['title']
+        SubElement(item, 'link').text = entry['url']
+        SubElement(item, 'guid', isPermaLink='false').text = entry['id']
+        SubElement(item, 'pubDate').text = rfc822(entry['date'])
+        SubElement(item, 'description').text = _summary(entry)
+    _write_xml(rss, path)
+
+
+def write_atom(entries, path=ATOM_FILE, site_url='', updated=None):
+    from xml.etree.ElementTree import Element, SubElement
+
+    feed = Element('feed', xmlns='http://www.w3.org/2005/Atom')
+    SubElement(feed, 'title').text = FEED_TITLE
+    SubElement(feed, 'id').text = (site_url + os.path.basename(path) if site_url
+                                   else 'urn:golfdeals:alerts')
+    SubElement(feed, 'updated').text = updated
+    if site_url:
+        SubElement(feed, 'link', href=site_url)
+    SubElement(SubElement(feed, 'author'), 'name').text = 'Golf Deals'
+    for entry in entries:
+        item = SubElement(feed, 'entry')
+        SubElement(item, 'title').text = entry['title']
+        SubElement(item, 'id').text = f"urn:golfdeals:alert:{entry['id']}"
+        SubElement(item, 'updated').text = entry['date']
+        SubElement(item, 'link', href=entry['url'])
+        SubElement(item, 'summary').text = _summary(entry)
+    _write_xml(feed, path)
+
+
+def write_alert_feeds(alerts, ranking, path=ALERTS_FILE, rss=RSS_FILE, atom=ATOM_FILE,
+                      site_url='', thresholds=ALERT_THRESHOLDS, now=None):
+    """Add ``alerts`` to the feeds and write them with ``ranking``'s top deals
+
+    The feeds keep the newest ``FEED_LIMIT`` alerts across runs; an alert
+    already in them (same product, threshold and price) is not repeated.
+    Returns the entries added this run.
+    """
+    now = (now or datetime.now(timezone.utc)).isoformat(timespec='seconds')
+    previous = _load_entries(path)
+    known = {entry.get('id') for entry in previous}
+    added = [_alert_entry(alert, now) for alert in alerts if alert.id not in known]
+    entries = (added + previous)[:FEED_LIMIT]
+
+    top = {source: {category: [{f: deal[f] for f in TOP_FIELDS} for deal in deals]
+                    for category, deals in categories.items()}
+           for source, categories in ranking.top().items()}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'updated': now, 'thresholds': list(thresholds), 'tiers': ranking.tiers,
+                   'alerts': entries, 'top': top}, f, ensure_ascii=False, separators=(',', ':'))
+    write_rss(entries, rss, site_url, now)
+    write_atom(entries, atom, site_url, now)
+    return added
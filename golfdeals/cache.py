@@ -0,0 +1,173 @@
+"""
+HTTP Response Cache
+Persistent per-URL cache of page bodies, validators and parse output
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from golfdeals.records import encode_deal
+
+DEFAULT_CACHE_DIR = '.cache/http'
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """On-disk cache keyed by URL
+
+    Each entry keeps the last body with its ETag/Last-Modified validators so
+    the next request can be conditional, plus any parse output derived from
+    that body. Entries older than ``ttl`` seconds are dropped, and the least
+    recently used ones go first when the cache grows past ``max_bytes``.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, path=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.path, self.INDEX_FILE), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _file(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.path, f"{key}.{suffix}")
+
+    def _read(self, filename):
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, filename, text):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = filename + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, filename)
+        return len(text.encode('utf-8'))
+
+    def __contains__(self, url):
+        return url in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def conditional_headers(self, url):
+        """Validators to send with the next request for ``url``"""
+        entry = self._index.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """Cached body for ``url``, or None"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            text = self._read(self._file(url, 'html'))
+            if text is None:
+                del self._index[url]
+                return None
+            entry['accessed_at'] = time.time()
+            return text
+
+    def store(self, url, text, etag=None, last_modified=None):
+        """Save a fresh 200 response"""
+        with self._lock:
+            self._drop_files(url)
+            now = time.time()
+            self._index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'stored_at': now,
+                'accessed_at': now,
+                'digest': _digest(text),
+                'size': self._write(self._file(url, 'html'), text),
+                'parsed': {},
+            }
+
+    def touch(self, url):
+        """Mark ``url`` as revalidated by a 304"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry:
+                entry['stored_at'] = entry['accessed_at'] = time.time()
+
+    def load_parsed(self, url, key, text):
+        """Parse output cached for ``text`` under ``key``, or None"""
+        with self._lock:
+            entry = self._index.get(url)
+            if not entry or key not in entry.get('parsed', {}) or entry.get('digest') != _digest(text):
+                return None
+            data = self._read(self._file(url, f"{key}.json"))
+            return json.loads(data) if data is not None else None
+
+    def store_parsed(self, url, key, text, records):
+        """Cache parse output derived from ``text``"""
+        with self._lock:
+            entry = self._index.get(url)
+            if not entry or entry.get('digest') != _digest(text):
+                return
+            size = self._write(self._file(url, f"{key}.json"),
+                               json.dumps(records, default=encode_deal))
+            entry.setdefault('parsed', {})[key] = size
+
+    def _drop_files(self, url):
+        entry = self._index.get(url)
+        if not entry:
+            return
+        suffixes = ['html'] + [f"{key}.json" for key in entry.get('parsed', {})]
+        for suffix in suffixes:
+            try:
+                os.remove(self._file(url, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _entry_size(self, entry):
+        return entry.get('size', 0) + sum(entry.get('parsed', {}).values())
+
+    def evict(self, now=None):
+        """Drop expired entries, then least recently used ones over the size limit"""
+        now = now or time.time()
+        with self._lock:
+            for url, entry in list(self._index.items()):
+                if now - entry.get('stored_at', 0) > self.ttl:
+                    self._drop_files(url)
+                    del self._index[url]
+
+            total = sum(self._entry_size(entry) for entry in self._index.values())
+            by_age = sorted(self._index.items(), key=lambda item: item[1].get('accessed_at', 0))
+            for url, entry in by_age:
+                if total <= self.max_bytes:
+                    break
+                total -= self._entry_size(entry)
+                self._drop_files(url)
+                del self._index[url]
+
+    def save(self):
+        """Write the index back to disk"""
+        with self._lock:
+            self._write(os.path.join(self.path, self.INDEX_FILE), json.dumps(self._index))
@@ -0,0 +1,88 @@
+"""
+Command Line
+``python -m golfdeals fetch|render|all|watch`` for the scheduled workflow and long-running hosts
+
+A command imports only what it runs: ``render`` never loads the HTTP,
+asyncio or HTML parsing stack, and ``all`` hands the fetched deals and run
+metrics straight to the render step instead of re-reading them from disk.
+"""
+
+import argparse
+import sys
+
+COMMANDS = {
+    'fetch': "crawl every retailer and save the deals",
+    'render': "build the dashboard from the saved deals",
+    'all': "crawl, then build the dashboard from the same deals",
+    'watch': "keep checking each category on its own learned interval, republishing on changes",
+}
+
+
+def usage():
+    lines = [f"usage: golfdeals {{{','.join(COMMANDS)}}} [options]", "", "commands:"]
+    lines += [f"  {name:<8}{help_text}" for name, help_text in COMMANDS.items()]
+    lines += ["", "Run 'golfdeals <command> --help' for its options."]
+    return '\n'.join(lines)
+
+
+def build_parser(command):
+    """Argument parser for ``command``, importing only the steps it runs"""
+    from golfdeals import metrics
+
+    parser = argparse.ArgumentParser(prog=f"golfdeals {command}", description=COMMANDS[command])
+    if command in ('fetch', 'all', 'watch'):
+        from golfdeals import finder
+        finder.add_arguments(parser)
+    if command == 'watch':
+        from golfdeals import watch
+        watch.add_arguments(parser)
+    if command in ('render', 'all', 'watch'):
+        from golfdeals import publish
+        if command == 'render':
+            publish.add_input_argument(parser)
+        publish.add_arguments(parser)
+    metrics.add_arguments(parser)
+    return parser
+
+
+def finish(metrics, args):
+    """Write the run report and point out anything that looks wrong"""
+    report = metrics.write_json(args.report)
+    if args.prometheus:
+        metrics.write_prometheus(args.prometheus)
+    stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in metrics.stages.items())
+    print(f"📏 Run report saved to {args.report} ({stages})")
+    for warning in report['summary']['warnings']:
+        print(f"  ⚠️  {warning}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return
+    command = argv[0]
+    if command not in COMMANDS:
+        sys.exit(f"golfdeals: unknown command {command!r}\n\n{usage()}")
+    args = build_parser(command).parse_args(argv[1:])
+
+    from golfdeals.metrics import RunMetrics
+
+    if command == 'render':
+        from golfdeals import publish
+        metrics = RunMetrics.load(args.report)
+        publish.run(args, metrics=metrics)
+    elif command == 'watch':
+        from golfdeals import watch
+        watch.run(args, RunMetrics(), finish)
+        return
+    else:
+        from golfdeals import finder
+        metrics = RunMetrics()
+        deals = finder.run(args, metrics)
+        finder.print_summary(deals)
+        if command == 'all':
+            from golfdeals import publish
+            print()
+            publish.run(args, deals, metrics)
+    finish(metrics, args)
@@ -0,0 +1,229 @@
+"""
+Pagination Crawler
+Follows category next-page links and stops once pages stop changing
+"""
+
+import asyncio
+import html
+import inspect
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from golfdeals.records import as_deal, encode_deal, product_key
+
+DEFAULT_SEEN_FILE = 'docs/seen_products.json'
+# Deals from pages an early stop skipped are carried over for at most this
+# long after a crawl last saw them
+MAX_CARRY_AGE = 7 * 86400
+
+# Query parameters retailers use to number category pages
+PAGE_PARAMS = ('page', 'pg', 'p', 'start')
+
+_ANCHOR = re.compile(r'<a\b[^>]*>', re.IGNORECASE)
+_HREF = re.compile(r'\bhref\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_REL_NEXT = re.compile(r'\brel\s*=\s*["\']?next\b', re.IGNORECASE)
+
+
+def page_number(url):
+    """Position of a paginated URL within its category, or None"""
+    query = parse_qs(urlsplit(url).query)
+    for param in PAGE_PARAMS:
+        value = query.get(param, [''])[0]
+        if value.isdigit():
+            return int(value)
+    return None
+
+
+def page_links(text, category_url):
+    """Pagination links in ``text`` that belong to ``category_url``"""
+    base = urlsplit(category_url)
+    first = page_number(category_url)
+    links = []
+    for tag in _ANCHOR.finditer(text):
+        href = _HREF.search(tag.group(0))
+        if not href:
+            continue
+        url = urljoin(category_url, html.unescape(href.group(1)))
+        parts = urlsplit(url)
+        if parts.netloc != base.netloc:
+            continue
+        number = page_number(url)
+        if _REL_NEXT.search(tag.group(0)):
+            links.append(url)
+        elif parts.path == base.path and number is not None:
+            # Skip links back to the first page (page=1, start=0)
+            if number == first or (first is None and number <= 1):
+                continue
+            links.append(url)
+    return links
+
+
+def _signature(deal):
+    return [deal['sale_price'], deal['original_price']]
+
+
+class SeenStore:
+    """Products seen per category in the last run, with the page they were on
+
+    Each entry also keeps when a crawl last confirmed it, so deals carried
+    over from skipped pages age out instead of living on indefinitely.
+    """
+
+    def __init__(self, path=DEFAULT_SEEN_FILE, clock=time.time):
+        self.path = path
+        self.clock = clock
+        try:
+            with open(path, 'r') as f:
+                self._categories = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._categories = {}
+        # Files from before confirmation times start their clock now
+        self._loaded_at = clock()
+
+    def _entries(self, category_url):
+        for entry in self._categories.get(category_url, []):
+            yield entry[0], entry[1], entry[2] if len(entry) > 2 else self._loaded_at
+
+    def known(self, category_url):
+        """Map of product key to (signature, page) from the last run"""
+        return {
+            product_key(deal): (_signature(deal), page)
+            for page, deal, _ in self._entries(category_url)
+        }
+
+    def previous_deals(self, category_url, after_page, max_age=None):
+        """``(page, deal, confirmed)`` last seen beyond ``after_page`` of a category
+
+        With ``max_age``, deals no crawl has confirmed for that many seconds
+        are left out.
+        """
+        oldest = None if max_age is None else self.clock() - max_age
+        return [
+            (page, as_deal(deal), confirmed)
+            for page, deal, confirmed in self._entries(category_url)
+            if page > after_page and (oldest is None or confirmed >= oldest)
+        ]
+
+    def stale_pages(self, category_url, max_age):
+        """Pages holding deals no crawl has confirmed for ``max_age`` seconds"""
+        oldest = self.clock() - max_age
+        return {page for page, _, confirmed in self._entries(category_url) if confirmed < oldest}
+
+    def update(self, category_url, paged_deals):
+        """Store a crawl's ``(page, deal, confirmed)`` entries
+
+        A ``confirmed`` of None means the deal was fetched in this crawl.
+        """
+        now = int(self.clock())
+        self._categories[category_url] = [[page, deal, now if confirmed is None else confirmed]
+                                          for page, deal, confirmed in paged_deals]
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self._categories, f, separators=(',', ':'), default=encode_deal)
+
+
+@dataclass
+class CrawlResult:
+    """Deals from every crawled page of one category"""
+    url: str
+    deals: list = field(default_factory=list)
+    pages: int = 0
+    errors: list = field(default_factory=list)
+    stopped_early: bool = False
+    carried_over: int = 0
+    # (page, deal, confirmed), with confirmed None for deals fetched this crawl
+    paged_deals: list = field(default_factory=list)
+
+
+class PageCrawler:
+    """Fetches category pages a window at a time
+
+    Page 1 is fetched first, then every pagination link it and later pages
+    reveal, ``window`` pages concurrently. Once a page holds only products
+    the seen store already has at the same price, no further pages are
+    scheduled and the last run's deals for the remaining pages are reused.
+    Pages whose deals no crawl has confirmed for ``max_carry_age`` seconds
+    are always fetched again, so carried-over deals can't outlive the
+    listing they came from.
+    Products are told apart by ``product_key``, the SKU when tiles have one.
+    """
+
+    def __init__(self, engine, seen=None, window=4, max_pages=50, early_stop=True,
+                 max_carry_age=MAX_CARRY_AGE):
+        self.engine = engine
+        self.seen = seen
+        self.window = max(1, window)
+        self.max_pages = max(1, max_pages)
+        self.early_stop = early_stop and seen is not None
+        self.max_carry_age = max_carry_age
+
+    def _unchanged(self, page_deals, known):
+        return bool(page_deals) and all(
+            known.get(product_key(deal), (None,))[0] == _signature(deal)
+            for deal in page_deals
+        )
+
+    async def _load(self, page_url, parse):
+        """Fetch and parse one page; parsing starts as soon as its body arrives"""
+        page = await self.engine.fetch(page_url)
+        if page.error:
+            return page, None
+        deals = parse(page.text, page_url)
+        if inspect.isawaitable(deals):
+            deals = await deals
+        return page, deals
+
+    async def crawl(self, url, parse):
+        """Crawl one category, parsing each page with ``parse(text, page_url)``
+
+        ``parse`` may be a plain function or a coroutine function.
+        """
+        result = CrawlResult(url)
+        known = self.seen.known(url) if self.early_stop else {}
+        stale = self.seen.stale_pages(url, self.max_carry_age) if known else set()
+        queue = [url]
+        queued = {url}
+        seen_keys = set()
+        done = 0
+
+        while done < len(queue) and done < self.max_pages and not result.stopped_early:
+            batch = queue[done:done + min(self.window, self.max_pages - done)]
+            loaded = await asyncio.gather(*(self._load(page_url, parse) for page_url in batch))
+            for page_url, (page, page_deals) in zip(batch, loaded):
+                done += 1
+                if page.error:
+                    result.errors.append(f"{page_url}: {page.error}")
+                    continue
+                result.pages += 1
+                for deal in page_deals:
+                    key = product_key(deal)
+                    if key not in seen_keys:
+                        seen_keys.add(key)
+                        result.paged_deals.append((done, deal, None))
+                for link in page_links(page.text, url):
+                    if link not in queued:
+                        queued.add(link)
+                        queue.append(link)
+                if known and self._unchanged(page_deals, known) and not any(
+                        stale_page > done for stale_page in stale):
+                    result.stopped_early = True
+            pending = sorted(queue[done:], key=lambda link: (page_number(link) is None,
+                                                            page_number(link) or 0))
+            queue[done:] = pending
+
+        if result.stopped_early:
+            for page, deal, confirmed in self.seen.previous_deals(url, done, self.max_carry_age):
+                if product_key(deal) not in seen_keys:
+                    seen_keys.add(product_key(deal))
+                    result.paged_deals.append((page, deal, confirmed))
+                    result.carried_over += 1
+        result.deals = [deal for _, deal, _ in result.paged_deals]
+        return result
@@ -0,0 +1,369 @@
+"""
+Dashboard Renderer
+Writes the deal selector as a small HTML shell plus lazily loaded data shards
+
+The shell (docs/index.html) carries the stats and an inline manifest. The
+CSS, JS and deal data live in content-hashed files under docs/assets and
+docs/data, so browsers and GitHub Pages can cache them indefinitely and a
+run only rewrites the files whose contents changed. Reddit posts and CSV
+rows are rendered here too, into export shards the page loads only when
+asked to copy or export, and into CSV and markdown bundles under
+docs/downloads. Every file is written as soon as it is built.
+"""
+
+import filecmp
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from array import array
+from contextlib import ExitStack, contextmanager, nullcontext
+from datetime import datetime
+from html import escape
+
+from golfdeals.exports import CSV_HEADER, export_rows
+from golfdeals.matching import best_offers
+from golfdeals.records import TIERS, DealBatch, product_key, tier_for
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+INDEX_FILE = 'index.html'
+ASSETS_DIR = 'assets'
+DATA_DIR = 'data'
+DOWNLOADS_DIR = 'downloads'
+
+# Columns of each shard row; the source is implied by the shard. The price
+# signal columns are null for products without history, and the offer
+# columns are null unless another retailer lists the same product.
+DEAL_COLUMNS = ('product_name', 'original_price', 'sale_price', 'savings', 'discount_pct', 'url',
+                'category', 'sku')
+SIGNAL_COLUMNS = ('previous_price', 'low_price', 'high_price')
+OFFER_COLUMNS = ('best_price', 'best_source', 'retailers')
+SHARD_FIELDS = ('pos',) + DEAL_COLUMNS + SIGNAL_COLUMNS + OFFER_COLUMNS
+
+# Length of the name fragments in the search index
+SEARCH_NGRAM = 3
+
+
+def _static(name):
+    with open(os.path.join(STATIC_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _hashed_name(directory, stem, data, suffix):
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    return f"{directory}/{stem}.{digest}{suffix}"
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def _script_json(value):
+    """JSON that is safe to inline inside a <script> element"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def ngrams(text, n=SEARCH_NGRAM):
+    """Distinct character n-grams of a normalized product name"""
+    text = ' '.join(text.lower().split())
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _delta(positions):
+    """Gap-encode an ascending position list; small gaps gzip far better"""
+    previous = 0
+    gaps = array('i')
+    for pos in positions:
+        gaps.append(pos - previous)
+        previous = pos
+    return gaps
+
+
+def _ranked_deals(batch, ranked):
+    return (batch[row] for row in ranked)
+
+
+def build_shards(batch, ranked, signals=None):
+    """Yield the deal rows of each (source, tier) shard, with positions in the full ranking
+
+    ``ranked`` holds ``batch``'s row indices in ranking order. Shards come
+    out one at a time, in source and tier order, and only their positions
+    are kept in between.
+    """
+    signals = signals or {}
+    offers = {pid: offer for pid, offer in best_offers(batch).items() if pid and offer[2] > 1}
+    no_offer = [None] * len(OFFER_COLUMNS)
+    shards = {}
+    for pos, deal in enumerate(_ranked_deals(batch, ranked)):
+        shards.setdefault((deal.source, tier_for(deal.discount_pct)), array('i')).append(pos)
+    tier_rank = {name: i for i, (name, _) in enumerate(TIERS)}
+    source_rank = {source: i for i, source in enumerate(batch.sources)}
+    for key in sorted(shards, key=lambda key: (source_rank[key[0]], tier_rank[key[1]])):
+        rows = []
+        for pos in shards.pop(key):
+            deal = batch[ranked[pos]]
+            signal = signals.get(product_key(deal), {})
+            rows.append([pos] + [getattr(deal, f) for f in DEAL_COLUMNS]
+                        + [signal.get(f) for f in SIGNAL_COLUMNS]
+                        + list(offers.get(deal.product_id, no_offer)))
+        yield key, rows
+
+
+def build_indexes(batch, ranked):
+    """Lookup tables that let the page filter without scanning every deal
+
+    Positions are ranks in the discount ordering, so every discount threshold
+    is a prefix of the ranking and only needs its length. Per-source lists and
+    n-gram postings are ascending position arrays, gap-encoded.
+    """
+    thresholds = {str(minimum): sum(1 for pct in batch.discount if pct >= minimum)
+                  for _, minimum in TIERS}
+    sources = {source: array('i') for source in batch.sources}
+    grams = {}
+    for pos, deal in enumerate(_ranked_deals(batch, ranked)):
+        sources[deal.source].append(pos)
+        for gram in ngrams(deal.product_name):
+            postings = grams.get(gram)
+            if postings is None:
+                postings = grams[gram] = array('i')
+            postings.append(pos)
+    index = {'sources': {source: _delta(positions) for source, positions in sources.items()}}
+    # Sorted, since set order varies between runs and would change the file's hash
+    search = {'n': SEARCH_NGRAM, 'grams': {gram: _delta(grams[gram]) for gram in sorted(grams)}}
+    return thresholds, index, search
+
+
+def _compact_json(value):
+    # Position arrays are written as plain lists
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=list).encode('utf-8')
+
+
+def _json_array(rows):
+    """``_compact_json`` of a list, as one encoded chunk per row"""
+    yield b'['
+    for i, row in enumerate(rows):
+        yield (b',' if i else b'') + _compact_json(row)
+    yield b']'
+
+
+def _json_object(value):
+    """``_compact_json`` of a dict, as one encoded chunk per item; nested dicts are streamed too"""
+    yield b'{'
+    for i, (key, item) in enumerate(value.items()):
+        yield (b',' if i else b'') + _compact_json(key) + b':'
+        if isinstance(item, dict):
+            yield from _json_object(item)
+        else:
+            yield _compact_json(item)
+    yield b'}'
+
+
+class _SiteFiles:
+    """Collects the dashboard's files in memory as ``{relative path: bytes}``"""
+
+    def __init__(self):
+        self.files = {}
+
+    def add(self, name, data):
+        self.files[name] = data
+
+    @contextmanager
+    def open(self, name):
+        buffer = io.StringIO()
+        yield buffer
+        self.files[name] = buffer.getvalue().encode('utf-8')
+
+
+class _SiteDirectory:
+    """Writes the dashboard's files under ``docs_dir`` as they are produced
+
+    Hashed files that already exist are left untouched. Streamed files go to
+    a ``.partial`` file first and only replace the old one when their bytes
+    differ, so unchanged downloads aren't rewritten.
+    """
+
+    def __init__(self, docs_dir):
+        self.docs_dir = docs_dir
+        self.names = set()
+        self.written = []
+
+    def _path(self, name):
+        self.names.add(name)
+        path = os.path.join(self.docs_dir, name)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        return path
+
+    def add(self, name, data):
+        path = self._path(name)
+        if name.startswith((ASSETS_DIR + '/', DATA_DIR + '/')) and os.path.exists(path):
+            return
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.written.append(name)
+
+    @contextmanager
+    def open(self, name):
+        path = self._path(name)
+        partial = path + '.partial'
+        try:
+            with open(partial, 'w', encoding='utf-8', newline='') as f:
+                yield f
+            if not (os.path.exists(path) and filecmp.cmp(partial, path, shallow=False)):
+                os.replace(partial, path)
+                self.written.append(name)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    def prune(self):
+        """Remove files this render didn't produce from the generated directories"""
+        for directory in (ASSETS_DIR, DATA_DIR, DOWNLOADS_DIR):
+            full = os.path.join(self.docs_dir, directory)
+            if not os.path.isdir(full):
+                continue
+            for filename in os.listdir(full):
+                if f"{directory}/{filename}" not in self.names:
+                    os.remove(os.path.join(full, filename))
+
+
+def write_downloads(batch, ranked, site):
+    """Stream the CSV and Reddit bundles of all deals, of each tier and of each source
+
+    One pass over the ranking writes every deal into the three bundles it
+    belongs to. Returns the dashboard's download links.
+    """
+    if not len(batch):
+        return []
+    tiers = batch.tier_counts()
+    bundles = [('all', 'All deals')]
+    bundles += [(name, f"{name.title()} deals") for name, _ in TIERS if tiers[name]]
+    bundles += [(_slug(source), source) for source in batch.sources]
+    links = []
+    with ExitStack() as stack:
+        outputs = {}
+        for key, label in bundles:
+            csv_file = f"{DOWNLOADS_DIR}/golf-deals-{key}.csv"
+            markdown_file = f"{DOWNLOADS_DIR}/golf-deals-{key}.md"
+            csv_out = stack.enter_context(site.open(csv_file))
+            csv_out.write(CSV_HEADER)
+            outputs[key] = (csv_out.write, stack.enter_context(site.open(markdown_file)).write)
+            links.append(f'{escape(label)} (<a href="{csv_file}" download>CSV</a> · '
+                         f'<a href="{markdown_file}" download>Reddit</a>)')
+        for deal, post, line in export_rows(_ranked_deals(batch, ranked)):
+            for key in ('all', tier_for(deal.discount_pct), _slug(deal.source)):
+                write_csv, write_markdown = outputs[key]
+                write_csv(line)
+                write_markdown(post)
+    return links
+
+
+def write_site(deals, site, updated=None, signals=None):
+    """Render the dashboard into ``site`` one file at a time
+
+    ``site`` takes whole files through ``add(name, data)`` and streamed text
+    files through ``open(name)``. Each shard and bundle is handed over as
+    soon as it is built, so memory is bounded by the largest shard rather
+    than the whole site. ``signals`` maps product keys to the price history
+    signals from ``HistoryStore.signals``.
+    """
+    batch = deals if isinstance(deals, DealBatch) else DealBatch(deals)
+    stats = batch.stats()
+    ranked = batch.order_by_discount()
+
+    css = _static('dashboard.css').encode('utf-8')
+    js = _static('dashboard.js').encode('utf-8')
+    stylesheet = _hashed_name(ASSETS_DIR, 'dashboard', css, '.css')
+    script = _hashed_name(ASSETS_DIR, 'dashboard', js, '.js')
+    site.add(stylesheet, css)
+    site.add(script, js)
+
+    def add_data(stem, chunks):
+        """Gzip encoded JSON into a hashed data file as it arrives, chunk by chunk"""
+        digest = hashlib.sha256()
+        compressed = io.BytesIO()
+        with gzip.GzipFile(fileobj=compressed, mode='wb', mtime=0) as out:
+            for chunk in chunks:
+                digest.update(chunk)
+                out.write(chunk)
+        name = f"{DATA_DIR}/{stem}.{digest.hexdigest()[:12]}.json.gz"
+        site.add(name, compressed.getvalue())
+        return name
+
+    thresholds, index, search = build_indexes(batch, ranked)
+    manifest = {
+        'total': len(batch),
+        'fields': SHARD_FIELDS,
+        'thresholds': thresholds,
+        'index': add_data('index', _json_object(index)),
+        'search': add_data('search', _json_object(search)),
+        'shards': [],
+    }
+    # Both are written; don't hold the postings through the shards
+    del index, search
+    discount = SHARD_FIELDS.index('discount_pct')
+    for (source, tier), rows in build_shards(batch, ranked, signals):
+        stem = f"{_slug(source)}-{tier}"
+        exports = export_rows(batch[ranked[row[0]]] for row in rows)
+        manifest['shards'].append({
+            'file': add_data(stem, _json_array(rows)),
+            'export': add_data(f"{stem}-export", _json_array(
+                [row[0], post, line] for row, (_, post, line) in zip(rows, exports))),
+            'source': source,
+            'tier': tier,
+            'count': len(rows),
+            'max': max(row[discount] for row in rows),
+        })
+    manifest['csv_header'] = CSV_HEADER
+    download_links = write_downloads(batch, ranked, site)
+
+    source_options = '\n'.join(
+        f'            <option value="{escape(source)}">{escape(source)}</option>'
+        for source in batch.sources
+    )
+    shell = _static('shell.html').format(
+        stylesheet=stylesheet,
+        script=script,
+        updated=(updated or datetime.now()).strftime("%B %d, %Y at %I:%M %p"),
+        total_deals=stats['total_deals'],
+        avg_discount=stats['avg_discount'],
+        max_discount=stats['max_discount'],
+        total_savings=stats['total_savings'],
+        source_options=source_options,
+        download_links=' | '.join(download_links),
+        manifest=_script_json(manifest),
+    )
+    site.add(INDEX_FILE, shell.encode('utf-8'))
+
+
+def render_site(deals, updated=None, signals=None):
+    """Return ``{relative path: bytes}`` for every file of the dashboard"""
+    site = _SiteFiles()
+    write_site(deals, site, updated, signals)
+    return site.files
+
+
+def generate_dashboard(deals, updated=None, signals=None):
+    """Generate the dashboard shell HTML"""
+    return render_site(deals, updated, signals)[INDEX_FILE].decode('utf-8')
+
+
+def write_dashboard_site(deals, docs_dir='docs', updated=None, signals=None, metrics=None):
+    """Write the dashboard under ``docs_dir`` and prune stale assets, shards and downloads
+
+    Files are written as they are rendered; hashed files that already exist
+    and downloads whose content is unchanged are left untouched. Returns the
+    relative paths that were actually written. With a ``RunMetrics``,
+    rendering and writing are timed as the ``render`` stage and pruning as
+    the ``write`` stage.
+    """
+    def stage(name):
+        return metrics.stage(name) if metrics is not None else nullcontext()
+
+    site = _SiteDirectory(docs_dir)
+    with stage('render'):
+        write_site(deals, site, updated, signals)
+    with stage('write'):
+        site.prune()
+    return site.written
@@ -0,0 +1,297 @@
+"""
+Product Enrichment
+Confirms stock and price on product pages, only for products that are new or re-priced
+
+Deals already link to their product page when the tile shows one. With
+enrichment on, each retailer's new or re-priced products have that page
+fetched, a few at a time, to drop sold-out items and correct prices the
+listing got wrong. Results are kept per SKU in a JSON file, so a product
+whose listed price hasn't moved costs no requests on later runs.
+"""
+
+import asyncio
+import json
+import os
+import re
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+
+DEFAULT_PRODUCTS_FILE = 'docs/product_checks.json'
+DEFAULT_ENRICH_CONCURRENCY = 4
+DEFAULT_ENRICH_MAX = 200
+# Bump when product pages are read differently so earlier checks are redone
+CHECK_VERSION = 2
+
+
+@dataclass(frozen=True)
+class ProductRules:
+    """How to read a product page
+
+    ``price`` has the current price in group 1 and ``sold_out`` matches
+    only when the product can't be bought. With ``scope``, both only look
+    inside its first match (group 1 when it has one), the main product's
+    part of the page. ``read`` replaces the patterns with a function of
+    the page text that returns what ``read_product_page`` does.
+    """
+    price: re.Pattern = None
+    sold_out: re.Pattern = None
+    scope: re.Pattern = None
+    read: object = None
+
+
+_JSON_LD = re.compile(r'<script[^>]*application/ld\+json[^>]*>(.*?)</script>',
+                      re.IGNORECASE | re.DOTALL)
+_MICRODATA_PRODUCT = re.compile(r'itemtype\s*=\s*["\']https?://schema\.org/Product["\']',
+                                re.IGNORECASE)
+_ITEMPROP = re.compile(r'<[^>]*\bitemprop\s*=\s*["\'](price|availability)["\'][^>]*>',
+                       re.IGNORECASE)
+_ITEMPROP_VALUE = re.compile(r'\b(?:content|href)\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+_UNAVAILABLE = re.compile(r'(?:OutOfStock|SoldOut|Discontinued)$', re.IGNORECASE)
+
+
+def _price(value):
+    try:
+        return float(str(value).replace(',', '').replace('$', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def _ld_product(text):
+    """The first top-level Product of the page's JSON-LD, or None"""
+    for block in _JSON_LD.findall(text):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        items = data if isinstance(data, list) else [data]
+        items += [item for entry in items if isinstance(entry, dict)
+                  for item in entry.get('@graph', [])]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            kind = item.get('@type')
+            if kind == 'Product' or isinstance(kind, list) and 'Product' in kind:
+                return item
+    return None
+
+
+def read_schema_product(text):
+    """(price, in stock) from the main product's schema.org offers, or None
+
+    Reads the JSON-LD Product's ``offers``, else the microdata ``price``
+    and ``availability`` inside the first Product container, so prices and
+    stock labels of related products elsewhere on the page never count.
+    """
+    product = _ld_product(text)
+    if product is not None and product.get('offers'):
+        offers = product['offers']
+        offers = [offer for offer in (offers if isinstance(offers, list) else [offers])
+                  if isinstance(offer, dict)]
+        prices = [_price(offer.get('price', offer.get('lowPrice'))) for offer in offers]
+        prices = [price for price in prices if price is not None]
+        stock = [str(offer['availability']) for offer in offers if offer.get('availability')]
+        if prices or stock:
+            in_stock = not stock or any(not _UNAVAILABLE.search(s) for s in stock)
+            return (prices[0] if prices else None), in_stock
+
+    start = _MICRODATA_PRODUCT.search(text)
+    if start is None:
+        return None
+    # The main product's container ends where the next product (a related one) begins
+    end = _MICRODATA_PRODUCT.search(text, start.end())
+    price = stock = None
+    for tag in _ITEMPROP.finditer(text, start.end(), end.start() if end else len(text)):
+        value = _ITEMPROP_VALUE.search(tag.group(0))
+        if value is None:
+            continue
+        if tag.group(1).lower() == 'price' and price is None:
+            price = _price(value.group(1))
+        elif tag.group(1).lower() == 'availability' and stock is None:
+            stock = value.group(1)
+    if price is None and stock is None:
+        return None
+    return price, stock is None or not _UNAVAILABLE.search(stock)
+
+
+# schema.org product markup, which both built-in retailers' product pages carry
+SCHEMA_PRODUCT = ProductRules(read=read_schema_product)
+
+
+def product_cache_key(deal):
+    """Key of a product's check: its SKU, or its product URL without one"""
+    return f"{deal.source}|{deal.sku or deal.url}"
+
+
+class ProductStore:
+    """Last product page check per product, and the listed price it was made at"""
+
+    def __init__(self, path=DEFAULT_PRODUCTS_FILE):
+        self.path = path
+        try:
+            with open(path, 'r') as f:
+                self._products = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._products = {}
+
+    def __len__(self):
+        return len(self._products)
+
+    def get(self, deal):
+        """The check for ``deal``, when it was made at the price listed now"""
+        check = self._products.get(product_cache_key(deal))
+        if (check is None or check['listed'] != deal.sale_price
+                or check.get('version') != CHECK_VERSION):
+            return None
+        return check
+
+    def put(self, deal, price, in_stock):
+        """Record a check; ``in_stock`` is None when the page had no product data"""
+        self._products[product_cache_key(deal)] = {
+            'listed': deal.sale_price,
+            'price': price,
+            'in_stock': in_stock,
+            'version': CHECK_VERSION,
+            'checked': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self._products, f, separators=(',', ':'))
+
+
+def read_product_page(text, rules):
+    """(price or None, in stock) from a product page
+
+    None when the page has neither a price nor a sold-out marker where
+    ``rules`` look, since it can't confirm anything about the product.
+    """
+    if rules.read is not None:
+        return rules.read(text)
+    if rules.scope is not None:
+        scope = rules.scope.search(text)
+        if scope is None:
+            return None
+        text = scope.group(1 if scope.re.groups else 0)
+    match = rules.price.search(text)
+    price = _price(match.group(1)) if match else None
+    sold_out = rules.sold_out is not None and rules.sold_out.search(text) is not None
+    if price is None and not sold_out:
+        return None
+    return price, not sold_out
+
+
+def apply_check(deal, check):
+    """A copy of ``deal`` at its product page's price, or None when sold out
+
+    The listing's deal is left as it was, since the seen store and parse
+    cache compare against listed prices. A page without product data
+    leaves the deal as listed.
+    """
+    if check['in_stock'] is None:
+        return deal
+    if not check['in_stock']:
+        return None
+    price = check['price']
+    if not price or price == deal.sale_price or price > deal.original_price:
+        return deal
+    savings = round(deal.original_price - price, 2)
+    pct = savings / deal.original_price * 100
+    pct = round(pct, 1) if isinstance(deal.discount_pct, float) else round(pct)
+    return replace(deal, sale_price=price, savings=savings, discount_pct=pct)
+
+
+class ProductEnricher:
+    """Checks product pages through a retailer's HttpEngine
+
+    At most ``concurrency`` product pages are fetched at once across every
+    retailer and category being enriched, and at most
+    ``max_checks`` per run; products over the limit keep their listing
+    data and are checked on a later run. Counts of what happened are kept
+    in ``stats``.
+    """
+
+    def __init__(self, store, concurrency=DEFAULT_ENRICH_CONCURRENCY, max_checks=DEFAULT_ENRICH_MAX):
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        self.max_checks = max_checks
+        self._started = 0
+        self._slots = None
+        self._loop = None
+        self.stats = dict.fromkeys(('checked', 'cached', 'deferred', 'failed', 'unread',
+                                    'sold_out', 'repriced'), 0)
+
+    def reset(self):
+        """Start a new run: clear the counts and the per-run limit"""
+        self._started = 0
+        self.stats = dict.fromkeys(self.stats, 0)
+
+    def _shared_slots(self):
+        """One semaphore for every concurrent ``enrich`` call on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._slots
+
+    async def _check(self, engine, deal, rules):
+        async with self._shared_slots():
+            result = await engine.fetch(deal.url)
+        if result.error:
+            self.stats['failed'] += 1
+            return None
+        self.stats['checked'] += 1
+        found = read_product_page(result.text, rules)
+        if found is None:
+            self.stats['unread'] += 1
+            found = (None, None)
+        self.store.put(deal, *found)
+        return self.store.get(deal)
+
+    async def enrich(self, deals, engine, rules):
+        """``deals`` with sold-out products dropped and prices confirmed
+
+        Only deals whose URL came from their tile's link are checked. The
+        rest still point at a listing page, whose first product says
+        nothing about them, so they pass through unchanged, as do deals
+        whose page couldn't be fetched.
+        """
+        checks = {}
+        pending = {}
+        for deal in deals:
+            if not deal.linked:
+                continue
+            key = product_cache_key(deal)
+            check = self.store.get(deal)
+            if check is not None:
+                self.stats['cached'] += 1
+                checks[key] = check
+            elif key in pending:
+                continue
+            elif self.max_checks is not None and self._started >= self.max_checks:
+                self.stats['deferred'] += 1
+            else:
+                # Counted before any fetch starts, so concurrent calls share the limit
+                self._started += 1
+                pending[key] = deal
+
+        found = await asyncio.gather(*(self._check(engine, deal, rules)
+                                       for deal in pending.values()))
+        checks.update((key, check) for key, check in zip(pending, found) if check is not None)
+
+        kept = []
+        for deal in deals:
+            check = checks.get(product_cache_key(deal)) if deal.linked else None
+            if check is None:
+                kept.append(deal)
+                continue
+            confirmed = apply_check(deal, check)
+            if confirmed is None:
+                self.stats['sold_out'] += 1
+                continue
+            if confirmed is not deal:
+                self.stats['repriced'] += 1
+            kept.append(confirmed)
+        return kept
@@ -0,0 +1,62 @@
+"""
+Deal Exports
+Reddit posts and CSV rows of each deal, rendered when the dashboard is built
+
+The dashboard's copy and export buttons join these fragments for the
+selected deals instead of formatting them in the browser, and the same
+fragments make up the downloadable per-tier and per-source bundles.
+"""
+
+import csv
+import io
+import re
+from itertools import tee
+
+CSV_HEADER = 'Product,Original Price,Sale Price,Savings,Discount %,Source,URL,SKU\n'
+# Between posts, and after the last one, when posts are copied together
+POST_SEPARATOR = '\n\n---\n\n'
+
+_MARKDOWN = re.compile(r'([\\`*_~\[\]<>^|])')
+
+
+def escape_markdown(text):
+    """Backslash-escape characters Reddit markdown would format"""
+    return _MARKDOWN.sub(r'\\\1', text)
+
+
+def markdown_url(url):
+    """A URL that can't end a markdown link early"""
+    return url.replace(' ', '%20').replace('(', '%28').replace(')', '%29')
+
+
+def reddit_post(deal):
+    """Reddit markdown for one deal, followed by ``POST_SEPARATOR``"""
+    pct = deal['discount_pct']
+    emoji = '🔥' if pct >= 30 else '⛳'
+    source = escape_markdown(deal['source'])
+    link = 'Link to deal' if deal.get('sku') else 'Link to deals page'
+    return (f"**{emoji} [{source}] {escape_markdown(deal['product_name'])} - "
+            f"${deal['sale_price']:.2f} ({pct:.0f}% off!)**\n\n"
+            f"~~${deal['original_price']:.2f}~~ **${deal['sale_price']:.2f}** - "
+            f"Save ${deal['savings']:.2f}\n\n"
+            f"[{link}]({markdown_url(deal['url'])})\n\n"
+            f"Source: {source}" + POST_SEPARATOR)
+
+
+def csv_rows(deals):
+    """Yield one CSV line per deal, quoted by the csv module, matching ``CSV_HEADER``"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for deal in deals:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow((deal['product_name'], deal['original_price'], deal['sale_price'],
+                         deal['savings'], deal['discount_pct'], deal['source'], deal['url'],
+                         deal.get('sku') or ''))
+        yield buffer.getvalue()
+
+
+def export_rows(deals):
+    """Yield ``(deal, Reddit post, CSV line)`` for each deal in turn"""
+    deals, posted, rowed = tee(deals, 3)
+    return zip(deals, map(reddit_post, posted), csv_rows(rowed))
@@ -0,0 +1,329 @@
+"""
+Page Text Extraction
+Turns retailer HTML into plain text, one line per product tile, before the deal patterns run
+
+Scripts, styles and attributes never reach the parse rules, entities are
+decoded and whitespace is collapsed. Each tile also keeps its first link,
+first image and SKU attribute, so deals can point at the product itself.
+
+Tiles are cut out of the raw HTML with a few regex scans, which costs
+about as much as running the deal patterns over the markup did. Pages
+without tiles are read whole from ``<body>``, minus page chrome (title,
+navigation, header, breadcrumbs) that would otherwise run into the first
+product name. selectolax or lxml is used for that when installed;
+otherwise a streaming ``html.parser`` fallback gives the same result.
+"""
+
+import html as htmllib
+import importlib.util
+import re
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from html.parser import HTMLParser
+
+SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg'})
+# Left out of whole-page text as well
+PAGE_SKIP_TAGS = frozenset({'head', 'title', 'nav', 'header'})
+PAGE_SKIP_CLASSES = frozenset({'breadcrumb', 'breadcrumbs'})
+
+_SPACE = re.compile(r'\s+')
+_BULLETS = re.compile(r'\s*·(?:\s*·)*\s*')
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_SKIPPED = re.compile(r'<(%s)\b[^>]*>.*?</\1\s*>' % '|'.join(sorted(SKIP_TAGS)),
+                      re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r'<[^>]*>')
+_TAG_NAME = re.compile(r'[a-zA-Z][\w:-]*')
+_SKIP_HINT = re.compile(r'<(?:%s)\b' % '|'.join(sorted(SKIP_TAGS)), re.IGNORECASE)
+# The tile class must be a whole token inside a class attribute's value
+_CLASS_EDGE = '"\' \t\n\r\f'
+_IN_CLASS = re.compile(r'''\sclass\s*=\s*["']?[^"'>=]*$''', re.IGNORECASE)
+_LINK = re.compile(r'<a\s[^>]*>', re.IGNORECASE)
+_IMAGE = re.compile(r'<img\s[^>]*>', re.IGNORECASE)
+
+
+def normalize(text):
+    """Collapse whitespace and runs of ``·`` separators"""
+    text = _BULLETS.sub(' · ', _SPACE.sub(' ', text))
+    return text.strip(' ·')
+
+
+@dataclass(slots=True)
+class Tile:
+    """Text of one product tile, with the link, image and SKU found in it
+
+    ``link`` and ``image`` are the ``href`` of the tile's first link and the
+    source of its first image (``data-src`` before ``src``, for lazy-loaded
+    images), as written in the page.
+    """
+    text: str
+    link: str = ''
+    image: str = ''
+    sku: str = ''
+
+
+def _image_source(get):
+    return get('data-src') or get('src') or ''
+
+
+@lru_cache(maxsize=None)
+def _attr_pattern(name):
+    return re.compile(r'''\s%s\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''' % re.escape(name),
+                      re.IGNORECASE)
+
+
+def _attr(tag, name):
+    """Value of attribute ``name`` in an opening tag's source, decoded like a parser would"""
+    match = _attr_pattern(name).search(tag)
+    if match is None:
+        return None
+    return htmllib.unescape(match.group(1) or match.group(2) or match.group(3) or '')
+
+
+@lru_cache(maxsize=None)
+def _literal(text):
+    return re.compile(re.escape(text))
+
+
+@lru_cache(maxsize=None)
+def _same_tag(name):
+    return re.compile(r'<(/?)%s\b[^>]*>' % re.escape(name), re.IGNORECASE)
+
+
+def _tile_tag(html, start, end):
+    """Start of the opening tag whose class list holds ``html[start:end]``, or -1"""
+    if html[start - 1] not in _CLASS_EDGE or end >= len(html) or html[end] not in _CLASS_EDGE + '>':
+        return -1
+    open_at = html.rfind('<', 0, start)
+    if open_at < 0 or html.find('>', open_at, start) >= 0:
+        return -1
+    return open_at if _IN_CLASS.search(html, open_at, start) else -1
+
+
+def _regex_tiles(html, tile, sku_attr):
+    """Tiles cut straight out of the markup, each up to its matching closing tag
+
+    A tile nested in another is part of the outer one, as with
+    ``html.parser``.
+    """
+    tiles = []
+    pos = 0
+    for match in _literal(tile).finditer(html):
+        if match.start() < pos:
+            continue
+        open_at = _tile_tag(html, match.start(), match.end())
+        open_end = html.find('>', match.end()) + 1
+        name = _TAG_NAME.match(html, open_at + 1) if open_at >= 0 and open_end else None
+        if name is None:
+            continue
+        tag = html[open_at:open_end]
+        end = len(html)
+        if not tag.endswith('/>'):
+            depth = 1
+            for other in _same_tag(name.group(0)).finditer(html, open_end):
+                if other.group(1):
+                    depth -= 1
+                elif not other.group(0).endswith('/>'):
+                    depth += 1
+                if depth == 0:
+                    end = other.start()
+                    break
+        pos = end
+        inner = html[open_end:end]
+        if '<!' in inner or _SKIP_HINT.search(inner):
+            inner = _SKIPPED.sub(' ', _COMMENT.sub(' ', inner))
+        link = ''
+        for anchor in _LINK.finditer(inner):
+            link = _attr(anchor.group(0), 'href')
+            if link:
+                break
+        image = _IMAGE.search(inner)
+        tiles.append(Tile(htmllib.unescape(_TAG.sub(' ', inner)), link=link or '',
+                          image=_image_source(partial(_attr, image.group(0))) if image else '',
+                          sku=_attr(tag, sku_attr) or '' if sku_attr else ''))
+    return tiles
+
+
+class _TileParser(HTMLParser):
+    """Collects the text of each element carrying the tile class, and of the whole page"""
+
+    VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+                           'meta', 'param', 'source', 'track', 'wbr'})
+
+    def __init__(self, tile=None, sku_attr=None):
+        super().__init__(convert_charrefs=True)
+        self.tile = tile
+        self.sku_attr = sku_attr
+        self.tiles = []
+        self.page = []
+        self._stack = []
+        self._tile_depth = None
+        self._skip_depth = None
+        self._page_skip_depth = None
+        self._parts = None
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        current = self._current
+        if current is not None and self._skip_depth is None:
+            if tag == 'a' and not current.link:
+                current.link = dict(attrs).get('href') or ''
+            elif tag == 'img' and not current.image:
+                current.image = _image_source(dict(attrs).get)
+        if tag in self.VOID_TAGS:
+            return
+        self._stack.append(tag)
+        depth = len(self._stack)
+        if self._skip_depth is None and tag in SKIP_TAGS:
+            self._skip_depth = depth
+            return
+        classes = (dict(attrs).get('class') or '').split()
+        if self._page_skip_depth is None and (tag in PAGE_SKIP_TAGS
+                                              or PAGE_SKIP_CLASSES.intersection(classes)):
+            self._page_skip_depth = depth
+        if self.tile and self._tile_depth is None:
+            if self.tile in classes:
+                attrs = dict(attrs)
+                self._tile_depth = depth
+                self._parts = []
+                self._current = Tile('', sku=attrs.get(self.sku_attr) or '' if self.sku_attr else '')
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            return
+        # Close any unclosed children along with their parent
+        while self._stack:
+            depth = len(self._stack)
+            closed = self._stack.pop()
+            if self._skip_depth == depth:
+                self._skip_depth = None
+            if self._page_skip_depth == depth:
+                self._page_skip_depth = None
+            if self._tile_depth == depth:
+                self.close_tile()
+            if closed == tag:
+                break
+
+    def close_tile(self):
+        self._current.text = ' '.join(self._parts)
+        self.tiles.append(self._current)
+        self._tile_depth = None
+        self._parts = None
+        self._current = None
+
+    def handle_data(self, data):
+        if self._skip_depth is not None:
+            return
+        if self._parts is not None:
+            self._parts.append(data)
+        if self._page_skip_depth is None:
+            self.page.append(data)
+
+
+def _stdlib_extract(html, tile, sku_attr):
+    parser = _TileParser(tile, sku_attr)
+    parser.feed(html)
+    parser.close()
+    if parser._parts is not None:
+        parser.close_tile()
+    return parser.tiles or ' '.join(parser.page)
+
+
+_PAGE_SKIP_SELECTOR = ', '.join(sorted(PAGE_SKIP_TAGS) + [f'.{name}' for name in sorted(PAGE_SKIP_CLASSES)])
+_PAGE_SKIP_XPATH = ' | '.join([f'.//{tag}' for tag in sorted(PAGE_SKIP_TAGS)] + [
+    f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+    for name in sorted(PAGE_SKIP_CLASSES)])
+
+
+def _selectolax_tile(node, sku_attr):
+    link = node.css_first('a[href]')
+    image = node.css_first('img')
+    return Tile(node.text(deep=True, separator=' ', strip=False),
+                link=link.attributes.get('href') or '' if link is not None else '',
+                image=_image_source(image.attributes.get) if image is not None else '',
+                sku=node.attributes.get(sku_attr) or '' if sku_attr else '')
+
+
+def _selectolax_extract(html, tile, sku_attr):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(SKIP_TAGS))
+    if tile:
+        tiles = [_selectolax_tile(node, sku_attr) for node in tree.css(f'.{tile}')]
+        if tiles:
+            return tiles
+    root = tree.body or tree.root
+    if root is None:
+        return ''
+    for node in root.css(_PAGE_SKIP_SELECTOR):
+        node.decompose()
+    return root.text(deep=True, separator=' ', strip=False)
+
+
+def _lxml_tile(node, sku_attr):
+    links = node.xpath('.//a[@href]')
+    images = node.xpath('.//img')
+    return Tile(' '.join(node.itertext()),
+                link=links[0].get('href') if links else '',
+                image=_image_source(images[0].get) if images else '',
+                sku=node.get(sku_attr) or '' if sku_attr else '')
+
+
+def _lxml_extract(html, tile, sku_attr):
+    import lxml.html
+    from lxml import etree
+
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ''
+    etree.strip_elements(root, *SKIP_TAGS, with_tail=False)
+    if tile:
+        xpath = f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {tile} ')]"
+        tiles = [_lxml_tile(node, sku_attr) for node in root.xpath(xpath)]
+        if tiles:
+            return tiles
+    body = root.find('body')
+    body = root if body is None else body
+    for node in body.xpath(_PAGE_SKIP_XPATH):
+        node.drop_tree()
+    return ' '.join(body.itertext())
+
+
+def _installed(module):
+    """Whether ``module`` can be imported, without importing it"""
+    return importlib.util.find_spec(module) is not None
+
+
+# Backends are imported on first use, so loading this module stays cheap
+BACKENDS = {name: extract for name, module, extract in (
+    ('selectolax', 'selectolax', _selectolax_extract),
+    ('lxml', 'lxml', _lxml_extract),
+    ('html.parser', 'html', _stdlib_extract),
+) if _installed(module)}
+BACKEND = next(iter(BACKENDS))
+
+
+def extract_text(html, tile=None, backend=None, sku_attr=None):
+    """Normalized text of ``html``
+
+    Returns a list with one ``Tile`` per element whose class list contains
+    ``tile`` (``sku_attr`` names the element attribute holding its SKU), or
+    the text of the document's body as a single string when there is no
+    ``tile`` or no element carries it. Tiles come from the regex scan
+    unless a ``backend`` is named.
+    """
+    text = _regex_tiles(html, tile, sku_attr) if tile and backend is None else None
+    if not text:
+        text = BACKENDS[backend or BACKEND](html, tile, sku_attr)
+    if isinstance(text, str):
+        return normalize(text)
+    tiles = []
+    for found in text:
+        found.text = normalize(found.text)
+        if found.text:
+            found.link = found.link.strip()
+            found.image = found.image.strip()
+            found.sku = found.sku.strip()
+            tiles.append(found)
+    return tiles
@@ -0,0 +1,530 @@
+"""
+Deal Finder
+Crawls every registered retailer's categories and collects their deals
+
+``DealFinder`` is the async API for services that run their own event
+loop: ``stream_deals`` yields deals as each category finishes, with an
+overall and a per-category timeout, and hands them to caller-supplied
+sinks instead of writing files. ``SimpleDealFinder`` wraps it with the
+progress output and raw deals file of the ``golfdeals fetch`` command;
+``add_arguments`` and ``run`` back that command and
+scripts/find_deals_simple.py.
+"""
+
+import asyncio
+import inspect
+import sys
+from contextlib import aclosing
+from datetime import datetime
+
+from golfdeals.alerts import TopDeals
+from golfdeals.cache import DEFAULT_CACHE_DIR, ResponseCache
+from golfdeals.crawl import DEFAULT_SEEN_FILE, CrawlResult, PageCrawler, SeenStore
+from golfdeals.enrich import (DEFAULT_ENRICH_CONCURRENCY, DEFAULT_ENRICH_MAX,
+                              DEFAULT_PRODUCTS_FILE, ProductEnricher, ProductStore)
+from golfdeals.http import HttpEngine
+from golfdeals.limits import RetryPolicy, SharedLimit
+from golfdeals.metrics import RunMetrics
+from golfdeals.parsing import GCW_RULES, GOLF_TOWN_RULES, parse_page
+from golfdeals.pipeline import ParsePool, default_workers
+from golfdeals.records import as_deal
+from golfdeals.retailers import REGISTRY, get_retailers, load_config
+from golfdeals.storage import RAW_DEALS_FILE, RAW_DEALS_NDJSON, NdjsonDealWriter, save_raw_deals
+
+
+class DealFinder:
+    """Crawls retailers from inside a running event loop
+
+    Each retailer from the registry gets its own HttpEngine and crawler, so
+    one shop's concurrency, rate limit and circuit breaker never hold up
+    another's; ``concurrency`` still caps requests in flight across all of
+    them. A ``client`` (any object with an ``async fetch(url)``
+    returning a FetchResult) is shared by every retailer instead and is
+    left open for the caller. Nothing is printed or written to disk unless
+    a ``cache`` or ``seen`` store is passed; ``sinks`` receive each finished
+    category's deals through ``write(deals)``, which may be a coroutine.
+
+    Every fetch, parse and stage is recorded on ``self.metrics``. With an
+    ``enricher``, each category's deals are checked against their product
+    pages before they are yielded.
+    """
+
+    # Bump when parser output changes so cached parse results are ignored
+    PARSER_VERSION = 5
+
+    def __init__(self, client=None, retailers=None, sinks=(), concurrency=8, per_host=4,
+                 cache=None, offline=False, seen=None, page_window=4, max_pages=50,
+                 early_stop=True, rate=None, retries=2, parse_pool=None, metrics=None,
+                 enricher=None):
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        self.all_deals = []
+        self.category_results = []
+        self.cache = cache
+        self.seen = seen
+        self.sinks = list(sinks)
+        self.parse_pool = parse_pool
+        self.enricher = enricher
+        self.metrics = metrics or RunMetrics()
+        self.retailers = list(retailers) if retailers is not None else get_retailers()
+        # Engines the finder made itself, and so closes
+        self._owns_engines = client is None
+        # Every engine the finder makes draws from one global in-flight cap
+        self.fetch_limit = SharedLimit(concurrency)
+
+        def make_engine(concurrency, per_host, rate):
+            return HttpEngine(headers=self.headers, concurrency=concurrency, per_host=per_host,
+                              cache=cache, offline=offline, rate=rate,
+                              retry=RetryPolicy(attempts=retries + 1), metrics=self.metrics,
+                              shared=self.fetch_limit)
+
+        # Engine for one-off fetch_page calls, made on first use so a finder
+        # that only crawls never starts an extra thread pool
+        self.engine = client
+        self._make_default_engine = lambda: make_engine(concurrency, per_host, rate)
+        self.offline = offline
+        self.engines = {}
+        self.crawlers = {}
+        for retailer in self.retailers:
+            retailer_engine = client or make_engine(
+                min(concurrency, retailer.concurrency), retailer.per_host or per_host,
+                retailer.rate if retailer.rate is not None else rate)
+            self.engines[retailer.key] = retailer_engine
+            self.crawlers[retailer.key] = PageCrawler(retailer_engine, seen, window=page_window,
+                                                      max_pages=max_pages, early_stop=early_stop)
+
+    def _log(self, message):
+        """Progress output; quiet here, printed by SimpleDealFinder"""
+
+    def save_state(self):
+        """Persist the seen products and product page checks"""
+        if self.seen is not None:
+            self.seen.save()
+        if self.enricher is not None:
+            self.enricher.store.save()
+
+    def close(self):
+        """Release connections and persist the response cache"""
+        if self._owns_engines:
+            engines = [self.engine, *self.engines.values()]
+            for engine in {id(e): e for e in engines if e is not None}.values():
+                engine.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        if self.cache is not None:
+            if not (self.offline or getattr(self.engine, 'offline', False)):
+                self.cache.evict()
+            self.cache.save()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def parse_cached(self, html, url, parser, key=None):
+        """Run ``parser``, reusing its cached output when the page is unchanged"""
+        if self.cache is None:
+            return parser(html, url)
+        key = key or f"{parser.__name__}-v{self.PARSER_VERSION}"
+        deals = self.cache.load_parsed(url, key, html)
+        if deals is not None:
+            deals = [as_deal(deal) for deal in deals]
+        else:
+            deals = parser(html, url)
+            self.cache.store_parsed(url, key, html, deals)
+        return deals
+
+    def _report(self, result, url, retailer_key):
+        self.metrics.record_parse(retailer_key, url, result)
+        if result.failures:
+            self._log(f"    ⚠️  {result.failures} of {result.matches} candidates failed "
+                      f"to parse on {url}")
+        return result.deals
+
+    def _parse(self, text, url, rules, retailer_key):
+        return self._report(parse_page(text, url, rules), url, retailer_key)
+
+    def parse_retailer_deals(self, retailer, text, url):
+        """Parse a page in ``retailer``'s format"""
+        return self._parse(text, url, retailer.rules, retailer.key)
+
+    def parse_gcw_deals(self, text, url):
+        """Parse Golf Clearance Warehouse format"""
+        return self._parse(text, url, GCW_RULES, 'gcw')
+
+    def parse_golf_town_deals(self, text, url):
+        """Parse Golf Town format"""
+        return self._parse(text, url, GOLF_TOWN_RULES, 'golf_town')
+
+    def _page_parser(self, retailer, category_name):
+        key = f"{retailer.key}-v{self.PARSER_VERSION}"
+
+        def label(deals):
+            for deal in deals:
+                deal.category = category_name
+            return deals
+
+        def cached(text, page_url):
+            deals = self.cache.load_parsed(page_url, key, text) if self.cache is not None else None
+            if deals is None:
+                return None
+            self.metrics.record_parse(retailer.key, page_url, deals=len(deals))
+            return label([as_deal(deal) for deal in deals])
+
+        def store(text, page_url, deals):
+            if self.cache is not None:
+                self.cache.store_parsed(page_url, key, text, deals)
+            return label(deals)
+
+        if self.parse_pool is None:
+            def parse(text, page_url):
+                deals = cached(text, page_url)
+                if deals is None:
+                    deals = store(text, page_url, self.parse_retailer_deals(retailer, text, page_url))
+                return deals
+            return parse
+
+        async def parse_in_pool(text, page_url):
+            deals = cached(text, page_url)
+            if deals is None:
+                result = await self.parse_pool.parse(text, page_url, retailer.rules)
+                deals = store(text, page_url, self._report(result, page_url, retailer.key))
+            return deals
+        return parse_in_pool
+
+    async def _crawl(self, retailer, url, category_name):
+        crawler = self.crawlers[retailer.key]
+        crawl = await crawler.crawl(url, self._page_parser(retailer, category_name))
+        if self.enricher is not None and retailer.product is not None:
+            crawl.deals = await self.enricher.enrich(crawl.deals, self.engines[retailer.key],
+                                                     retailer.product)
+        return crawl
+
+    async def _finish(self, crawl, label):
+        """Remember a finished crawl's products and hand its deals to the sinks"""
+        self.category_results.append({
+            'category': label,
+            'url': crawl.url,
+            'ok': crawl.pages > 0,
+            'pages': crawl.pages,
+            'deals': len(crawl.deals),
+            'errors': len(crawl.errors),
+        })
+        if self.seen is not None and crawl.pages:
+            self.seen.update(crawl.url, crawl.paged_deals)
+        for sink in self.sinks:
+            written = sink.write(crawl.deals)
+            if inspect.isawaitable(written):
+                await written
+
+    async def crawl_and_finish(self, retailer, url, category_name):
+        """Crawl every page of a category and record the result"""
+        crawl = await self._crawl(retailer, url, category_name)
+        await self._finish(crawl, f"{retailer.label} {category_name}")
+        return crawl
+
+    async def stream_categories(self, concurrent=True, timeout=None, category_timeout=None):
+        """Yield ``(retailer, category name, CrawlResult)`` as each category finishes
+
+        Categories are crawled all at once, or one after another unless
+        ``concurrent``. One that takes longer than ``category_timeout``
+        seconds, or whose crawl raises, is yielded with an error and no pages.
+        ``asyncio.TimeoutError`` is raised once ``timeout`` seconds have
+        passed overall. Whenever the stream stops early (a timeout, the
+        caller's task being cancelled, or ``aclose()`` after a ``break``),
+        the crawls still running are cancelled.
+        """
+        targets = [(retailer, url, name) for retailer in self.retailers
+                   for url, name in retailer.categories]
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        finished = asyncio.Queue()
+
+        async def crawl(retailer, url, name):
+            try:
+                result = await asyncio.wait_for(self._crawl(retailer, url, name), category_timeout)
+            except asyncio.TimeoutError:
+                result = CrawlResult(url, errors=[f"{url}: timed out after {category_timeout:g}s"])
+            except Exception as e:
+                # A failing client or parse pool costs this category only
+                result = CrawlResult(url, errors=[f"{url}: {type(e).__name__}: {e}"])
+            finished.put_nowait((retailer, name, result))
+
+        async def crawl_in_order():
+            for target in targets:
+                await crawl(*target)
+
+        if concurrent:
+            tasks = [asyncio.ensure_future(crawl(*target)) for target in targets]
+        else:
+            tasks = [asyncio.ensure_future(crawl_in_order())]
+        try:
+            for _ in targets:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                retailer, name, result = await asyncio.wait_for(finished.get(), remaining)
+                await self._finish(result, f"{retailer.label} {name}")
+                yield retailer, name, result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stream_deals(self, concurrent=True, timeout=None, category_timeout=None):
+        """Yield every deal, a category at a time as each finishes
+
+        Takes the options of ``stream_categories``. A category that fails
+        or times out yields nothing; ``category_results`` records it.
+        """
+        async with aclosing(self.stream_categories(concurrent, timeout,
+                                                   category_timeout)) as categories:
+            async for _, _, crawl in categories:
+                for deal in crawl.deals:
+                    yield deal
+
+    async def find_deals(self, concurrent=True, timeout=None, category_timeout=None):
+        """Every deal of ``stream_deals`` as a list"""
+        return [deal async for deal in self.stream_deals(concurrent, timeout, category_timeout)]
+
+
+class SimpleDealFinder(DealFinder):
+    """Directly scrapes golf deal sites
+
+    The blocking, printing DealFinder behind ``golfdeals fetch``. A
+    caller-supplied ``engine`` is shared by every retailer and closed with
+    the finder; a ``sink`` such as NdjsonDealWriter receives each
+    category's deals as they arrive and replaces the raw deals file.
+    """
+
+    def __init__(self, concurrency=8, per_host=4, engine=None, cache=None, offline=False,
+                 seen=None, page_window=4, max_pages=50, early_stop=True, sink=None,
+                 rate=None, retries=2, retailers=None, parse_pool=None, metrics=None,
+                 enricher=None):
+        super().__init__(client=engine, retailers=retailers,
+                         sinks=[sink] if sink is not None else (),
+                         concurrency=concurrency, per_host=per_host, cache=cache,
+                         offline=offline, seen=seen, page_window=page_window,
+                         max_pages=max_pages, early_stop=early_stop, rate=rate,
+                         retries=retries, parse_pool=parse_pool, metrics=metrics,
+                         enricher=enricher)
+        self.sink = sink
+        self._owns_engines = True
+
+    def _log(self, message):
+        print(message)
+
+    def fetch_page(self, url):
+        """Fetch a page and return text"""
+        if self.engine is None:
+            self.engine = self._make_default_engine()
+        result = asyncio.run(self.engine.fetch(url))
+        if result.error:
+            print(f"Error fetching {url}: {result.error}")
+            return ""
+        return result.text
+
+    def crawl_category(self, retailer, url, category_name):
+        """Crawl every page of a category and record the result"""
+        return asyncio.run(self.crawl_and_finish(retailer, url, category_name))
+
+    def _print_crawl(self, crawl):
+        for error in crawl.errors:
+            print(f"Error fetching {error}")
+        note = ""
+        if crawl.carried_over:
+            note = f", {crawl.carried_over} more unchanged since last run"
+        if crawl.pages:
+            print(f"    Found {len(crawl.deals)} deals on {crawl.pages} page(s){note}")
+        return crawl.deals
+
+    def scrape_category(self, retailer, url, category_name, crawl=None):
+        """Scrape one category of a retailer
+
+        A ``crawl`` passed in has already been recorded, as
+        ``stream_categories`` does.
+        """
+        print(f"  Scraping {retailer.label} {category_name}...")
+        if crawl is None:
+            crawl = self.crawl_category(retailer, url, category_name)
+        return self._print_crawl(crawl)
+
+    def scrape_gcw_category(self, url, category_name, crawl=None):
+        """Scrape Golf Clearance Warehouse category"""
+        return self.scrape_category(REGISTRY['gcw'], url, category_name, crawl)
+
+    def scrape_golf_town_category(self, url, category_name, crawl=None):
+        """Scrape Golf Town category"""
+        return self.scrape_category(REGISTRY['golf_town'], url, category_name, crawl)
+
+    def print_category_summary(self):
+        """One line per category: fetched, partly fetched or failed"""
+        print("\nCategory summary:")
+        for result in self.category_results:
+            if not result['ok']:
+                icon, detail = "❌", "failed"
+            else:
+                icon = "⚠️ " if result['errors'] else "✅"
+                detail = f"{result['deals']} deals on {result['pages']} page(s)"
+                if result['errors']:
+                    detail += f", {result['errors']} page(s) failed"
+            print(f"  {icon} {result['category']}: {detail}")
+
+    async def _collect_crawls(self, concurrent):
+        return {(retailer.key, crawl.url): crawl
+                async for retailer, _, crawl in self.stream_categories(concurrent)}
+
+    def find_all_deals(self, concurrent=True):
+        """Scrape all sites and categories
+
+        A blocking wrapper around ``stream_categories`` that reports each
+        category in registry order once every crawl is done.
+        """
+        print("🔍 Starting deal search...")
+        print(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print()
+
+        all_deals = []
+
+        with self.metrics.stage('crawl'):
+            crawls = asyncio.run(self._collect_crawls(concurrent))
+            # Categories are recorded as they finish; report them in registry order
+            labels = [f"{r.label} {name}" for r in self.retailers for _, name in r.categories]
+            order = {label: i for i, label in enumerate(labels)}
+            self.category_results.sort(key=lambda result: order.get(result['category'], len(order)))
+
+            for i, retailer in enumerate(self.retailers):
+                if i:
+                    print()
+                print(f"Searching {retailer.name}...")
+                for url, name in retailer.categories:
+                    deals = self.scrape_category(retailer, url, name, crawls[(retailer.key, url)])
+                    all_deals.extend(deals)
+        self.metrics.set_categories(self.category_results)
+
+        self.print_category_summary()
+        print(f"\n✅ Deal search complete! Found {len(all_deals)} total deals")
+
+        self.save_state()
+        if self.enricher is not None:
+            stats = self.enricher.stats
+            print(f"🔎 Product pages: {stats['checked']} checked, {stats['cached']} unchanged, "
+                  f"{stats['sold_out']} sold out, {stats['repriced']} re-priced"
+                  + (f", {stats['failed']} failed" if stats['failed'] else "")
+                  + (f", {stats['unread']} without product data" if stats['unread'] else "")
+                  + (f", {stats['deferred']} left for the next run" if stats['deferred'] else ""))
+
+        # Save deals
+        with self.metrics.stage('write_raw'):
+            if self.sink is not None:
+                self.sink.close()
+                print(f"📁 Deals streamed to {self.sink.path}")
+            else:
+                save_raw_deals(all_deals, RAW_DEALS_FILE)
+                print(f"📁 Deals saved to {RAW_DEALS_FILE}")
+
+        return all_deals
+
+
+def add_arguments(parser):
+    """Options of the fetch step"""
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="maximum requests in flight across all retailers (default: 8); "
+                             "a retailer's own lower limit applies under it")
+    parser.add_argument('--per-host', type=int, default=4,
+                        help="maximum requests in flight per host (default: 4)")
+    parser.add_argument('--sequential', action='store_true',
+                        help="fetch categories one at a time")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"HTTP response cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always download full pages")
+    parser.add_argument('--cache-ttl', type=float, default=7,
+                        help="days to keep cached pages (default: 7)")
+    parser.add_argument('--cache-max-mb', type=float, default=50,
+                        help="cache size limit in MB (default: 50)")
+    parser.add_argument('--offline', action='store_true',
+                        help="replay pages from the cache without any network access")
+    parser.add_argument('--max-pages', type=int, default=50,
+                        help="maximum pages to crawl per category (default: 50)")
+    parser.add_argument('--page-window', type=int, default=4,
+                        help="pages of one category fetched at a time (default: 4)")
+    parser.add_argument('--seen-file', default=DEFAULT_SEEN_FILE,
+                        help=f"products seen in the last run (default: {DEFAULT_SEEN_FILE})")
+    parser.add_argument('--no-early-stop', action='store_true',
+                        help="crawl every page even when nothing has changed")
+    parser.add_argument('--rate', type=float,
+                        help="maximum requests per second to each host (default: unlimited)")
+    parser.add_argument('--retries', type=int, default=2,
+                        help="retries for timeouts and 429/5xx responses (default: 2)")
+    parser.add_argument('--retailers', type=lambda value: value.split(','), metavar='KEYS',
+                        help=f"comma-separated retailers to search (default: all of "
+                             f"{', '.join(REGISTRY)})")
+    parser.add_argument('--retailers-config', metavar='PATH',
+                        help="JSON file of extra retailers to register")
+    parser.add_argument('--parse-workers', type=int, default=None, metavar='N',
+                        help="processes parsing pages; 0 parses on the fetch loop "
+                             "(default: one per core, or 0 on a single core)")
+    parser.add_argument('--enrich', action='store_true',
+                        help="check new and re-priced products on their own pages for stock "
+                             "and price")
+    parser.add_argument('--enrich-concurrency', type=int, default=DEFAULT_ENRICH_CONCURRENCY,
+                        metavar='N', help=f"product pages fetched at once "
+                                          f"(default: {DEFAULT_ENRICH_CONCURRENCY})")
+    parser.add_argument('--enrich-max', type=int, default=DEFAULT_ENRICH_MAX, metavar='N',
+                        help=f"product pages fetched per run; the rest wait for the next "
+                             f"(default: {DEFAULT_ENRICH_MAX})")
+    parser.add_argument('--products-file', default=DEFAULT_PRODUCTS_FILE, metavar='PATH',
+                        help=f"product page checks by SKU (default: {DEFAULT_PRODUCTS_FILE})")
+    parser.add_argument('--ndjson', nargs='?', const=RAW_DEALS_NDJSON, metavar='PATH',
+                        help=f"stream deals to newline-delimited JSON as each category "
+                             f"finishes (default path: {RAW_DEALS_NDJSON})")
+
+
+def build_finder(args, metrics=None):
+    """SimpleDealFinder set up from the options of ``add_arguments``"""
+    if args.offline and args.no_cache:
+        sys.exit("--offline needs the response cache")
+    if args.retailers_config:
+        load_config(args.retailers_config)
+    try:
+        retailers = get_retailers(args.retailers)
+    except KeyError as e:
+        sys.exit(e.args[0])
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl * 86400,
+                              max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    enricher = None
+    if args.enrich:
+        enricher = ProductEnricher(ProductStore(args.products_file),
+                                   concurrency=args.enrich_concurrency, max_checks=args.enrich_max)
+    workers = default_workers() if args.parse_workers is None else args.parse_workers
+    if args.parse_workers is None and workers < 2:
+        workers = 0
+    return SimpleDealFinder(concurrency=args.concurrency, per_host=args.per_host,
+                            cache=cache, offline=args.offline,
+                            seen=SeenStore(args.seen_file), page_window=args.page_window,
+                            max_pages=args.max_pages, early_stop=not args.no_early_stop,
+                            sink=NdjsonDealWriter(args.ndjson) if args.ndjson else None,
+                            rate=args.rate, retries=args.retries, retailers=retailers,
+                            parse_pool=ParsePool(workers) if workers > 0 else None,
+                            metrics=metrics, enricher=enricher)
+
+
+def run(args, metrics=None):
+    """Crawl with the options from ``add_arguments`` and return the deals"""
+    finder = build_finder(args, metrics)
+    try:
+        return finder.find_all_deals(concurrent=not args.sequential)
+    finally:
+        finder.close()
+
+
+def print_summary(deals):
+    tiers = TopDeals(0).extend(deals).tiers
+    print("\n" + "="*60)
+    print(f"Found {len(deals)} deals:")
+    print(f"  🔥 {tiers['excellent']} excellent (50%+ off)")
+    print(f"  🔥 {tiers['great']} great (30-49% off)")
+    print("="*60)
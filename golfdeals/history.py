@@ -0,0 +1,192 @@
+"""
+Price History
+Append-only SQLite store of the prices each product has been seen at
+
+A row is written only when a product's price differs from the last one
+recorded for it, so the table grows with price changes rather than with
+runs, and "what did this cost on day X" is the newest row at or before X.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from golfdeals.records import KEY_VERSION, product_key
+
+HISTORY_DB = 'docs/deal-history.sqlite'
+HISTORY_FILE = 'docs/deal-history.json'
+LOW_WINDOW_DAYS = 90
+DROP_WINDOW_DAYS = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_source ON products (source);
+
+CREATE TABLE IF NOT EXISTS prices (
+    product_id INTEGER NOT NULL REFERENCES products (id),
+    observed_at TEXT NOT NULL,
+    sale_price REAL NOT NULL,
+    original_price REAL NOT NULL,
+    discount_pct REAL NOT NULL,
+    PRIMARY KEY (product_id, observed_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prices_observed_at ON prices (observed_at);
+"""
+
+
+def _price_at(param):
+    """Latest price per product at or before the given query parameter"""
+    return f"""
+    SELECT p.product_id, p.sale_price FROM prices p
+    WHERE p.observed_at = (SELECT MAX(q.observed_at) FROM prices q
+                           WHERE q.product_id = p.product_id AND q.observed_at <= {param})
+    """
+
+
+# Price range over the window starting at :since, including the price that
+# was already current when the window opened
+_RANGE_SINCE = f"""
+SELECT product_id, MIN(sale_price) AS low, MAX(sale_price) AS high FROM (
+    SELECT product_id, sale_price FROM prices WHERE observed_at >= :since
+    UNION ALL
+    {_price_at(':since')}
+) GROUP BY product_id
+"""
+
+
+def _stamp(when):
+    return when.isoformat(timespec='seconds')
+
+
+class HistoryStore:
+    """Price history keyed by ``product_key``, indexed by product, source and date"""
+
+    def __init__(self, path=HISTORY_DB):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        # Stores from before product keys used SKUs still key products by name
+        self._legacy_keys = self.db.execute("PRAGMA user_version").fetchone()[0] < KEY_VERSION
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _adopt_legacy_keys(self, deals):
+        """Move name-keyed products over to the SKU keys of this run's deals
+
+        A product keeps its history under its new key; when several SKUs
+        share the old name, the first one listed inherits it.
+        """
+        renames = {}
+        for deal in deals:
+            if deal.get('sku'):
+                renames.setdefault(f"{deal['source']}|{deal['product_name']}", product_key(deal))
+        self.db.executemany("UPDATE OR IGNORE products SET key = ? WHERE key = ?",
+                            [(new, old) for old, new in renames.items()])
+        self.db.execute(f"PRAGMA user_version = {KEY_VERSION}")
+        self._legacy_keys = False
+
+    def _product_ids(self, deals, now):
+        """Map each deal's key to its product id, creating new products"""
+        stamp = _stamp(now)
+        rows = [(product_key(d), d['source'], d['product_name'], d['url'], stamp, stamp)
+                for d in deals]
+        self.db.executemany(
+            "INSERT INTO products (key, source, name, url, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET last_seen = excluded.last_seen, url = excluded.url",
+            rows)
+        ids = {}
+        keys = [row[0] for row in rows]
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ','.join('?' * len(chunk))
+            ids.update(self.db.execute(
+                f"SELECT key, id FROM products WHERE key IN ({marks})", chunk))
+        return ids
+
+    def record(self, deals, now=None):
+        """Store the prices seen in this run; returns how many changed"""
+        now = now or datetime.now()
+        with self.db:
+            if self._legacy_keys:
+                self._adopt_legacy_keys(deals)
+            ids = self._product_ids(deals, now)
+            last = dict(self.db.execute(_price_at(':at'), {'at': _stamp(now)}))
+            changes = []
+            for deal in deals:
+                pid = ids[product_key(deal)]
+                if last.get(pid) != deal['sale_price']:
+                    last[pid] = deal['sale_price']
+                    changes.append((pid, _stamp(now), deal['sale_price'],
+                                    deal['original_price'], deal['discount_pct']))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?)", changes)
+        return len(changes)
+
+    def range_since(self, since):
+        """``{product key: (lowest, highest)}`` over the window starting at ``since``"""
+        rows = self.db.execute(
+            f"SELECT key, low, high FROM products JOIN ({_RANGE_SINCE}) ON product_id = id",
+            {'since': _stamp(since)})
+        return {key: (low, high) for key, low, high in rows}
+
+    def price_at(self, when, source=None):
+        """``{product key: price}`` as of ``when``, optionally for one source"""
+        query = f"SELECT key, sale_price FROM products JOIN ({_price_at(':at')}) ON product_id = id"
+        params = {'at': _stamp(when)}
+        if source is not None:
+            query += " WHERE source = :source"
+            params['source'] = source
+        return dict(self.db.execute(query, params))
+
+    def product_history(self, key):
+        """``[(observed_at, sale_price), ...]`` for one product, oldest first"""
+        return self.db.execute(
+            "SELECT observed_at, sale_price FROM prices JOIN products ON product_id = id "
+            "WHERE key = ? ORDER BY observed_at", (key,)).fetchall()
+
+    def signals(self, deals, now=None, low_days=LOW_WINDOW_DAYS, drop_days=DROP_WINDOW_DAYS):
+        """Price signals for the current deals
+
+        ``low_price``/``high_price`` span the last ``low_days``;
+        ``previous_price`` is the price as of ``drop_days`` ago and is present
+        only when the product was already known then.
+        """
+        now = now or datetime.now()
+        ranges = self.range_since(now - timedelta(days=low_days))
+        before = self.price_at(now - timedelta(days=drop_days))
+        signals = {}
+        for deal in deals:
+            key = product_key(deal)
+            if key not in ranges:
+                continue
+            entry = signals[key] = {'low_price': ranges[key][0], 'high_price': ranges[key][1]}
+            if key in before:
+                entry['previous_price'] = before[key]
+        return signals
+
+
+def save_signals(signals, path=HISTORY_FILE, timestamp=None):
+    """Write the dashboard's price signals"""
+    with open(path, 'w') as f:
+        json.dump({'timestamp': timestamp or datetime.now().isoformat(), 'products': signals},
+                  f, separators=(',', ':'), sort_keys=True)
@@ -0,0 +1,217 @@
+"""
+Pooled HTTP Engine
+Fetches many pages concurrently over a shared keep-alive session
+"""
+
+import asyncio
+import contextlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from golfdeals.limits import CircuitBreaker, RetryPolicy, TokenBucket
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header, when it gives a number"""
+    if response is None:
+        return None
+    try:
+        return max(0.0, float(response.headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single page fetch"""
+    url: str
+    status: int = 0
+    text: str = ''
+    error: str = ''
+    elapsed: float = 0.0
+    from_cache: bool = False
+    attempts: int = 1
+    retry_after: float = None
+    size: int = 0
+
+    @property
+    def ok(self):
+        return not self.error
+
+
+class HttpEngine:
+    """Concurrent page fetcher with global and per-host limits
+
+    Requests go through one ``requests.Session`` so connections to each host
+    are kept alive and reused. Blocking calls run on a thread pool while
+    asyncio semaphores cap the total and per-host number in flight.
+
+    With a ``ResponseCache`` attached, requests are made conditional and a
+    304 is answered from the cached body. ``offline`` replays the cache only
+    and never touches the network.
+
+    ``fetch`` also paces each host to ``rate`` requests per second (when
+    set), retries timeouts and retryable statuses per ``retry``, and stops
+    sending to a host once its circuit breaker opens. ``get`` makes a single
+    attempt. Every attempt ``fetch`` makes is recorded on ``metrics`` (a
+    ``RunMetrics``) when one is attached. With a ``shared`` SharedLimit,
+    every request also needs one of its slots, taken last so a request
+    waiting on this engine's own limits never holds one.
+    """
+
+    def __init__(self, headers=None, timeout=15, concurrency=8, per_host=4, session=None,
+                 cache=None, offline=False, connect_timeout=5, rate=None, burst=None,
+                 retry=None, breaker_threshold=5, breaker_reset=30.0, metrics=None, shared=None):
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.timeout = timeout
+        self.connect_timeout = min(connect_timeout, timeout)
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, min(per_host, self.concurrency))
+        self.cache = cache
+        self.offline = offline
+        self.rate = rate
+        self.burst = burst or self.per_host
+        self.retry = retry or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.metrics = metrics
+        self.shared = shared
+        self._session = session
+        self._executor = None
+        self._limits = None
+        self._buckets = {}
+        self._breakers = {}
+
+    @property
+    def session(self):
+        """Shared session, created on first use"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.per_host)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+
+    def get(self, url):
+        """Fetch a page, blocking, and return a FetchResult"""
+        start = time.perf_counter()
+        if self.offline:
+            text = self.cache.load_body(url) if self.cache is not None else None
+            if text is None:
+                return FetchResult(url, error='not in cache (offline)')
+            return FetchResult(url, 200, text, from_cache=True)
+
+        headers = self.cache.conditional_headers(url) if self.cache is not None else {}
+        try:
+            timeout = (self.connect_timeout, self.timeout)
+            response = self.session.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and self.cache is not None:
+                text = self.cache.load_body(url)
+                if text is not None:
+                    self.cache.touch(url)
+                    return FetchResult(url, 304, text, elapsed=time.perf_counter() - start,
+                                       from_cache=True, size=len(response.content))
+                response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            if self.cache is not None:
+                self.cache.store(url, response.text, response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'))
+            return FetchResult(url, response.status_code, response.text,
+                               elapsed=time.perf_counter() - start, size=len(response.content))
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            status = getattr(response, 'status_code', 0) or 0
+            return FetchResult(url, status, error=str(e), elapsed=time.perf_counter() - start,
+                               retry_after=_retry_after(response))
+
+    def _loop_limits(self):
+        """Semaphores for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._limits is None or self._limits[0] is not loop:
+            self._limits = (loop, asyncio.Semaphore(self.concurrency), {})
+        return self._limits
+
+    def _host_limit(self, url):
+        _, _, hosts = self._loop_limits()
+        host = urlsplit(url).netloc
+        if host not in hosts:
+            hosts[host] = asyncio.Semaphore(self.per_host)
+        return hosts[host]
+
+    def breaker(self, host):
+        """Circuit breaker for ``host``"""
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+        return self._breakers[host]
+
+    async def _pace(self, host):
+        if self.rate is None:
+            return
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        wait = self._buckets[host].reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def fetch(self, url):
+        """Fetch a page without blocking the event loop, retrying transient failures"""
+        loop, total, _ = self._loop_limits()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                thread_name_prefix='golfdeals-fetch')
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        attempts = 1 if self.offline else max(1, self.retry.attempts)
+        result = None
+        for attempt in range(1, attempts + 1):
+            await self._pace(host)
+            shared = self.shared.slots() if self.shared is not None else contextlib.nullcontext()
+            async with total, self._host_limit(url), shared:
+                # Checked once a slot is free, so requests queued behind a
+                # failing batch see the breaker those failures opened
+                if not breaker.allow():
+                    return result or FetchResult(url, error=f"circuit open for {host}", attempts=0)
+                result = await loop.run_in_executor(self._executor, self.get, url)
+            result.attempts = attempt
+            if self.metrics is not None:
+                self.metrics.record_fetch(result, cached=self.cache is not None)
+            transient = self.retry.retryable(result)
+            # A 404 means the host is answering, so only transient errors trip the breaker
+            breaker.record(not transient)
+            if not transient or attempt == attempts:
+                return result
+            await asyncio.sleep(self.retry.delay(attempt, result.retry_after))
+        return result
+
+    async def fetch_all(self, urls):
+        """Fetch pages concurrently, results in the same order as ``urls``"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    def fetch_many(self, urls):
+        """Blocking wrapper around fetch_all"""
+        return asyncio.run(self.fetch_all(list(urls)))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,124 @@
+"""
+Fetch Limits
+Per-host rate limiting, retry backoff and circuit breaking for HttpEngine
+
+These hold plain counters and timestamps and are only touched from the
+event loop thread, so they need no locks.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+# Statuses worth another try: throttling and server-side trouble
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class SharedLimit:
+    """A cap on requests in flight that several HttpEngines draw from
+
+    The semaphore is made for whichever event loop is running, like the
+    engines' own limits.
+    """
+
+    def __init__(self, limit):
+        self.limit = max(1, limit)
+        self._loop = None
+        self._slots = None
+
+    def slots(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.limit)
+        return self._slots
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, in bursts of up to ``burst``"""
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self.updated = clock()
+
+    def reserve(self):
+        """Take a token and return how long to wait before using it
+
+        Tokens can go negative, which queues callers in arrival order without
+        a lock: each one waits for the tokens reserved ahead of it.
+        """
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to wait before retrying a failed request"""
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    statuses: frozenset = RETRYABLE_STATUSES
+
+    def retryable(self, result):
+        """Whether a FetchResult is a transient failure"""
+        # status 0 means no response at all: timeout, reset, DNS
+        return bool(result.error) and (result.status == 0 or result.status in self.statuses)
+
+    def delay(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff for the given 1-based attempt"""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Fails fast for a host after ``threshold`` failures in a row
+
+    After ``reset_after`` seconds one trial request is let through; success
+    closes the circuit, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, threshold=5, reset_after=30.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.reset_after:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self):
+        """Whether a request may go out now"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self.trial:
+            self.trial = True
+            return True
+        return False
+
+    def record(self, ok):
+        self.trial = False
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.failures >= self.threshold or self.opened_at is not None:
+            self.opened_at = self.clock()
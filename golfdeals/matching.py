@@ -0,0 +1,190 @@
+"""
+Product Matching
+Groups listings of the same product across categories and retailers
+
+Names are reduced to brand and model tokens, then bucketed with MinHash
+banding so that only names sharing a bucket are ever compared. Candidate
+pairs are scored by trigram similarity and joined with union-find, which
+keeps matching close to linear in the number of deals.
+"""
+
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+
+KNOWN_BRANDS = {
+    'adidas', 'bridgestone', 'callaway', 'cleveland', 'cobra', 'ecco', 'footjoy',
+    'mizuno', 'nike', 'odyssey', 'ping', 'puma', 'skechers', 'srixon', 'taylormade',
+    'titleist', 'underarmour', 'wilson',
+}
+
+# Spellings folded together before tokenizing
+ALIASES = {
+    'foot joy': 'footjoy',
+    'fj': 'footjoy',
+    'taylor made': 'taylormade',
+    'under armour': 'underarmour',
+    "men's": 'mens',
+    "women's": 'womens',
+    "ladies'": 'womens',
+    'ladies': 'womens',
+}
+
+STOPWORDS = {'the', 'and', 'with', 'for', 'new', 'golf'}
+
+MINHASH_BANDS = 4
+MINHASH_ROWS = 3
+MATCH_THRESHOLD = 0.6
+MAX_BLOCK = 200
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_ALIAS = re.compile(r'\b(' + '|'.join(re.escape(a) for a in sorted(ALIASES, key=len, reverse=True)) + r')(?=\W|$)')
+_SEEDS = [(2 * i + 1) * 0x9E3779B1 & 0xFFFFFFFF for i in range(MINHASH_BANDS * MINHASH_ROWS)]
+
+
+def tokenize(name):
+    """Lower-case brand/model tokens of a product name"""
+    text = _ALIAS.sub(lambda m: ALIASES[m.group(1)], name.lower())
+    return [token for token in _WORD.findall(text) if token not in STOPWORDS]
+
+
+def brand_of(tokens):
+    """The known brand in a name, else its first token"""
+    for token in tokens:
+        if token in KNOWN_BRANDS:
+            return token
+    return tokens[0] if tokens else ''
+
+
+def _trigrams(tokens):
+    text = ' '.join(sorted(tokens))
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _signature(tokens):
+    """MinHash of the token set, one value per band row"""
+    hashes = [zlib.crc32(token.encode('utf-8')) for token in set(tokens)] or [0]
+    return [min((h ^ seed) * 0x01000193 & 0xFFFFFFFF for h in hashes) for seed in _SEEDS]
+
+
+def _similar(a, b):
+    """Trigram Jaccard of two names"""
+    union = len(a['grams'] | b['grams'])
+    return union and len(a['grams'] & b['grams']) / union >= MATCH_THRESHOLD
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def match_products(names):
+    """Canonical product id for each name, in input order
+
+    Identical normalized names always share an id. Other pairs are compared
+    only when their brand and numbered tokens (model numbers, years, sizes)
+    are the same and they land in the same MinHash band bucket; buckets
+    larger than ``MAX_BLOCK`` are too generic to be useful and are skipped.
+    """
+    keys = {}
+    entries = []
+    name_entries = []
+    for name in names:
+        tokens = tokenize(name)
+        key = ' '.join(tokens)
+        if key not in keys:
+            keys[key] = len(entries)
+            entries.append({
+                'key': key,
+                'brand': brand_of(tokens),
+                'numbers': frozenset(t for t in tokens if any(c.isdigit() for c in t)),
+                'grams': _trigrams(tokens),
+                'signature': _signature(tokens),
+            })
+        name_entries.append(keys[key])
+
+    blocks = defaultdict(list)
+    for i, entry in enumerate(entries):
+        signature = entry['signature']
+        for band in range(MINHASH_BANDS):
+            rows = tuple(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+            blocks[(entry['brand'], entry['numbers'], band, rows)].append(i)
+
+    groups = _UnionFind(len(entries))
+    compared = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK:
+            continue
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                if (i, j) in compared or groups.find(i) == groups.find(j):
+                    continue
+                compared.add((i, j))
+                if _similar(entries[i], entries[j]):
+                    groups.union(i, j)
+
+    # Name each group after its alphabetically first member so ids stay put
+    # as long as that member keeps showing up
+    canonical = {}
+    for i, entry in enumerate(entries):
+        root = groups.find(i)
+        if root not in canonical or entry['key'] < canonical[root]:
+            canonical[root] = entry['key']
+    ids = {root: 'p-' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+           for root, key in canonical.items()}
+    return [ids[groups.find(i)] for i in name_entries]
+
+
+def assign_product_ids(deals):
+    """Set ``product_id`` on each deal and return them as a list"""
+    deals = list(deals)
+    for deal, product_id in zip(deals, match_products([d.product_name for d in deals])):
+        deal.product_id = product_id
+    return deals
+
+
+def listing_key(deal):
+    """The retailer and its SKU, or the normalized name when there is no SKU"""
+    if deal.sku:
+        return deal.source, deal.sku
+    return deal.source, ' '.join(tokenize(deal.product_name))
+
+
+def dedupe(deals):
+    """Drop repeats of the same listing, keeping the cheapest, in first-seen order
+
+    A product listed in several categories shows up once. Listings that
+    only matched as the same product keep their own rows; ``product_id``
+    is for comparing them, not for merging them.
+    """
+    best = {}
+    for deal in deals:
+        key = listing_key(deal)
+        if key not in best or deal.sale_price < best[key].sale_price:
+            best[key] = deal
+    kept = set(map(id, best.values()))
+    return [deal for deal in deals if id(deal) in kept]
+
+
+def best_offers(deals):
+    """``{product id: (lowest price, its source, number of retailers)}``"""
+    offers = {}
+    sources = defaultdict(set)
+    for deal in deals:
+        sources[deal.product_id].add(deal.source)
+        current = offers.get(deal.product_id)
+        if current is None or deal.sale_price < current[0]:
+            offers[deal.product_id] = (deal.sale_price, deal.source)
+    return {pid: (price, source, len(sources[pid])) for pid, (price, source) in offers.items()}
@@ -0,0 +1,247 @@
+"""
+Run Metrics
+Per-request, per-page and per-stage measurements for one run, as JSON or Prometheus text
+
+The finder and the dashboard generator share one report file: the finder
+starts it, and the generator loads it and adds its own stages, so the
+report for a run covers fetch through write.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+REPORT_FILE = 'docs/run_report.json'
+
+# A page that downloads fine but yields no deals, or this share of failed
+# candidates, usually means the retailer changed its layout
+FAILURE_RATIO_WARNING = 0.2
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers, 0 when empty"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def cache_state(result, cached):
+    """How the cache answered a FetchResult: hit, revalidated, miss or none"""
+    if result.from_cache:
+        return 'revalidated' if result.status == 304 else 'hit'
+    return 'miss' if cached else 'none'
+
+
+def add_arguments(parser):
+    """--report and --prometheus, shared by the fetch and render steps"""
+    parser.add_argument('--report', default=REPORT_FILE, metavar='PATH',
+                        help=f"JSON run report with fetch, parse and stage metrics "
+                             f"(default: {REPORT_FILE})")
+    parser.add_argument('--prometheus', metavar='PATH',
+                        help="also write the run metrics in Prometheus text format")
+
+
+class RunMetrics:
+    """Collects measurements from fetch threads, parse callbacks and stages"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new run, for processes that run more than once"""
+        with self._lock:
+            self.started = datetime.now().isoformat(timespec='seconds')
+            self.fetches = []
+            self.parses = []
+            self.stages = {}
+            self.categories = []
+            self._timed = set()
+
+    @classmethod
+    def load(cls, path=REPORT_FILE):
+        """Continue the report an earlier step of the same run wrote"""
+        metrics = cls()
+        try:
+            with open(path, 'r') as f:
+                report = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return metrics
+        metrics.started = report.get('started', metrics.started)
+        metrics.fetches = report.get('fetches', [])
+        metrics.parses = report.get('parses', [])
+        metrics.stages = report.get('stages', {})
+        metrics.categories = report.get('categories', [])
+        return metrics
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block
+
+        Repeats of a stage within this process add up; a time loaded from an
+        earlier report is replaced, so rerunning a step doesn't inflate it.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                previous = self.stages.get(name, 0.0) if name in self._timed else 0.0
+                self.stages[name] = round(previous + elapsed, 6)
+                self._timed.add(name)
+
+    def record_fetch(self, result, cached=False):
+        entry = {
+            'url': result.url,
+            'host': urlsplit(result.url).netloc,
+            'status': result.status,
+            'bytes': result.size,
+            'elapsed': round(result.elapsed, 6),
+            'cache': cache_state(result, cached),
+            'attempt': result.attempts,
+            'error': result.error,
+        }
+        with self._lock:
+            self.fetches.append(entry)
+
+    def record_parse(self, retailer, url, result=None, deals=0):
+        """One page: a ParseResult, or the deal count of a reused cached parse"""
+        if result is None:
+            entry = {'retailer': retailer, 'url': url, 'cached': True, 'deals': deals}
+        else:
+            entry = {'retailer': retailer, 'url': url, 'cached': False,
+                     'elapsed': round(result.elapsed, 6), 'matches': result.matches,
+                     'failures': result.failures, 'deals': len(result.deals),
+                     'untiled': result.untiled, 'errors': result.errors[:5]}
+        with self._lock:
+            self.parses.append(entry)
+
+    def set_categories(self, categories):
+        with self._lock:
+            self.categories = list(categories)
+
+    def summary(self):
+        """Aggregates per host and per retailer, plus layout-change warnings"""
+        hosts = defaultdict(list)
+        for fetch in self.fetches:
+            hosts[fetch['host']].append(fetch)
+        fetch_summary = {}
+        for host, fetches in hosts.items():
+            latencies = [f['elapsed'] for f in fetches if f['cache'] != 'hit']
+            fetch_summary[host] = {
+                'requests': len(fetches),
+                'errors': sum(1 for f in fetches if f['error']),
+                'bytes': sum(f['bytes'] for f in fetches),
+                'fetch_seconds': round(sum(f['elapsed'] for f in fetches), 6),
+                'status': dict(Counter(str(f['status']) for f in fetches)),
+                'cache': dict(Counter(f['cache'] for f in fetches)),
+                'latency_p50': percentile(latencies, 50),
+                'latency_p95': percentile(latencies, 95),
+                'latency_max': max(latencies, default=0.0),
+            }
+
+        retailers = defaultdict(list)
+        for parse in self.parses:
+            retailers[parse['retailer']].append(parse)
+        parse_summary = {}
+        warnings = []
+        for retailer, parses in retailers.items():
+            parsed = [p for p in parses if not p['cached']]
+            matches = sum(p['matches'] for p in parsed)
+            failures = sum(p['failures'] for p in parsed)
+            empty = [p['url'] for p in parses if p['deals'] == 0]
+            untiled = [p['url'] for p in parsed if p.get('untiled')]
+            parse_summary[retailer] = {
+                'pages': len(parses),
+                'cached_pages': len(parses) - len(parsed),
+                'parse_seconds': round(sum(p['elapsed'] for p in parsed), 6),
+                'matches': matches,
+                'failures': failures,
+                'deals': sum(p['deals'] for p in parses),
+                'empty_pages': len(empty),
+                'untiled_pages': len(untiled),
+            }
+            if matches and failures / matches >= FAILURE_RATIO_WARNING:
+                warnings.append(f"{retailer}: {failures} of {matches} candidates failed to parse")
+            if empty:
+                warnings.append(f"{retailer}: no deals found on {len(empty)} page(s), e.g. {empty[0]}")
+            if untiled:
+                warnings.append(f"{retailer}: no product tiles on {len(untiled)} page(s), read as "
+                                f"plain text; check the tile class, e.g. {untiled[0]}")
+        for category in self.categories:
+            if not category.get('ok', True):
+                warnings.append(f"{category['category']}: every page failed to download")
+
+        return {'fetch': fetch_summary, 'parse': parse_summary, 'warnings': warnings}
+
+    def report(self):
+        return {
+            'started': self.started,
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'stages': self.stages,
+            'categories': self.categories,
+            'summary': self.summary(),
+            'fetches': self.fetches,
+            'parses': self.parses,
+        }
+
+    def write_json(self, path=REPORT_FILE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def prometheus_text(self):
+        """The summary in Prometheus text exposition format"""
+        summary = self.summary()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP golfdeals_{name} {help_text}")
+            lines.append(f"# TYPE golfdeals_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{_label(v)}"' for k, v in labels.items())
+                lines.append(f"golfdeals_{name}{{{label_text}}} {value}")
+
+        fetch = summary['fetch']
+        metric('fetch_requests_total', 'counter', 'HTTP requests by host and status',
+               [({'host': h, 'status': s}, n) for h, f in fetch.items() for s, n in f['status'].items()])
+        metric('fetch_bytes_total', 'counter', 'Response bytes by host',
+               [({'host': h}, f['bytes']) for h, f in fetch.items()])
+        metric('fetch_cache_total', 'counter', 'Requests by cache outcome',
+               [({'host': h, 'result': r}, n) for h, f in fetch.items() for r, n in f['cache'].items()])
+        metric('fetch_latency_seconds', 'gauge', 'Fetch latency percentiles by host',
+               [({'host': h, 'quantile': q}, f[key]) for h, f in fetch.items()
+                for q, key in (('0.5', 'latency_p50'), ('0.95', 'latency_p95'), ('1', 'latency_max'))])
+        parse = summary['parse']
+        metric('parse_matches_total', 'counter', 'Deal candidates matched by retailer',
+               [({'retailer': r}, p['matches']) for r, p in parse.items()])
+        metric('parse_failures_total', 'counter', 'Deal candidates rejected by retailer',
+               [({'retailer': r}, p['failures']) for r, p in parse.items()])
+        metric('parse_seconds_total', 'counter', 'Time spent parsing by retailer',
+               [({'retailer': r}, p['parse_seconds']) for r, p in parse.items()])
+        metric('stage_seconds', 'gauge', 'Wall time per pipeline stage',
+               [({'stage': name}, seconds) for name, seconds in self.stages.items()])
+        metric('warnings', 'gauge', 'Layout-change and download warnings in this run',
+               [({}, len(summary['warnings']))])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        with open(path, 'w') as f:
+            f.write(self.prometheus_text())
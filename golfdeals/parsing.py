@@ -0,0 +1,194 @@
+"""
+Deal Parsing Engine
+Retailer parse rules declared as data, applied in one pass per page
+"""
+
+import re
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import urljoin, urlsplit
+
+from golfdeals.extract import extract_text
+from golfdeals.records import make_deal
+
+_PRICE = r'\$([0-9,]+\.?\d*)'
+
+
+@dataclass(frozen=True)
+class ParserRules:
+    """How to pull deals out of one retailer's page text
+
+    Pages are reduced to text first. With ``tile`` set, each element with
+    that class becomes one line and the product name is the start of the
+    line; otherwise (or when no element has the class) the whole page is
+    one text and the name starts after the previous ``·``. Deals found in a
+    tile link to the tile's product page and carry its image, and its SKU
+    when ``sku_attr`` names the tile attribute holding it.
+
+    ``record`` matches everything after the product name, starting at the
+    ``·`` that ends it. ``original``, ``sale``, ``savings`` and ``percent``
+    are group numbers in ``record`` (``None`` when the page doesn't show it).
+    """
+    source: str
+    record: re.Pattern
+    name_junk: re.Pattern
+    original: int
+    sale: int
+    savings: int = None
+    percent: int = None
+    pct_digits: int = None
+    tile: str = None
+    sku_attr: str = None
+
+
+# The tile classes and SKU attributes below are UNVERIFIED. They follow the
+# stock templates of the shops' platforms (Volusion's ``v-product`` with
+# ``data-sku``, Salesforce Commerce's ``product-tile`` with ``data-pid``),
+# not saved pages of the live sites, and benchmarks/fixtures imitates
+# them. A page without them is read in text mode, and the run report
+# warns about it ("read as plain text").
+GCW_RULES = ParserRules(
+    source='Golf Clearance Warehouse',
+    record=re.compile(
+        r'·\s*Our Price[:\s]*' + _PRICE + r'\s*·\s*Sale Price[:\s]*' + _PRICE +
+        r'\s*·\s*You save ' + _PRICE,
+        re.IGNORECASE,
+    ),
+    name_junk=re.compile(r'(Deal of the Day Price:|You save.*)'),
+    original=1,
+    sale=2,
+    savings=3,
+    pct_digits=1,
+    tile='v-product',
+    sku_attr='data-sku',
+)
+
+GOLF_TOWN_RULES = ParserRules(
+    source='Golf Town',
+    record=re.compile(r'·\s*' + _PRICE + r'\s+' + _PRICE + r'\s+\((\d+)%\s+off\)'),
+    name_junk=re.compile(r'(Clearance|Final Sale|Waterproof)'),
+    original=1,
+    sale=2,
+    percent=3,
+    tile='product-tile',
+    sku_attr='data-pid',
+)
+
+RULES = {
+    'gcw': GCW_RULES,
+    'golf_town': GOLF_TOWN_RULES,
+}
+
+
+@dataclass
+class ParseResult:
+    """Deals found on a page, and how many candidates were rejected"""
+    deals: list = field(default_factory=list)
+    matches: int = 0
+    failures: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+    # The rules name a tile class but the page had none, so it was read as one text
+    untiled: bool = False
+
+
+@lru_cache(maxsize=4096)
+def parse_price(text):
+    """Convert a matched price such as ``1,299.99`` to a float"""
+    return float(text.replace(',', ''))
+
+
+def _resolver(page_url):
+    """``urljoin`` against ``page_url``, short-circuiting the usual root-relative links"""
+    parts = urlsplit(page_url)
+    origin = f"{parts.scheme}://{parts.netloc}" if parts.scheme and parts.netloc else None
+
+    def resolve(link):
+        if origin and link.startswith('/') and not link.startswith('//'):
+            return origin + link
+        return urljoin(page_url, link)
+    return resolve
+
+
+def parse_page(text, url, rules):
+    """Extract every deal from a page's text in a single left-to-right pass"""
+    started = time.perf_counter()
+    result = ParseResult()
+    tiles = extract_text(text, rules.tile, sku_attr=rules.sku_attr)
+    if isinstance(tiles, str):
+        text, boundary, starts = tiles, '·', None
+        result.untiled = bool(rules.tile)
+    else:
+        starts = []
+        offset = 0
+        for tile in tiles:
+            starts.append(offset)
+            offset += len(tile.text) + 1
+        text, boundary = '\n'.join(tile.text for tile in tiles), '\n'
+    deals = result.deals
+    search = rules.record.search
+    clean = rules.name_junk.sub
+    rfind = text.rfind
+    resolve = _resolver(url)
+    pos = 0
+
+    while True:
+        match = search(text, pos)
+        if match is None:
+            break
+        end = match.start()
+        # The name runs back to the start of the tile (or the previous '·'),
+        # but never into the last record
+        start = max(pos, rfind(boundary, 0, end) + 1)
+        if start >= end:
+            pos = end + 1
+            continue
+        pos = match.end()
+        result.matches += 1
+
+        try:
+            product_name = clean('', text[start:end]).strip(' ·')
+            original_price = parse_price(match.group(rules.original))
+            sale_price = parse_price(match.group(rules.sale))
+            if rules.savings is not None:
+                savings = parse_price(match.group(rules.savings))
+                discount_pct = (savings / original_price * 100) if original_price > 0 else 0
+                if rules.pct_digits is not None:
+                    discount_pct = round(discount_pct, rules.pct_digits)
+            else:
+                savings = original_price - sale_price
+                discount_pct = int(match.group(rules.percent))
+        except (ValueError, ZeroDivisionError) as e:
+            result.failures += 1
+            result.errors.append(f"{match.group(0)[:60]!r}: {e}")
+            continue
+
+        if product_name and original_price > 0:
+            deal = make_deal(product_name, original_price, sale_price, savings,
+                             discount_pct, url, rules.source)
+            if starts:
+                tile = tiles[bisect_right(starts, end) - 1]
+                if tile.link:
+                    deal.url = resolve(tile.link)
+                    deal.linked = True
+                if tile.image:
+                    deal.image = resolve(tile.image)
+                deal.sku = tile.sku
+            deals.append(deal)
+        else:
+            result.failures += 1
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def parse_gcw_deals(text, url):
+    """Parse Golf Clearance Warehouse format"""
+    return parse_page(text, url, GCW_RULES).deals
+
+
+def parse_golf_town_deals(text, url):
+    """Parse Golf Town format"""
+    return parse_page(text, url, GOLF_TOWN_RULES).deals
@@ -0,0 +1,85 @@
+"""
+Parse Pipeline
+Moves page parsing off the event loop onto a pool of worker processes
+
+Fetch coroutines hand page bodies to ``ParsePool.parse``, which puts them
+on a bounded queue. A fixed set of consumer tasks feed the queue into a
+``ProcessPoolExecutor``; when every worker is busy and the queue is full,
+``parse`` waits, so fetchers slow down instead of piling bodies up in
+memory.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from golfdeals.parsing import parse_page
+
+
+def default_workers():
+    """Cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class ParsePool:
+    """Parses pages with ``parse_page`` in worker processes
+
+    ``max_pending`` bounds how many bodies may wait for a worker (default:
+    two per worker). Use as a context manager, or call ``close``.
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = max(1, workers or default_workers())
+        self.max_pending = max_pending or 2 * self.workers
+        self._executor = None
+        self._state = None
+
+    def _loop_state(self):
+        """Queue and consumer tasks for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._state is None or self._state[0] is not loop:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            queue = asyncio.Queue(maxsize=self.max_pending)
+            consumers = [loop.create_task(self._consume(loop, queue)) for _ in range(self.workers)]
+            self._state = (loop, queue, consumers)
+        return self._state
+
+    async def _consume(self, loop, queue):
+        while True:
+            text, url, rules, future = await queue.get()
+            try:
+                result = await loop.run_in_executor(self._executor, parse_page, text, url, rules)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                queue.task_done()
+
+    async def parse(self, text, url, rules):
+        """ParseResult for one page, parsed in a worker process"""
+        loop, queue, _ = self._loop_state()
+        future = loop.create_future()
+        await queue.put((text, url, rules, future))
+        return await future
+
+    def close(self):
+        if self._state is not None:
+            for task in self._state[2]:
+                task.cancel()
+            self._state = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
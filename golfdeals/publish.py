@@ -0,0 +1,140 @@
+"""
+Dashboard Publishing
+Turns the finder's deals into the dashboard, price history and deals.json
+
+``add_arguments`` and ``run`` back the ``golfdeals render`` command and
+scripts/generate_interactive_dashboard.py. ``run`` takes the deals in
+memory when the fetch step ran in the same process, and reads the
+finder's output file otherwise.
+"""
+
+import os
+import sys
+
+from golfdeals.alerts import (ALERT_THRESHOLDS, ALERTS_FILE, TOP_N, TopDeals, default_site_url,
+                              find_alerts, write_alert_feeds)
+from golfdeals.dashboard import write_dashboard_site
+from golfdeals.history import HISTORY_DB, HISTORY_FILE, HistoryStore, save_signals
+from golfdeals.matching import assign_product_ids, dedupe
+from golfdeals.metrics import RunMetrics
+from golfdeals.records import DealBatch
+from golfdeals.snapshot import diff_deals
+from golfdeals.storage import (DEALS_FILE, RAW_DEALS_FILE, iter_raw_deals, latest_raw_deals_file,
+                               load_deals_json, save_deals_json)
+
+
+def add_arguments(parser):
+    """Options of the render step"""
+    parser.add_argument('--history-db', default=HISTORY_DB, metavar='PATH',
+                        help=f"price history database (default: {HISTORY_DB})")
+    parser.add_argument('--no-history', action='store_true',
+                        help="render without recording prices or price signals")
+    parser.add_argument('--force', action='store_true',
+                        help=f"render even when the deals match {DEALS_FILE}")
+    parser.add_argument('--no-alerts', action='store_true',
+                        help=f"skip {ALERTS_FILE} and the RSS/Atom alert feeds")
+    parser.add_argument('--alert-threshold', type=int, action='append', metavar='PCT',
+                        help=f"discount that triggers an alert when a deal reaches it; repeat "
+                             f"for more (default: {', '.join(map(str, ALERT_THRESHOLDS))})")
+    parser.add_argument('--top', type=int, default=TOP_N, metavar='N',
+                        help=f"best deals kept per source and category in {ALERTS_FILE} "
+                             f"(default: {TOP_N})")
+    parser.add_argument('--site-url', default=default_site_url(), metavar='URL',
+                        help="dashboard URL used in the feeds (default: the repository's "
+                             "GitHub Pages URL when running in Actions)")
+
+
+def add_input_argument(parser):
+    parser.add_argument('--input', metavar='PATH',
+                        help="finder output, .json or .ndjson (default: the newest one in docs/)")
+
+
+def write_github_output(**values):
+    """Expose step outputs to later workflow steps when running in Actions"""
+    path = os.environ.get('GITHUB_OUTPUT')
+    if not path:
+        return
+    with open(path, 'a') as f:
+        for name, value in values.items():
+            f.write(f"{name}={value}\n")
+
+
+def load_previous_deals():
+    try:
+        return load_deals_json(DEALS_FILE)
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def run(args, deals=None, metrics=None):
+    """Publish ``deals``, or the finder's saved output when not given
+
+    Returns whether the dashboard was rebuilt.
+    """
+    print("🎨 Generating interactive dashboard...")
+    metrics = metrics or RunMetrics()
+
+    # Load raw deals
+    if deals is None:
+        source = getattr(args, 'input', None) or latest_raw_deals_file() or RAW_DEALS_FILE
+        try:
+            with metrics.stage('load'):
+                deals = assign_product_ids(iter_raw_deals(source))
+        except FileNotFoundError:
+            print(f"❌ Error: {source} not found")
+            print("Run `python -m golfdeals fetch` first!")
+            sys.exit(1)
+        print(f"✅ Loaded {len(deals)} deals from {os.path.basename(source)}")
+    else:
+        with metrics.stage('load'):
+            deals = assign_product_ids(deals)
+        print(f"✅ Using {len(deals)} deals from this run")
+
+    # Drop repeats of the same listing, such as one product in two categories
+    with metrics.stage('dedup'):
+        batch = DealBatch(dedupe(deals))
+    if len(batch) < len(deals):
+        print(f"🧹 Dropped {len(deals) - len(batch)} duplicate listings")
+
+    # Compare with the published deals
+    with metrics.stage('diff'):
+        previous = load_previous_deals()
+        diff = diff_deals(previous, batch)
+    write_github_output(changed=str(not diff.unchanged).lower(), added=len(diff.added),
+                        removed=len(diff.removed), price_changed=len(diff.changed),
+                        digest=diff.digest)
+    if diff.unchanged and not args.force:
+        print(f"⏭️  Deals unchanged since the last run ({diff.digest[:12]}), skipping the dashboard")
+        return False
+    print(f"🔁 Deal changes: {diff.summary()}")
+
+    # Rank the best deals and flag the ones that newly reached an alert threshold
+    with metrics.stage('rank'):
+        ranking = TopDeals(args.top).extend(batch)
+        alerts = find_alerts(batch, previous, args.alert_threshold or ALERT_THRESHOLDS)
+    if not args.no_alerts:
+        with metrics.stage('alerts'):
+            added = write_alert_feeds(alerts, ranking, site_url=args.site_url,
+                                      thresholds=args.alert_threshold or ALERT_THRESHOLDS)
+        print(f"🔔 {len(added)} new deal alerts in {ALERTS_FILE}")
+
+    # Record prices and work out price signals
+    signals = None
+    if not args.no_history:
+        with metrics.stage('history'), HistoryStore(args.history_db) as history:
+            changed = history.record(batch)
+            signals = history.signals(batch)
+        save_signals(signals, HISTORY_FILE)
+        print(f"📈 Recorded {changed} price changes in {args.history_db}")
+
+    # Generate dashboard
+    written = write_dashboard_site(batch, 'docs', signals=signals, metrics=metrics)
+
+    # Save deals JSON
+    with metrics.stage('write'):
+        save_deals_json(batch, DEALS_FILE)
+
+    print(f"✅ Interactive dashboard generated: docs/index.html ({len(written)} files written)")
+    print(f"📊 Found {len(batch)} deals")
+    print(f"🔥 {ranking.tiers['excellent']} excellent deals (50%+ off)")
+    return True
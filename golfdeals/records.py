@@ -0,0 +1,211 @@
+"""
+Deal Records
+The shape of a deal as it moves between the finder, JSON files and dashboard
+"""
+
+from array import array
+from dataclasses import dataclass, fields
+
+# Discount tiers, best first: (name, minimum discount %)
+TIERS = (
+    ('excellent', 50),
+    ('great', 30),
+    ('good', 20),
+    ('fair', 0),
+)
+
+
+def tier_for(discount_pct):
+    """Name of the tier a discount falls in"""
+    for name, minimum in TIERS:
+        if discount_pct >= minimum:
+            return name
+    return TIERS[-1][0]
+
+
+@dataclass(slots=True)
+class Deal:
+    """One discounted product
+
+    Fields can also be read with ``deal['sale_price']`` so code written
+    against the old dict records keeps working.
+    """
+    product_name: str
+    original_price: float
+    sale_price: float
+    savings: float
+    discount_pct: float
+    url: str
+    source: str
+    # Canonical id shared by listings of the same product, set by golfdeals.matching
+    product_id: str = ''
+    # Category page the deal was listed on, such as "Shoes"
+    category: str = ''
+    # Retailer's own product code and picture, when the page shows them
+    sku: str = ''
+    image: str = ''
+    # Whether url is the product's own page (its tile's link) rather than the listing
+    linked: bool = False
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in DEAL_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in DEAL_FIELDS if name in data})
+
+
+DEAL_FIELDS = tuple(f.name for f in fields(Deal))
+
+
+def make_deal(product_name, original_price, sale_price, savings, discount_pct, url, source):
+    """Build a deal record"""
+    return Deal(product_name, original_price, sale_price, savings, discount_pct, url, source)
+
+
+# Bump when product_key changes so stores keyed by it can migrate
+KEY_VERSION = 2
+
+
+def product_key(deal):
+    """Stable identifier of a retailer's product across runs
+
+    The retailer's SKU when the listing has one, so sizes and variants that
+    share a name stay apart; the product name otherwise.
+    """
+    sku = deal.get('sku')
+    return f"{deal['source']}|{sku}" if sku else f"{deal['source']}|{deal['product_name']}"
+
+
+def as_deal(record):
+    """Accept a Deal or a dict loaded from JSON"""
+    return record if isinstance(record, Deal) else Deal.from_dict(record)
+
+
+def encode_deal(obj):
+    """``json.dump`` default hook for Deal records"""
+    if isinstance(obj, Deal):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class DealBatch:
+    """Deals stored column by column
+
+    Prices and discounts live in ``array('d')`` columns, and repeated
+    strings (sources, categories, category URLs) are stored once and
+    referenced by index. Stats, tier counts and ordering each walk the columns once
+    instead of building a list per question.
+    """
+
+    __slots__ = ('names', 'url_ids', 'source_ids', 'product_ids', 'category_ids', 'skus', 'images',
+                 'original', 'sale', 'savings', 'discount', '_int_discount', 'linked', '_strings',
+                 '_string_ids')
+
+    def __init__(self, deals=()):
+        self.names = []
+        self.url_ids = array('I')
+        self.source_ids = array('I')
+        self.product_ids = array('I')
+        self.category_ids = array('I')
+        self.skus = []
+        self.images = []
+        self.original = array('d')
+        self.sale = array('d')
+        self.savings = array('d')
+        self.discount = array('d')
+        self._int_discount = array('B')
+        self.linked = array('B')
+        self._strings = []
+        self._string_ids = {}
+        self.extend(deals)
+
+    def _intern(self, value):
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def append(self, deal):
+        self.names.append(deal['product_name'])
+        self.url_ids.append(self._intern(deal['url']))
+        self.source_ids.append(self._intern(deal['source']))
+        self.product_ids.append(self._intern(deal.get('product_id') or ''))
+        self.category_ids.append(self._intern(deal.get('category') or ''))
+        self.skus.append(deal.get('sku') or '')
+        self.images.append(deal.get('image') or '')
+        self.original.append(deal['original_price'])
+        self.sale.append(deal['sale_price'])
+        self.savings.append(deal['savings'])
+        self.discount.append(deal['discount_pct'])
+        self._int_discount.append(isinstance(deal['discount_pct'], int))
+        self.linked.append(bool(deal.get('linked')))
+
+    def extend(self, deals):
+        if isinstance(deals, DealBatch):
+            deals = iter(deals)
+        for deal in deals:
+            self.append(deal)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        discount = self.discount[i]
+        return Deal(self.names[i], self.original[i], self.sale[i], self.savings[i],
+                    int(discount) if self._int_discount[i] else discount,
+                    self._strings[self.url_ids[i]], self._strings[self.source_ids[i]],
+                    self._strings[self.product_ids[i]], self._strings[self.category_ids[i]],
+                    self.skus[i], self.images[i], bool(self.linked[i]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def sources(self):
+        """Distinct sources in first-seen order"""
+        seen = dict.fromkeys(self.source_ids)
+        return [self._strings[i] for i in seen]
+
+    def tier_counts(self):
+        """Number of deals in each tier"""
+        counts = dict.fromkeys((name for name, _ in TIERS), 0)
+        for pct in self.discount:
+            counts[tier_for(pct)] += 1
+        return counts
+
+    def stats(self):
+        """Headline numbers for the dashboard"""
+        total = len(self)
+        tiers = self.tier_counts()
+        return {
+            'total_deals': total,
+            'avg_discount': sum(self.discount) / total if total else 0,
+            'max_discount': max(self.discount) if total else 0,
+            'total_savings': sum(self.savings),
+            'excellent_deals': tiers['excellent'],
+            'great_deals': tiers['great'],
+            'tiers': tiers,
+        }
+
+    def order_by_discount(self):
+        """Row indices, highest discount first, ties in original order"""
+        return sorted(range(len(self)), key=self.discount.__getitem__, reverse=True)
+
+    def sorted_by_discount(self):
+        """The rows as Deals, highest discount first"""
+        return [self[i] for i in self.order_by_discount()]
+
+    def to_dicts(self):
+        return [deal.to_dict() for deal in self]
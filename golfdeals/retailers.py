@@ -0,0 +1,162 @@
+"""
+Retailer Registry
+Everything the finder needs to know about a shop, declared as data
+
+A ``Retailer`` bundles the category pages to crawl, the parse rules for
+its page layout and its own request budget. Built-in retailers are
+registered here; more can be added with ``register`` or loaded from a
+JSON config file without touching the finder.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+
+from golfdeals.enrich import SCHEMA_PRODUCT, ProductRules
+from golfdeals.parsing import RULES, ParserRules, parse_page
+
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class Retailer:
+    """One shop: where its deals live and how to read them
+
+    ``product`` reads the shop's product pages for enrichment; shops
+    without it are never enriched.
+    """
+    key: str
+    label: str
+    rules: ParserRules
+    categories: tuple = ()
+    concurrency: int = DEFAULT_CONCURRENCY
+    per_host: int = None
+    rate: float = None
+    product: ProductRules = None
+
+    @property
+    def name(self):
+        """The ``source`` written on this retailer's deals"""
+        return self.rules.source
+
+    def parse(self, text, url):
+        """ParseResult for one of this retailer's pages"""
+        return parse_page(text, url, self.rules)
+
+
+REGISTRY = {}
+
+
+def register(retailer):
+    """Add or replace a retailer under its key"""
+    REGISTRY[retailer.key] = retailer
+    return retailer
+
+
+def get_retailers(keys=None):
+    """Registered retailers, all of them or the given keys in order"""
+    if keys is None:
+        return list(REGISTRY.values())
+    unknown = [key for key in keys if key not in REGISTRY]
+    if unknown:
+        raise KeyError(f"unknown retailer(s): {', '.join(unknown)}")
+    return [REGISTRY[key] for key in keys]
+
+
+def _flags(names):
+    flags = 0
+    for name in names or ():
+        flags |= getattr(re, name.upper())
+    return flags
+
+
+def rules_from_config(source, config):
+    """ParserRules from a built-in rules key or a dict of patterns and groups"""
+    if isinstance(config, str):
+        return RULES[config]
+    flags = _flags(config.get('flags'))
+    return ParserRules(
+        source=source,
+        record=re.compile(config['record'], flags),
+        name_junk=re.compile(config.get('name_junk', r'(?!)'), flags),
+        original=config['original'],
+        sale=config['sale'],
+        savings=config.get('savings'),
+        percent=config.get('percent'),
+        pct_digits=config.get('pct_digits'),
+        tile=config.get('tile'),
+        sku_attr=config.get('sku_attr'),
+    )
+
+
+def product_rules_from_config(config):
+    """ProductRules from ``"schema"`` or a dict of ``price``, ``sold_out`` and ``scope`` patterns"""
+    if config is None or config == 'schema':
+        return None if config is None else SCHEMA_PRODUCT
+    flags = _flags(config.get('flags'))
+
+    def optional(name, extra=0):
+        return re.compile(config[name], flags | extra) if config.get(name) else None
+
+    return ProductRules(price=re.compile(config['price'], flags), sold_out=optional('sold_out'),
+                        scope=optional('scope', re.DOTALL))
+
+
+def retailer_from_config(config):
+    """Retailer from one entry of a retailers config file"""
+    rules = rules_from_config(config['source'], config['rules'])
+    return Retailer(
+        key=config['key'],
+        label=config.get('label', config['source']),
+        rules=rules,
+        categories=tuple((url, name) for url, name in config.get('categories', ())),
+        concurrency=config.get('concurrency', DEFAULT_CONCURRENCY),
+        per_host=config.get('per_host'),
+        rate=config.get('rate'),
+        product=product_rules_from_config(config.get('product')),
+    )
+
+
+def load_config(path):
+    """Register every retailer in a JSON config file and return them
+
+    The file holds a list of objects with ``key``, ``source``, ``rules``
+    (a built-in rules key such as ``"gcw"`` or a dict with ``record``,
+    ``original``, ``sale`` and optionally ``savings``, ``percent``,
+    ``pct_digits``, ``name_junk``, ``flags``, ``tile``, the class of a
+    product tile element, and ``sku_attr``, the tile attribute holding the
+    SKU) and ``categories`` as ``[url, name]`` pairs. ``label``,
+    ``concurrency``, ``per_host``, ``rate`` and ``product`` (``"schema"`` or
+    a dict with ``price`` and ``sold_out`` patterns, searched only inside the
+    optional ``scope`` pattern's match) are optional. An entry
+    with an existing key replaces it.
+    """
+    with open(path, 'r') as f:
+        entries = json.load(f)
+    return [register(retailer_from_config(entry)) for entry in entries]
+
+
+GCW = register(Retailer(
+    key='gcw',
+    label='GCW',
+    rules=RULES['gcw'],
+    categories=(
+        ("https://www.golfclearancewarehouse.com/golf-shoes-s/11.htm", "Shoes"),
+        ("https://www.golfclearancewarehouse.com/category-s/99.htm", "Gloves"),
+        ("https://www.golfclearancewarehouse.com/discount-golf-clubs-canada-s/656.htm", "Clubs"),
+        ("https://www.golfclearancewarehouse.com/golf-bags-s/1.htm", "Bags"),
+    ),
+    product=SCHEMA_PRODUCT,
+))
+
+GOLF_TOWN = register(Retailer(
+    key='golf_town',
+    label='Golf Town',
+    rules=RULES['golf_town'],
+    categories=(
+        ("https://www.golftown.com/en-CA/sale/clearance/clubs/", "Clubs"),
+        ("https://www.golftown.com/en-CA/sale/clearance/shoes/", "Shoes"),
+        ("https://www.golftown.com/en-CA/sale/clearance/golf-gloves/", "Gloves"),
+    ),
+    product=SCHEMA_PRODUCT,
+))
@@ -0,0 +1,71 @@
+"""
+Deal Snapshots
+Content hashing and diffing of deal sets, so unchanged runs can stop early
+
+A deal set is normalized before hashing: one entry per product, sorted by
+product key, prices rounded to cents. The order the categories finished
+in or a float printed as 50 vs 50.0 does not count as a change.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from golfdeals.records import KEY_VERSION, product_key
+
+
+def normalize(deal):
+    """The part of a deal that counts as a change: prices, discount and link"""
+    return (
+        round(float(deal['original_price']), 2),
+        round(float(deal['sale_price']), 2),
+        round(float(deal['discount_pct']), 1),
+        deal['url'],
+    )
+
+
+def index_deals(deals):
+    """``{product key: normalized deal}``; the last listing of a product wins"""
+    return {product_key(deal): normalize(deal) for deal in deals}
+
+
+def digest(deals):
+    """Order-independent SHA-256 of a deal set"""
+    items = index_deals(deals) if not isinstance(deals, dict) else deals
+    h = hashlib.sha256()
+    # Digests from an older product key never match one from the current key
+    h.update(f"v{KEY_VERSION}\n".encode('utf-8'))
+    for key in sorted(items):
+        h.update(json.dumps([key, items[key]], separators=(',', ':')).encode('utf-8'))
+        h.update(b'\n')
+    return h.hexdigest()
+
+
+@dataclass
+class DealDiff:
+    """Product keys that appeared, disappeared or changed between two deal sets"""
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    previous_digest: str = ''
+    digest: str = ''
+
+    @property
+    def unchanged(self):
+        return self.previous_digest == self.digest
+
+    def summary(self):
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed"
+
+
+def diff_deals(previous, current):
+    """Compare two deal sets by product key"""
+    before = index_deals(previous)
+    after = index_deals(current)
+    return DealDiff(
+        added=sorted(after.keys() - before.keys()),
+        removed=sorted(before.keys() - after.keys()),
+        changed=sorted(key for key in after.keys() & before.keys() if after[key] != before[key]),
+        previous_digest=digest(before),
+        digest=digest(after),
+    )
@@ -0,0 +1,433 @@
+/*
+ * Golf Deals - Deal Selector
+ * Loads deal shards listed in the inline manifest and renders only the
+ * rows that are on screen. Filters, search and selection work on
+ * precomputed position indexes rather than on the DOM. Reddit posts and
+ * CSV rows are rendered at build time; copying and exporting only join
+ * the fragments of the selected deals.
+ */
+
+const ROW_HEIGHT = 165;
+const OVERSCAN = 6;
+const QUALITY_LABELS = {
+    excellent: '🔥 EXCELLENT',
+    great: '🔥 GREAT',
+    good: 'Good',
+    fair: 'Fair'
+};
+
+const manifest = JSON.parse(document.getElementById('manifest').textContent);
+const container = document.getElementById('dealsContainer');
+
+const shardLoads = new Map();   // shard file -> Promise
+const loadedShards = new Set(); // shard files that have arrived
+const deals = [];               // loaded deals, indexed by position in the full ranking
+const exportLoads = new Map();  // export shard file -> Promise
+const fragments = [];           // [reddit post, CSV row] by position
+let visible = new Int32Array(0); // positions that pass the filters, best first
+let renderedRange = null;
+let scrollQueued = false;
+
+// Selection is a bitset over positions, so toggling and counting never touch the DOM
+const selectedBits = new Uint32Array((manifest.total + 31) >>> 5);
+let selectedCount = 0;
+
+let sourceIndex = null;         // source -> ascending positions
+let searchIndex = null;         // n-gram -> ascending positions
+let searchLoad = null;
+
+function qualityOf(discount) {
+    return discount >= 50 ? 'excellent' : discount >= 30 ? 'great' : discount >= 20 ? 'good' : 'fair';
+}
+
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, ch => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[ch]);
+}
+
+async function readData(file) {
+    const response = await fetch(file);
+    if (!response.ok) {
+        throw new Error(`${file}: HTTP ${response.status}`);
+    }
+    let body = response.body;
+    const encoding = response.headers.get('Content-Encoding') || '';
+    if (file.endsWith('.gz') && !encoding.includes('gzip')) {
+        body = body.pipeThrough(new DecompressionStream('gzip'));
+    }
+    return JSON.parse(await new Response(body).text());
+}
+
+function undelta(gaps) {
+    const positions = new Int32Array(gaps.length);
+    let pos = 0;
+    gaps.forEach((gap, i) => { pos += gap; positions[i] = pos; });
+    return positions;
+}
+
+function loadShard(shard) {
+    if (!shardLoads.has(shard.file)) {
+        shardLoads.set(shard.file, readData(shard.file).then(rows => {
+            const fields = manifest.fields;
+            rows.forEach(row => {
+                const deal = { source: shard.source };
+                fields.forEach((field, i) => { deal[field] = row[i]; });
+                deals[deal.pos] = deal;
+            });
+            loadedShards.add(shard.file);
+        }));
+    }
+    return shardLoads.get(shard.file);
+}
+
+function loadExport(shard) {
+    if (!exportLoads.has(shard.export)) {
+        exportLoads.set(shard.export, readData(shard.export).then(rows => {
+            rows.forEach(([pos, post, csvRow]) => { fragments[pos] = [post, csvRow]; });
+        }));
+    }
+    return exportLoads.get(shard.export);
+}
+
+function loadSearchIndex() {
+    if (!searchLoad) {
+        searchLoad = readData(manifest.search).then(data => {
+            searchIndex = { n: data.n, grams: new Map() };
+            Object.entries(data.grams).forEach(([gram, gaps]) => {
+                searchIndex.grams.set(gram, gaps);
+            });
+        });
+    }
+    return searchLoad;
+}
+
+function normalize(text) {
+    return text.toLowerCase().split(/\s+/).filter(Boolean).join(' ');
+}
+
+function currentFilters() {
+    const quality = document.getElementById('qualityFilter').value;
+    return {
+        minDiscount: quality === 'all' ? -Infinity : parseFloat(quality),
+        cutoff: quality === 'all' ? manifest.total : manifest.thresholds[quality],
+        source: document.getElementById('sourceFilter').value,
+        query: normalize(document.getElementById('searchFilter').value)
+    };
+}
+
+function shardsFor(filters) {
+    return manifest.shards.filter(shard =>
+        (filters.source === 'all' || shard.source === filters.source) &&
+        shard.max >= filters.minDiscount
+    );
+}
+
+// Number of entries in an ascending array that are below `limit`
+function countBelow(positions, limit) {
+    let lo = 0;
+    let hi = positions.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (positions[mid] < limit) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+function intersect(a, b) {
+    const out = new Int32Array(Math.min(a.length, b.length));
+    let i = 0, j = 0, k = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] < b[j]) i++;
+        else if (a[i] > b[j]) j++;
+        else { out[k++] = a[i]; i++; j++; }
+    }
+    return out.subarray(0, k);
+}
+
+// Candidate positions for a query: the intersection of its n-gram postings
+function searchCandidates(query) {
+    const n = searchIndex.n;
+    if (query.length < n) {
+        return null;
+    }
+    const lists = [];
+    for (let i = 0; i + n <= query.length; i++) {
+        const gaps = searchIndex.grams.get(query.slice(i, i + n));
+        if (!gaps) {
+            return new Int32Array(0);
+        }
+        lists.push(gaps);
+    }
+    lists.sort((a, b) => a.length - b.length);
+    return lists.reduce((acc, gaps) => intersect(acc, undelta(gaps)), undelta(lists[0]));
+}
+
+function basePositions(filters) {
+    if (filters.source === 'all') {
+        const positions = new Int32Array(filters.cutoff);
+        for (let i = 0; i < positions.length; i++) positions[i] = i;
+        return positions;
+    }
+    const positions = sourceIndex.get(filters.source) || new Int32Array(0);
+    return positions.subarray(0, countBelow(positions, filters.cutoff));
+}
+
+function refresh() {
+    const filters = currentFilters();
+    if (filters.source !== 'all' && !sourceIndex) {
+        visible = new Int32Array(0);
+    } else {
+        visible = basePositions(filters);
+        if (filters.query) {
+            const candidates = searchIndex && searchCandidates(filters.query);
+            if (candidates) {
+                visible = intersect(visible, candidates);
+            }
+            // n-grams can match out of order; confirm against the loaded names
+            visible = visible.filter(pos =>
+                !deals[pos] || normalize(deals[pos].product_name).includes(filters.query));
+        }
+    }
+    container.style.height = (visible.length * ROW_HEIGHT) + 'px';
+    renderedRange = null;
+    renderWindow();
+}
+
+function isSelected(pos) {
+    return (selectedBits[pos >>> 5] & (1 << (pos & 31))) !== 0;
+}
+
+function setSelected(pos, on) {
+    if (isSelected(pos) === on) {
+        return;
+    }
+    selectedBits[pos >>> 5] ^= 1 << (pos & 31);
+    selectedCount += on ? 1 : -1;
+}
+
+function priceBadges(deal) {
+    const badges = [];
+    if (deal.previous_price != null && deal.sale_price < deal.previous_price) {
+        badges.push(`<span class="deal-signal signal-drop" title="Was $${deal.previous_price.toFixed(2)} yesterday">📉 Price drop</span>`);
+    }
+    if (deal.low_price != null && deal.sale_price <= deal.low_price && deal.high_price > deal.sale_price) {
+        badges.push('<span class="deal-signal signal-low">⬇ 90-day low</span>');
+    }
+    if (deal.retailers > 1) {
+        badges.push(deal.sale_price <= deal.best_price
+            ? `<span class="deal-signal signal-best">🏷 Cheapest of ${deal.retailers} retailers</span>`
+            : `<span class="deal-signal signal-elsewhere">Cheapest at ${escapeHtml(deal.best_source)}: $${deal.best_price.toFixed(2)}</span>`);
+    }
+    return badges.join('');
+}
+
+function renderDeal(pos, index) {
+    const deal = deals[pos];
+    const top = `top: ${index * ROW_HEIGHT}px`;
+    if (!deal) {
+        return `<div class="deal-row" data-pos="${pos}" style="${top}"><div class="deal-card"><div class="loading">Loading deals…</div></div></div>`;
+    }
+    const quality = qualityOf(deal.discount_pct);
+    const checked = isSelected(pos);
+    return `<div class="deal-row" data-pos="${pos}" style="${top}">
+        <div class="deal-card ${quality}${checked ? ' selected' : ''}">
+            <input type="checkbox" class="deal-checkbox"${checked ? ' checked' : ''}>
+            <div class="deal-info">
+                <h3 title="${escapeHtml(deal.product_name)}">${escapeHtml(deal.product_name)}</h3>
+                <div class="deal-prices">
+                    <span class="price-tag original-price">$${deal.original_price.toFixed(2)}</span>
+                    <span class="price-tag sale-price">$${deal.sale_price.toFixed(2)}</span>
+                    <span class="price-tag savings">Save $${deal.savings.toFixed(2)} (${deal.discount_pct.toFixed(0)}% off)</span>
+                </div>
+                <span class="deal-quality quality-${quality}">${QUALITY_LABELS[quality]}</span>${priceBadges(deal)}
+                <div class="deal-source">Source: ${escapeHtml(deal.source)}${deal.category ? ' · ' + escapeHtml(deal.category) : ''}</div>
+            </div>
+            <div class="deal-actions">
+                <a href="${escapeHtml(deal.url)}" target="_blank" class="btn btn-secondary">${deal.sku ? 'View Deal' : 'View Category'}</a>
+            </div>
+        </div>
+    </div>`;
+}
+
+function renderWindow() {
+    scrollQueued = false;
+    if (visible.length === 0) {
+        container.style.height = '';
+        const pending = !sourceIndex || shardsFor(currentFilters()).some(shard => !loadedShards.has(shard.file));
+        container.innerHTML = !pending
+            ? '<div class="loading">No deals match these filters.</div>'
+            : '<div class="loading">Loading deals…</div>';
+        return;
+    }
+    const top = container.getBoundingClientRect().top + window.scrollY;
+    const first = Math.max(0, Math.floor((window.scrollY - top) / ROW_HEIGHT) - OVERSCAN);
+    const last = Math.min(visible.length,
+        Math.ceil((window.scrollY + window.innerHeight - top) / ROW_HEIGHT) + OVERSCAN);
+    if (renderedRange && renderedRange[0] === first && renderedRange[1] === last) {
+        return;
+    }
+    renderedRange = [first, last];
+    const parts = [];
+    for (let i = first; i < last; i++) {
+        parts.push(renderDeal(visible[i], i));
+    }
+    container.innerHTML = parts.join('');
+}
+
+function rerender() {
+    renderedRange = null;
+    queueRender();
+}
+
+function queueRender() {
+    if (!scrollQueued) {
+        scrollQueued = true;
+        requestAnimationFrame(renderWindow);
+    }
+}
+
+function updateSelection() {
+    document.getElementById('selectedCount').textContent = selectedCount;
+}
+
+container.addEventListener('change', event => {
+    if (!event.target.classList.contains('deal-checkbox')) {
+        return;
+    }
+    const row = event.target.closest('.deal-row');
+    setSelected(parseInt(row.dataset.pos), event.target.checked);
+    row.firstElementChild.classList.toggle('selected', event.target.checked);
+    updateSelection();
+});
+
+function selectAll() {
+    visible.forEach(pos => setSelected(pos, true));
+    rerender();
+    updateSelection();
+}
+
+function deselectAll() {
+    selectedBits.fill(0);
+    selectedCount = 0;
+    rerender();
+    updateSelection();
+}
+
+async function filterDeals() {
+    const filters = currentFilters();
+    const needed = shardsFor(filters).map(loadShard);
+    if (filters.query) {
+        needed.push(loadSearchIndex());
+    }
+    refresh();
+    await Promise.all(needed);
+    refresh();
+}
+
+function selectedPositions() {
+    const positions = [];
+    selectedBits.forEach((word, i) => {
+        for (let bit = 0; word !== 0; bit++, word >>>= 1) {
+            if (word & 1) positions.push((i << 5) + bit);
+        }
+    });
+    return positions;
+}
+
+// Prebuilt fragments (0: Reddit post, 1: CSV row) of the selected deals, best first.
+// Only the export shards holding selected deals are fetched, when the deal
+// itself is loaded and so tells which shard it is in.
+async function selectedFragments(column) {
+    const positions = selectedPositions();
+    const needed = new Set();
+    for (const pos of positions) {
+        if (fragments[pos]) continue;
+        const deal = deals[pos];
+        const shard = deal && manifest.shards.find(s =>
+            s.source === deal.source && s.tier === qualityOf(deal.discount_pct));
+        if (!shard) {
+            manifest.shards.forEach(s => needed.add(s));
+            break;
+        }
+        needed.add(shard);
+    }
+    await Promise.all([...needed].map(loadExport));
+    return positions.map(pos => fragments[pos][column]);
+}
+
+async function copySelectedDeals() {
+    const posts = await selectedFragments(0);
+
+    if (posts.length === 0) {
+        showNotification('Please select at least one deal!', 'error');
+        return;
+    }
+
+    const redditText = posts.join('');
+
+    document.getElementById('copyText').textContent = redditText;
+    document.getElementById('copyOutput').style.display = 'block';
+    document.getElementById('copyOutput').scrollIntoView({ behavior: 'smooth' });
+}
+
+function copyToClipboard() {
+    const text = document.getElementById('copyText').textContent;
+    navigator.clipboard.writeText(text).then(() => {
+        showNotification('✅ Copied to clipboard!');
+    });
+}
+
+async function exportToCSV() {
+    const rows = await selectedFragments(1);
+
+    if (rows.length === 0) {
+        showNotification('Please select at least one deal!', 'error');
+        return;
+    }
+
+    const blob = new Blob([manifest.csv_header, ...rows], { type: 'text/csv' });
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = 'golf-deals-' + new Date().toISOString().split('T')[0] + '.csv';
+    a.click();
+
+    showNotification('✅ CSV exported!');
+}
+
+function showNotification(message, type = 'success') {
+    const notification = document.getElementById('notification');
+    notification.textContent = message;
+    notification.style.background = type === 'error' ? '#f56565' : '#48bb78';
+    notification.classList.add('show');
+
+    setTimeout(() => {
+        notification.classList.remove('show');
+    }, 3000);
+}
+
+window.addEventListener('scroll', queueRender, { passive: true });
+window.addEventListener('resize', queueRender);
+
+function reportLoadError(file) {
+    return error => {
+        showNotification('Could not load ' + file, 'error');
+        console.error(error);
+    };
+}
+
+readData(manifest.index).then(data => {
+    sourceIndex = new Map(Object.entries(data.sources).map(([source, gaps]) => [source, undelta(gaps)]));
+    refresh();
+}).catch(reportLoadError(manifest.index));
+
+// Best shards first, so the top of the list paints before the rest arrives.
+// Positions are known up front, so arriving shards only fill in rows.
+manifest.shards
+    .slice()
+    .sort((a, b) => b.max - a.max)
+    .forEach(shard => loadShard(shard).then(() => {
+        if (currentFilters().query) refresh(); else rerender();
+    }).catch(reportLoadError(shard.file)));
+refresh();
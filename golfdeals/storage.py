@@ -0,0 +1,119 @@
+"""
+Deal Storage
+Reading and writing the deal files under docs/
+"""
+
+import json
+import os
+from datetime import datetime
+
+from golfdeals.records import as_deal, encode_deal
+
+RAW_DEALS_FILE = 'docs/raw_deals.json'
+RAW_DEALS_NDJSON = 'docs/raw_deals.ndjson'
+DEALS_FILE = 'docs/deals.json'
+
+
+def _ensure_dir(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def save_raw_deals(deals, path=RAW_DEALS_FILE, timestamp=None):
+    """Write the finder output with its run timestamp"""
+    _ensure_dir(path)
+    output = {
+        'timestamp': timestamp or datetime.now().isoformat(),
+        'total_deals': len(deals),
+        'deals': deals
+    }
+    with open(path, 'w') as f:
+        json.dump(output, f, indent=2, default=encode_deal)
+
+
+def load_raw_deals(path=RAW_DEALS_FILE):
+    """Read the finder output, raising FileNotFoundError if it is missing"""
+    with open(path, 'r') as f:
+        raw_data = json.load(f)
+    return [as_deal(deal) for deal in raw_data.get('deals', [])]
+
+
+def save_deals_json(deals, path=DEALS_FILE):
+    """Write the dashboard's deal list, one deal per line, from any iterable"""
+    _ensure_dir(path)
+    with open(path, 'w') as f:
+        separator = '[\n'
+        for deal in deals:
+            f.write(separator)
+            f.write(json.dumps(deal, default=encode_deal))
+            separator = ',\n'
+        f.write('\n]\n' if separator != '[\n' else '[]\n')
+
+
+def load_deals_json(path=DEALS_FILE):
+    """Read the dashboard's deal list back, raising FileNotFoundError if it is missing"""
+    with open(path, 'r') as f:
+        return [as_deal(deal) for deal in json.load(f)]
+
+
+class NdjsonDealWriter:
+    """Appends deals to a newline-delimited JSON file as they arrive
+
+    The file is truncated when opened and flushed after every batch, so a
+    run that dies part-way still leaves every finished category on disk.
+    """
+
+    def __init__(self, path=RAW_DEALS_NDJSON):
+        self.path = path
+        self.count = 0
+        _ensure_dir(path)
+        self._file = open(path, 'w')
+
+    def write(self, deals):
+        lines = [json.dumps(deal, default=encode_deal) + '\n' for deal in deals]
+        self._file.writelines(lines)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.count += len(lines)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_ndjson_deals(path=RAW_DEALS_NDJSON):
+    """Yield deals from an NDJSON file one at a time
+
+    A half-written last line from an interrupted run is skipped.
+    """
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if line.endswith('\n'):
+                    raise
+                break
+            yield as_deal(record)
+
+
+def latest_raw_deals_file(candidates=(RAW_DEALS_NDJSON, RAW_DEALS_FILE)):
+    """Most recently written finder output, or None"""
+    existing = [path for path in candidates if os.path.exists(path)]
+    return max(existing, key=os.path.getmtime) if existing else None
+
+
+def iter_raw_deals(path):
+    """Deals from either finder output format"""
+    if path.endswith('.ndjson'):
+        return iter_ndjson_deals(path)
+    return iter(load_raw_deals(path))
@@ -0,0 +1,275 @@
+"""
+Watch Mode
+Polls each category on its own interval, learned from how often its deals change
+
+``PollScheduler`` keeps a heap of next-due times. A category whose deals
+changed since its last check is checked twice as often, down to
+``min_interval``; one that didn't change waits half again as long, up to
+``max_interval``. Every check spends from a rolling 24-hour request
+budget, and a check that doesn't fit waits until earlier requests age
+out, so busy categories get fresher without adding to the daily total.
+``run`` backs ``golfdeals watch``.
+"""
+
+import heapq
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+HOUR = 3600
+DAY = 24 * HOUR
+DEFAULT_SCHEDULE_FILE = '.cache/watch_schedule.json'
+DEFAULT_MIN_INTERVAL = HOUR
+DEFAULT_MAX_INTERVAL = 7 * DAY
+# A category starts at the scheduled workflow's once a day
+DEFAULT_INTERVAL = DAY
+# Requests per rolling 24 hours, across every retailer
+DEFAULT_BUDGET = 300
+BUDGET_WINDOW = DAY
+# Interval multipliers after a check that found changes, and one that didn't
+CHANGED_FACTOR = 0.5
+UNCHANGED_FACTOR = 1.5
+# Wait before retrying a category whose check failed
+RETRY_DELAY = HOUR
+
+
+@dataclass
+class CategoryState:
+    """What the scheduler has learned about one category"""
+    interval: float = DEFAULT_INTERVAL
+    next_due: float = 0.0
+    # Requests the last check took, the estimate for the next one
+    cost: int = 1
+    checks: int = 0
+    changes: int = 0
+    digest: str = ''
+
+
+class PollScheduler:
+    """Decides which category to check next, and when
+
+    State is kept in a JSON file so learned intervals, due times and the
+    budget already spent survive a restart.
+    """
+
+    def __init__(self, path=DEFAULT_SCHEDULE_FILE, min_interval=DEFAULT_MIN_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, budget=DEFAULT_BUDGET, clock=time.time):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.budget = budget
+        self.clock = clock
+        self.states = {}
+        self._heap = []
+        self._spent = deque()
+        try:
+            with open(path, 'r') as f:
+                saved = json.load(f)
+            self.states = {key: CategoryState(**state)
+                           for key, state in saved.get('categories', {}).items()}
+            self._spent = deque(tuple(entry) for entry in saved.get('spent', []))
+        except (FileNotFoundError, ValueError, TypeError):
+            pass
+
+    def add(self, key):
+        """Schedule a category, keeping what was learned about it before"""
+        state = self.states.setdefault(key, CategoryState(next_due=self.clock()))
+        state.interval = min(max(state.interval, self.min_interval), self.max_interval)
+        heapq.heappush(self._heap, (state.next_due, key))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def spent(self, now=None):
+        """Requests made in the last ``BUDGET_WINDOW`` seconds"""
+        now = self.clock() if now is None else now
+        while self._spent and self._spent[0][0] <= now - BUDGET_WINDOW:
+            self._spent.popleft()
+        return sum(cost for _, cost in self._spent)
+
+    def _budget_wait(self, cost, now):
+        """Seconds until ``cost`` more requests fit in the budget"""
+        excess = self.spent(now) + cost - self.budget
+        if excess <= 0:
+            return 0.0
+        for at, spent in self._spent:
+            excess -= spent
+            if excess <= 0:
+                return at + BUDGET_WINDOW - now
+        # More than the whole budget: wait for everything spent to age out
+        return self._spent[-1][0] + BUDGET_WINDOW - now if self._spent else 0.0
+
+    def wait_time(self, now=None):
+        """Seconds until the next category is due and its check fits the budget"""
+        if not self._heap:
+            return None
+        now = self.clock() if now is None else now
+        due_at, key = self._heap[0]
+        return max(due_at - now, self._budget_wait(self.states[key].cost, now), 0.0)
+
+    def pop_due(self, now=None):
+        """Every category that is due, for as long as the budget lasts
+
+        Their estimated cost is counted against the budget so the batch
+        can't overspend it; ``record`` replaces it with what was spent.
+        """
+        now = self.clock() if now is None else now
+        due = []
+        reserved = 0
+        while self._heap and self._heap[0][0] <= now:
+            key = self._heap[0][1]
+            cost = self.states[key].cost
+            # A check bigger than the whole budget still runs once nothing else is spent
+            if self.spent(now) + reserved + cost > self.budget and (due or self._spent):
+                break
+            heapq.heappop(self._heap)
+            reserved += cost
+            due.append(key)
+        return due
+
+    def record(self, key, digest, cost, now=None):
+        """Reschedule a checked category; returns whether its deals changed
+
+        ``digest`` identifies the deals found, or is None when the check
+        failed, which retries sooner without learning from it.
+        """
+        now = self.clock() if now is None else now
+        state = self.states[key]
+        state.checks += 1
+        state.cost = max(1, cost)
+        self._spent.append((now, cost))
+        changed = False
+        if digest is None:
+            delay = min(state.interval, RETRY_DELAY)
+        else:
+            if state.digest and digest != state.digest:
+                changed = True
+                state.changes += 1
+                state.interval = max(self.min_interval, state.interval * CHANGED_FACTOR)
+            elif state.digest:
+                state.interval = min(self.max_interval, state.interval * UNCHANGED_FACTOR)
+            else:
+                # First sighting: nothing to compare with yet
+                changed = True
+            state.digest = digest
+            delay = state.interval
+        state.next_due = now + delay
+        heapq.heappush(self._heap, (state.next_due, key))
+        return changed
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'categories': {key: asdict(state) for key, state in self.states.items()},
+                       'spent': list(self._spent)}, f, separators=(',', ':'))
+
+
+def format_interval(seconds):
+    if seconds >= DAY:
+        return f"{seconds / DAY:.1f}d"
+    if seconds >= HOUR:
+        return f"{seconds / HOUR:.1f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds:.0f}s"
+
+
+def add_arguments(parser):
+    """Options of the watch command"""
+    parser.add_argument('--min-interval', type=float, default=DEFAULT_MIN_INTERVAL / HOUR,
+                        metavar='HOURS', help="shortest wait between checks of a category "
+                                              f"(default: {DEFAULT_MIN_INTERVAL / HOUR:g})")
+    parser.add_argument('--max-interval', type=float, default=DEFAULT_MAX_INTERVAL / HOUR,
+                        metavar='HOURS', help="longest wait between checks of a category "
+                                              f"(default: {DEFAULT_MAX_INTERVAL / HOUR:g})")
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, metavar='REQUESTS',
+                        help=f"requests per rolling 24 hours across all retailers "
+                             f"(default: {DEFAULT_BUDGET})")
+    parser.add_argument('--schedule-file', default=DEFAULT_SCHEDULE_FILE, metavar='PATH',
+                        help=f"learned intervals and due times (default: {DEFAULT_SCHEDULE_FILE})")
+    parser.add_argument('--rounds', type=int, metavar='N',
+                        help="stop after N rounds of checks (default: run until interrupted)")
+
+
+def run(args, metrics, finish):
+    """Check categories as they fall due and republish whenever deals change
+
+    ``finish`` writes the run report after each round.
+    """
+    from golfdeals import finder as finder_step
+    from golfdeals import publish
+    from golfdeals.snapshot import digest
+    from golfdeals.storage import RAW_DEALS_FILE, save_raw_deals
+
+    # Deals are published from memory; a stream file would only grow
+    args.ndjson = None
+    finder = finder_step.build_finder(args, metrics)
+    scheduler = PollScheduler(args.schedule_file, min_interval=args.min_interval * HOUR,
+                              max_interval=args.max_interval * HOUR, budget=args.budget)
+    categories = {}
+    current = {}
+    for retailer in finder.retailers:
+        for url, name in retailer.categories:
+            key = f"{retailer.key}|{url}"
+            categories[key] = (retailer, url, name)
+            # Start from the last run's deals until the category is checked again
+            current[key] = [deal for _, deal, _ in finder.seen.previous_deals(url, 0)]
+            scheduler.add(key)
+    if not categories:
+        finder.close()
+        sys.exit("golfdeals watch: no categories to watch; check --retailers")
+    print(f"👀 Watching {len(categories)} categories, "
+          f"budget {args.budget} requests per 24h")
+
+    rounds = 0
+    try:
+        while args.rounds is None or rounds < args.rounds:
+            wait = scheduler.wait_time()
+            if wait > 0:
+                print(f"💤 Next check in {format_interval(wait)} "
+                      f"({scheduler.spent()} of {args.budget} requests used in the last 24h)")
+                time.sleep(wait)
+            metrics.reset()
+            finder.category_results.clear()
+            if finder.enricher is not None:
+                finder.enricher.reset()
+
+            changed = []
+            with metrics.stage('crawl'):
+                for key in scheduler.pop_due():
+                    retailer, url, name = categories[key]
+                    before = len(metrics.fetches)
+                    deals = finder.scrape_category(retailer, url, name)
+                    ok = finder.category_results[-1]['ok']
+                    if scheduler.record(key, digest(deals) if ok else None,
+                                        len(metrics.fetches) - before):
+                        current[key] = deals
+                        changed.append(key)
+                    wait = scheduler.states[key].next_due - scheduler.clock()
+                    print(f"    next check in {format_interval(wait)}")
+            metrics.set_categories(finder.category_results)
+            finder.save_state()
+            if finder.cache is not None:
+                # The process may run for days; keep the cache within its TTL and size
+                if not args.offline:
+                    finder.cache.evict()
+                finder.cache.save()
+            scheduler.save()
+
+            if changed:
+                deals = [deal for found in current.values() for deal in found]
+                save_raw_deals(deals, RAW_DEALS_FILE)
+                print(f"\n🔁 {len(changed)} categories changed, republishing")
+                publish.run(args, deals, metrics)
+            finish(metrics, args)
+            rounds += 1
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        scheduler.save()
+        finder.close()
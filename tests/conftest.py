@@ -0,0 +1,61 @@
+"""
+Shared Test Fixtures
+The fault-injecting fixture server and the fixture pages from benchmarks/
+"""
+
+import os
+import sys
+import zlib
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import fault_server  # noqa: E402
+from make_fixtures import FIXTURES, PAGES  # noqa: E402
+
+from golfdeals.parsing import RULES  # noqa: E402
+
+FIXTURE_NAMES = sorted(PAGES)
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def rules_for(name):
+    """Parse rules of the retailer a fixture page imitates"""
+    return RULES['gcw'] if name.startswith('gcw') else RULES['golf_town']
+
+
+def serving_path(name, prefix='/sale'):
+    """A path the fault server answers with fixture ``name``"""
+    index = FIXTURE_NAMES.index(name)
+    for n in range(1000):
+        path = f"{prefix}/{n}.htm"
+        if zlib.crc32(path.encode('utf-8')) % len(FIXTURE_NAMES) == index:
+            return path
+    raise LookupError(name)
+
+
+@pytest.fixture
+def serve():
+    """Start a fault server: ``serve(Faults(...))`` returns (faults, base URL, counts)
+
+    The ``Faults`` stay live, so a test can change them while the server runs.
+    """
+    servers = []
+
+    def start(faults=None):
+        faults = faults or fault_server.Faults()
+        server, url, counts = fault_server.start(faults)
+        servers.append(server)
+        return faults, url, counts
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,92 @@
+"""
+Alert Tests
+Top deals per source and category, threshold crossings, and the feeds they are published in
+"""
+
+import json
+from datetime import datetime, timezone
+from xml.etree import ElementTree
+
+from golfdeals.alerts import TopDeals, find_alerts, write_alert_feeds
+from golfdeals.records import Deal
+
+NOW = datetime(2026, 10, 1, 13, tzinfo=timezone.utc)
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+def _deal(name, pct, source='GCW', category='Balls', original=100.0):
+    sale = original * (100 - pct) / 100
+    return Deal(name, original, sale, original - sale, pct, f"https://shop.example/{name}", source,
+                category=category)
+
+
+def test_top_deals_keeps_the_best_per_source_and_category():
+    deals = [_deal(f"ball-{pct}", pct) for pct in (10, 60, 35, 60, 25, 45)]
+    deals += [_deal('glove', 20, category='Gloves'), _deal('driver', 55, source='Golf Town')]
+    ranking = TopDeals(3).extend(deals)
+
+    top = ranking.top()
+    # Equal discounts keep their arrival order
+    assert [deal.product_name for deal in top['GCW']['Balls']] == ['ball-60', 'ball-60', 'ball-45']
+    assert top['GCW']['Balls'][0] is deals[1]
+    assert [deal.product_name for deal in top['GCW']['Gloves']] == ['glove']
+    assert [deal.product_name for deal in top['Golf Town']['Balls']] == ['driver']
+    assert ranking.tiers == {'excellent': 3, 'great': 2, 'good': 2, 'fair': 1}
+    assert ranking.total == len(deals)
+
+
+def test_top_deals_with_n_zero_only_counts():
+    ranking = TopDeals(0).extend([_deal('a', 55), _deal('b', 5)])
+    assert ranking.top() == {}
+    assert ranking.tiers['excellent'] == ranking.tiers['fair'] == 1
+
+
+def test_alerts_flag_new_crossings_at_their_highest_threshold():
+    previous = [_deal('steady', 55), _deal('climber', 35), _deal('jumper', 10), _deal('faller', 60)]
+    deals = [_deal('steady', 58), _deal('climber', 52), _deal('jumper', 40), _deal('faller', 30),
+             _deal('newcomer', 70), _deal('cheap-newcomer', 15)]
+    alerts = find_alerts(deals, previous)
+
+    assert [(a.deal.product_name, a.threshold, a.previous_pct) for a in alerts] == [
+        ('newcomer', 50, None), ('climber', 50, 35), ('jumper', 30, 10)]
+
+
+def test_first_run_sets_the_baseline_without_alerts():
+    assert find_alerts([_deal('newcomer', 70)], []) == []
+
+
+def test_feeds_list_each_alert_once_newest_first(tmp_path):
+    paths = {'path': str(tmp_path / 'alerts.json'), 'rss': str(tmp_path / 'alerts.rss'),
+             'atom': str(tmp_path / 'alerts.atom')}
+    previous = [_deal('climber', 35)]
+    first = find_alerts([_deal('climber', 52), _deal('newcomer', 70)], previous)
+    ranking = TopDeals(2).extend(alert.deal for alert in first)
+    added = write_alert_feeds(first, ranking, site_url='https://me.github.io/deals/', now=NOW,
+                              **paths)
+    assert [entry['title'] for entry in added] == [
+        '70% off newcomer - $30.00 at GCW', '52% off climber - $48.00 at GCW']
+
+    # The same alert again adds nothing; a new one goes on top
+    again = find_alerts([_deal('climber', 52), _deal('jumper', 45)], previous)
+    added = write_alert_feeds(again, ranking, now=NOW, **paths)
+    assert [entry['title'] for entry in added] == ['45% off jumper - $55.00 at GCW']
+
+    with open(paths['path']) as f:
+        data = json.load(f)
+    titles = [entry['title'] for entry in data['alerts']]
+    assert titles == ['45% off jumper - $55.00 at GCW', '70% off newcomer - $30.00 at GCW',
+                      '52% off climber - $48.00 at GCW']
+    assert [deal['product_name'] for deal in data['top']['GCW']['Balls']] == ['newcomer', 'climber']
+
+    rss = ElementTree.parse(paths['rss']).getroot()
+    items = rss.findall('channel/item')
+    assert [item.findtext('title') for item in items] == titles
+    assert items[2].findtext('description') == '$100.00 → $48.00 (52% off, was 35% off) at GCW'
+    assert items[1].findtext('description').endswith('(70% off, new listing) at GCW')
+    assert rss.findtext('channel/lastBuildDate') == 'Thu, 01 Oct 2026 13:00:00 +0000'
+
+    atom = ElementTree.parse(paths['atom']).getroot()
+    entries = atom.findall(f'{ATOM}entry')
+    assert [entry.findtext(f'{ATOM}title') for entry in entries] == titles
+    assert entries[0].find(f'{ATOM}link').get('href') == 'https://shop.example/jumper'
+    assert atom.findtext(f'{ATOM}updated') == '2026-10-01T13:00:00+00:00'
@@ -0,0 +1,78 @@
+"""
+Response Cache Tests
+Bodies, validators and parse output per URL, with TTL and size eviction
+"""
+
+import pytest
+
+from golfdeals import cache as cache_module
+from golfdeals.cache import ResponseCache
+
+PAGE = '<html>' + 'x' * 94 + '</html>'
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(cache_module, 'time', fake)
+    return fake
+
+
+def _url(n):
+    return f"https://shop.example/sale/{n}.htm"
+
+
+def test_entries_round_trip_through_the_index(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path))
+    cache.store(_url(1), PAGE, etag='"v1"', last_modified='Thu, 01 Oct 2026 09:00:00 GMT')
+    cache.store_parsed(_url(1), 'gcw', PAGE, [{'sku': 'A1'}])
+    cache.store_parsed(_url(1), 'gcw', 'a different body', [{'sku': 'B2'}])
+    cache.save()
+
+    cache = ResponseCache(str(tmp_path))
+    assert cache.conditional_headers(_url(1)) == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Thu, 01 Oct 2026 09:00:00 GMT'}
+    assert cache.load_body(_url(1)) == PAGE
+    assert cache.load_parsed(_url(1), 'gcw', PAGE) == [{'sku': 'A1'}]
+    # Parse output belongs to the body it came from
+    assert cache.load_parsed(_url(1), 'gcw', PAGE + ' ') is None
+    assert cache.conditional_headers(_url(2)) == {} and cache.load_body(_url(2)) is None
+
+
+def test_expired_entries_are_evicted(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    cache.store(_url(1), PAGE)
+    clock.now += 1800
+    cache.store(_url(2), PAGE)
+    clock.now += 1801
+    cache.touch(_url(2))
+    cache.store(_url(3), PAGE)
+    clock.now += 1801
+
+    cache.evict()
+    # 1 expired; 2 was revalidated by a 304 since; 3 is fresh
+    assert _url(1) not in cache and _url(2) in cache and _url(3) in cache
+    assert not (tmp_path / f"{cache_module._digest(_url(1))}.html").exists()
+    assert len(list(tmp_path.glob('*.html'))) == 2
+
+
+def test_least_recently_used_entries_go_first_over_the_size_limit(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path), max_bytes=2 * len(PAGE) + 10)
+    for n in range(4):
+        cache.store(_url(n), PAGE)
+        clock.now += 1
+    cache.store_parsed(_url(3), 'gcw', PAGE, [])
+    cache.load_body(_url(0))
+
+    cache.evict()
+    # 0 was read last of the old entries; 1 and then 2 are the least recently used
+    assert [n for n in range(4) if _url(n) in cache] == [0, 3]
+    assert len(cache) == 2
@@ -0,0 +1,172 @@
+"""
+Crawler And Finder Tests
+Pagination, early stop and carry-over aging, and streaming with timeouts and cancellation
+"""
+
+import asyncio
+
+import pytest
+from conftest import read_fixture, rules_for, serving_path
+from fault_server import Faults
+
+from golfdeals.crawl import MAX_CARRY_AGE, PageCrawler, SeenStore
+from golfdeals.finder import DealFinder
+from golfdeals.http import FetchResult, HttpEngine
+from golfdeals.limits import RetryPolicy
+from golfdeals.parsing import parse_page
+from golfdeals.records import product_key
+from golfdeals.retailers import Retailer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def parse(text, url):
+    # Pages past the first are whichever fixture the server picks for their path
+    return parse_page(text, url, rules_for('gcw' if 'v-product' in text else 'golf_town')).deals
+
+
+def _crawl(engine, seen, url):
+    return asyncio.run(PageCrawler(engine, seen).crawl(url, parse))
+
+
+@pytest.fixture
+def category(serve):
+    _, base, counts = serve()
+    return base + serving_path('gcw_gloves.html'), counts
+
+
+def test_second_crawl_stops_early_and_carries_deals_over(category, tmp_path):
+    url, counts = category
+    seen = SeenStore(str(tmp_path / 'seen.json'))
+    with HttpEngine(retry=RetryPolicy(attempts=1)) as engine:
+        first = _crawl(engine, seen, url)
+        fetched = counts['requests']
+        seen.update(url, first.paged_deals)
+        second = _crawl(engine, seen, url)
+
+    assert first.pages == fetched > 1 and not first.stopped_early
+    assert second.pages == 1 and second.stopped_early
+    assert counts['requests'] == fetched + 1
+    assert second.carried_over == len(first.deals) - len([p for p, _, _ in first.paged_deals if p == 1])
+    assert sorted(map(product_key, second.deals)) == sorted(map(product_key, first.deals))
+
+
+def test_same_named_products_are_all_kept(category):
+    url, _ = category
+    with HttpEngine(retry=RetryPolicy(attempts=1)) as engine:
+        crawl = asyncio.run(PageCrawler(engine, max_pages=1).crawl(url, parse))
+    names = [deal.product_name for deal in crawl.deals]
+    assert len(crawl.deals) == 47
+    assert len(set(names)) < len(names)
+
+
+def test_stale_carry_overs_are_fetched_again(category, tmp_path):
+    url, counts = category
+    clock = FakeClock()
+    seen = SeenStore(str(tmp_path / 'seen.json'), clock=clock)
+    with HttpEngine(retry=RetryPolicy(attempts=1)) as engine:
+        first = _crawl(engine, seen, url)
+        seen.update(url, first.paged_deals)
+        clock.now += MAX_CARRY_AGE / 2
+        second = _crawl(engine, seen, url)
+        seen.update(url, second.paged_deals)
+        clock.now += MAX_CARRY_AGE / 2 + 1
+        third = _crawl(engine, seen, url)
+
+    assert second.stopped_early
+    # Page 1 was confirmed by the second crawl, the others only by the first
+    assert third.pages == first.pages and third.carried_over == 0
+    assert counts['requests'] == 2 * first.pages + 1
+
+
+def _retailer(url):
+    return Retailer(key='gcw', label='GCW', rules=rules_for('gcw'), categories=((url, 'Gloves'),))
+
+
+def _finder(url):
+    return DealFinder(retailers=[_retailer(url)], max_pages=1, retries=0)
+
+
+def test_stream_yields_deals_and_feeds_sinks(category):
+    url, _ = category
+    written = []
+
+    class Sink:
+        async def write(self, deals):
+            written.extend(deals)
+
+    async def stream():
+        async with _finder(url) as finder:
+            finder.sinks.append(Sink())
+            return [deal async for deal in finder.stream_deals()]
+
+    deals = asyncio.run(stream())
+    assert len(deals) == 47 and written == deals
+
+
+def test_category_timeout_skips_the_category(serve):
+    _, base, _ = serve(Faults(latency=1.0))
+
+    async def find():
+        async with _finder(base + '/sale/slow.htm') as finder:
+            return await finder.find_deals(category_timeout=0.1), finder.category_results
+
+    deals, results = asyncio.run(find())
+    assert deals == []
+    assert results[0]['ok'] is False and results[0]['errors'] == 1
+
+
+def test_overall_timeout_raises(serve):
+    _, base, _ = serve(Faults(latency=1.0))
+
+    async def find():
+        async with _finder(base + '/sale/slow.htm') as finder:
+            return await finder.find_deals(timeout=0.1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(find())
+
+
+def test_cancelling_the_stream_cancels_its_crawls(serve):
+    _, base, _ = serve(Faults(latency=1.0))
+
+    async def cancel():
+        async with _finder(base + '/sale/slow.htm') as finder:
+            task = asyncio.ensure_future(finder.find_deals())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(cancel()) == []
+
+
+def test_a_failing_category_does_not_stop_the_others():
+    page = read_fixture('gcw_gloves.html')
+
+    class Client:
+        async def fetch(self, url):
+            if 'broken' in url:
+                raise ConnectionError('client blew up')
+            return FetchResult(url, 200, page)
+
+    retailer = Retailer(key='gcw', label='GCW', rules=rules_for('gcw'),
+                        categories=(('https://shop.example/broken/', 'Balls'),
+                                    ('https://shop.example/gloves/', 'Gloves')))
+
+    async def find():
+        async with DealFinder(client=Client(), retailers=[retailer], max_pages=1) as finder:
+            return await finder.find_deals(), finder.category_results
+
+    deals, results = asyncio.run(find())
+    assert len(deals) == 47
+    results = {result['category']: result for result in results}
+    assert results['GCW Balls']['ok'] is False and results['GCW Balls']['errors'] == 1
+    assert results['GCW Gloves']['ok'] is True
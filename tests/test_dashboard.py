@@ -0,0 +1,90 @@
+"""
+Dashboard Tests
+The site written to disk file by file, which files a rerun rewrites, and the filter indexes
+"""
+
+import os
+from datetime import datetime
+
+from golfdeals.dashboard import build_indexes, render_site, write_dashboard_site
+from golfdeals.records import DealBatch, make_deal
+
+UPDATED = datetime(2026, 10, 1, 9)
+
+
+def _deals(gcw_glove_price=20.0):
+    return [make_deal('Titleist Pro V1', 60.0, 30.0, 30.0, 50, 'https://gcw.example/p/1', 'GCW'),
+            make_deal('Cobra "Flex" Glove', 40.0, gcw_glove_price, 40.0 - gcw_glove_price,
+                      round((40.0 - gcw_glove_price) / 40.0 * 100), 'https://gcw.example/p/2', 'GCW'),
+            make_deal('Ping Driver', 500.0, 450.0, 50.0, 10, 'https://gt.example/p/3', 'Golf Town')]
+
+
+def _read_tree(docs):
+    files = {}
+    for directory, _, names in os.walk(docs):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, docs).replace(os.sep, '/')] = f.read()
+    return files
+
+
+def test_written_site_matches_the_rendered_one(tmp_path):
+    written = write_dashboard_site(_deals(), str(tmp_path), UPDATED)
+    files = render_site(_deals(), UPDATED)
+    assert _read_tree(tmp_path) == files
+    assert sorted(written) == sorted(files)
+
+
+def test_rerun_only_rewrites_what_changed(tmp_path):
+    write_dashboard_site(_deals(), str(tmp_path), UPDATED)
+    unchanged = write_dashboard_site(_deals(), str(tmp_path), UPDATED)
+    assert unchanged == ['index.html']
+
+    # The glove goes from 50% to 75% off: the all-deals, excellent-tier and
+    # GCW bundles change, Golf Town's and the fair tier's don't
+    changed = write_dashboard_site(_deals(gcw_glove_price=10.0), str(tmp_path), UPDATED)
+    downloads = {name.split('/')[-1] for name in changed if name.startswith('downloads/')}
+    assert downloads == {f"golf-deals-{key}.{ext}" for key in ('all', 'excellent', 'gcw')
+                         for ext in ('csv', 'md')}
+    assert _read_tree(tmp_path) == render_site(_deals(gcw_glove_price=10.0), UPDATED)
+
+
+def test_stale_files_are_pruned(tmp_path):
+    write_dashboard_site(_deals(), str(tmp_path), UPDATED)
+    write_dashboard_site(_deals()[:2], str(tmp_path), UPDATED)
+    names = set(_read_tree(tmp_path))
+    assert 'downloads/golf-deals-golf-town.csv' not in names
+    assert not any(name.endswith('.partial') for name in names)
+    assert names == set(render_site(_deals()[:2], UPDATED))
+
+
+def _undelta(gaps):
+    positions, total = [], 0
+    for gap in gaps:
+        total += gap
+        positions.append(total)
+    return positions
+
+
+def test_indexes_find_deals_by_threshold_source_and_name():
+    batch = DealBatch(_deals())
+    ranked = batch.order_by_discount()
+    names = [batch[row].product_name for row in ranked]
+    assert names == ['Titleist Pro V1', 'Cobra "Flex" Glove', 'Ping Driver']
+    thresholds, index, search = build_indexes(batch, ranked)
+
+    # Every threshold is a prefix of the ranking
+    assert thresholds == {'50': 2, '30': 2, '20': 2, '0': 3}
+    assert {source: _undelta(gaps) for source, gaps in index['sources'].items()} == {
+        'GCW': [0, 1], 'Golf Town': [2]}
+    assert search['n'] == 3
+    grams = {gram: _undelta(gaps) for gram, gaps in search['grams'].items()}
+    assert grams['pro'] == [0] and grams['ing'] == [2]
+    assert grams['ove'] == [1] and grams['o v'] == [0]
+    # Names are lowercased and their whitespace collapsed
+    assert 'Pro' not in grams and all(len(gram) == 3 for gram in grams)
+    assert sorted(grams) == list(grams)
+    normalized = [' '.join(name.lower().split()) for name in names]
+    for gram, positions in grams.items():
+        assert positions == [pos for pos, name in enumerate(normalized) if gram in name]
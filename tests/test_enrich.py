@@ -0,0 +1,122 @@
+"""
+Enrichment Tests
+Reading product pages, applying their checks, and which deals get checked at all
+"""
+
+import asyncio
+import json
+
+from golfdeals.enrich import (SCHEMA_PRODUCT, ProductEnricher, ProductStore, apply_check,
+                              read_schema_product)
+from golfdeals.http import FetchResult
+from golfdeals.parsing import RULES, parse_page
+from golfdeals.records import make_deal
+
+LISTING = 'https://shop.example/sale/?page=2'
+
+
+def _ld(product):
+    return f'<script type="application/ld+json">{json.dumps(product)}</script>'
+
+
+def _product(price, availability='https://schema.org/InStock', **extra):
+    return {'@type': 'Product', 'name': 'Glove',
+            'offers': {'@type': 'Offer', 'price': price, 'availability': availability}, **extra}
+
+
+class PageClient:
+    """Answers every URL from a dict of pages, counting the fetches"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+
+    async def fetch(self, url):
+        self.fetched.append(url)
+        return FetchResult(url, 200, self.pages[url])
+
+
+def test_reads_the_json_ld_product_offer():
+    assert read_schema_product(_ld(_product('29.99'))) == (29.99, True)
+    assert read_schema_product(_ld(_product(15, 'https://schema.org/OutOfStock'))) == (15.0, False)
+
+
+def test_reads_the_product_inside_a_graph():
+    page = _ld({'@context': 'https://schema.org',
+                '@graph': [{'@type': 'BreadcrumbList'}, _product('1,299.99')]})
+    assert read_schema_product(page) == (1299.99, True)
+
+
+def test_related_products_never_count():
+    page = ('<div itemscope itemtype="https://schema.org/Product">'
+            '<meta itemprop="price" content="49.99">'
+            '<link itemprop="availability" href="https://schema.org/InStock"></div>'
+            '<div itemscope itemtype="https://schema.org/Product">'
+            '<meta itemprop="price" content="9.99">'
+            '<link itemprop="availability" href="https://schema.org/SoldOut"></div>'
+            '<p>Sold Out</p>')
+    assert read_schema_product(page) == (49.99, True)
+
+
+def test_page_without_product_data_is_unread():
+    assert read_schema_product('<p>Out of Stock · "price": 5.00</p>') is None
+
+
+def _deal(sale=40.0, original=80.0, pct=50.0):
+    return make_deal('Titleist Pro V1', original, sale, original - sale, pct, 'https://shop.example/p/1', 'GCW')
+
+
+def test_apply_check():
+    deal = _deal()
+    assert apply_check(deal, {'in_stock': None, 'price': None}) is deal
+    assert apply_check(deal, {'in_stock': False, 'price': 40.0}) is None
+    assert apply_check(deal, {'in_stock': True, 'price': 40.0}) is deal
+    assert apply_check(deal, {'in_stock': True, 'price': 99.0}) is deal
+
+    repriced = apply_check(deal, {'in_stock': True, 'price': 20.0})
+    assert (repriced.sale_price, repriced.savings, repriced.discount_pct) == (20.0, 60.0, 75.0)
+    assert deal.sale_price == 40.0
+
+
+def test_apply_check_rounds_whole_percent_discounts():
+    # 49.9% off stays in the 50% tier instead of dropping to 49
+    deal = _deal(sale=60.0, original=100.0, pct=40)
+    assert apply_check(deal, {'in_stock': True, 'price': 50.1}).discount_pct == 50
+    assert apply_check(_deal(pct=50.0), {'in_stock': True, 'price': 40.08}).discount_pct == 49.9
+
+
+def _enrich(deals, pages, tmp_path):
+    client = PageClient(pages)
+    enricher = ProductEnricher(ProductStore(str(tmp_path / 'checks.json')))
+    kept = asyncio.run(enricher.enrich(deals, client, SCHEMA_PRODUCT))
+    return kept, client, enricher.stats
+
+
+def test_deals_still_on_a_listing_page_are_not_checked(tmp_path):
+    # A text-mode page: no tiles, so every deal links to the listing itself,
+    # which carries a glove's Product markup
+    text = ('<body><p>Titleist Pro V1 · Our Price: $59.99 · Sale Price: $49.99 · You save $10.00</p>'
+            '<p>Cobra Glove · Our Price: $39.99 · Sale Price: $29.99 · You save $10.00</p>'
+            + _ld(_product('29.99', 'https://schema.org/OutOfStock')) + '</body>')
+    deals = parse_page(text, LISTING, RULES['gcw']).deals
+    assert [deal.url for deal in deals] == [LISTING, LISTING]
+
+    kept, client, stats = _enrich(deals, {LISTING: text}, tmp_path)
+    assert kept == deals
+    assert client.fetched == []
+    assert stats['repriced'] == stats['sold_out'] == 0
+
+
+def test_deals_linked_from_their_tile_are_checked(tmp_path):
+    text = ('<div class="v-product" data-sku="A1"><a href="/p/a1.htm">Titleist Pro V1</a>'
+            ' · Our Price: $59.99 · Sale Price: $49.99 · You save $10.00</div>'
+            '<div class="v-product" data-sku="B2">Cobra Glove'
+            ' · Our Price: $39.99 · Sale Price: $29.99 · You save $10.00</div>')
+    deals = parse_page(text, LISTING, RULES['gcw']).deals
+    assert [deal.linked for deal in deals] == [True, False]
+
+    product = 'https://shop.example/p/a1.htm'
+    kept, client, stats = _enrich(deals, {product: _ld(_product('44.99'))}, tmp_path)
+    assert client.fetched == [product]
+    assert [deal.sale_price for deal in kept] == [44.99, 29.99]
+    assert stats['repriced'] == 1
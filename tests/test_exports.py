@@ -0,0 +1,42 @@
+"""
+Export Tests
+Reddit posts and CSV rows must survive whatever characters a product name carries
+"""
+
+import csv
+import io
+
+from golfdeals.exports import (CSV_HEADER, POST_SEPARATOR, csv_rows, escape_markdown, markdown_url,
+                               reddit_post)
+from golfdeals.records import make_deal
+
+
+def _deal(name='Titleist Pro V1', url='https://gcw.example/p/1', sku='PV1'):
+    deal = make_deal(name, 60.0, 30.0, 30.0, 50, url, 'GCW')
+    deal.sku = sku
+    return deal
+
+
+def test_csv_rows_quote_commas_quotes_and_newlines():
+    names = ['Ping G430 10.5", Stiff', 'Cobra "Air-X" Driver', 'Two\nLines', 'Plain']
+    text = CSV_HEADER + ''.join(csv_rows(_deal(name) for name in names))
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0] == CSV_HEADER.strip().split(',')
+    assert [row[0] for row in rows[1:]] == names
+    assert all(len(row) == len(rows[0]) for row in rows)
+    assert rows[1][1:] == ['60.0', '30.0', '30.0', '50', 'GCW', 'https://gcw.example/p/1', 'PV1']
+
+
+def test_markdown_characters_are_escaped():
+    assert escape_markdown('*Pro* [V1] _x_ ~y~ `z` a|b ^c <d> \\') == (
+        '\\*Pro\\* \\[V1\\] \\_x\\_ \\~y\\~ \\`z\\` a\\|b \\^c \\<d\\> \\\\')
+    assert escape_markdown('Ping G430 - 10.5°') == 'Ping G430 - 10.5°'
+    assert markdown_url('https://x.example/a (b)/c d') == 'https://x.example/a%20%28b%29/c%20d'
+
+
+def test_reddit_post_escapes_the_name_and_keeps_the_link_whole():
+    post = reddit_post(_deal('*Sale* [Driver]', url='https://x.example/p_(1)'))
+    assert post.startswith('**🔥 [GCW] \\*Sale\\* \\[Driver\\] - $30.00 (50% off!)**')
+    assert '[Link to deal](https://x.example/p_%281%29)' in post
+    assert post.endswith('Source: GCW' + POST_SEPARATOR)
+    assert '[Link to deals page]' in reddit_post(_deal(sku=None))
@@ -0,0 +1,57 @@
+"""
+Extraction Tests
+Every backend, and the regex tile scan, must read the fixture pages the same way
+"""
+
+import dataclasses
+
+import pytest
+from conftest import FIXTURE_NAMES, read_fixture, rules_for
+
+from golfdeals.extract import BACKENDS, Tile, extract_text
+from golfdeals.parsing import parse_page
+
+
+@pytest.mark.parametrize('name', FIXTURE_NAMES)
+def test_text_mode_matches_across_backends(name):
+    html = read_fixture(name)
+    texts = {backend: extract_text(html, backend=backend) for backend in BACKENDS}
+    assert len(set(texts.values())) == 1, texts.keys()
+
+
+@pytest.mark.parametrize('name', FIXTURE_NAMES)
+def test_text_mode_leaves_out_page_chrome(name):
+    text = extract_text(read_fixture(name), backend='html.parser')
+    # Title, navigation and breadcrumb would run into the first product name
+    assert '|' not in text
+    assert 'Home · Sale' not in text
+    assert 'Category 1 ' not in text and 'Department 1 ' not in text
+
+
+@pytest.mark.parametrize('name', FIXTURE_NAMES)
+def test_regex_tiles_match_every_backend(name):
+    html = read_fixture(name)
+    rules = rules_for(name)
+    fast = extract_text(html, rules.tile, sku_attr=rules.sku_attr)
+    assert fast and all(isinstance(tile, Tile) for tile in fast)
+    for backend in BACKENDS:
+        assert extract_text(html, rules.tile, backend, rules.sku_attr) == fast, backend
+
+
+@pytest.mark.parametrize('name', FIXTURE_NAMES)
+def test_text_mode_names_are_clean(name):
+    rules = rules_for(name)
+    tiled = parse_page(read_fixture(name), 'https://shop.example/sale/', rules)
+    text = parse_page(read_fixture(name), 'https://shop.example/sale/', dataclasses.replace(rules, tile=None))
+    names = {deal.product_name for deal in tiled.deals}
+    assert text.deals
+    assert {deal.product_name for deal in text.deals} <= names
+
+
+def test_regex_tiles_need_the_whole_class_token():
+    html = ('<div class="v-product-name">Not a tile</div>'
+            '<div data-note="v-product">Not a tile either</div>'
+            '<section class="grid v-product" data-sku="A1"><div><a href="/a">A</a></div>'
+            '<img data-src="/a.jpg" src="x.gif"> Glove</section>')
+    tiles = extract_text(html, 'v-product', sku_attr='data-sku')
+    assert tiles == [Tile('A Glove', link='/a', image='/a.jpg', sku='A1')]
@@ -0,0 +1,66 @@
+"""
+Price History Tests
+Only price changes are stored, and ranges and signals read the right window
+"""
+
+from datetime import datetime, timedelta
+
+from golfdeals.history import HistoryStore
+from golfdeals.records import Deal
+
+DAY = timedelta(days=1)
+START = datetime(2026, 6, 1, 9)
+
+
+def _deal(sale, name='Pro V1', sku='', original=60.0):
+    return Deal(name, original, sale, original - sale, round((original - sale) / original * 100),
+                'https://gcw.example/p/1', 'GCW', sku=sku)
+
+
+def _store(tmp_path):
+    return HistoryStore(str(tmp_path / 'history.sqlite'))
+
+
+def test_record_stores_price_changes_only(tmp_path):
+    with _store(tmp_path) as store:
+        assert store.record([_deal(50.0), _deal(30.0, name='Glove')], START) == 2
+        assert store.record([_deal(50.0), _deal(30.0, name='Glove')], START + DAY) == 0
+        assert store.record([_deal(45.0), _deal(30.0, name='Glove')], START + 2 * DAY) == 1
+        # Back to an earlier price is still a change
+        assert store.record([_deal(50.0)], START + 3 * DAY) == 1
+        assert store.product_history('GCW|Pro V1') == [
+            ('2026-06-01T09:00:00', 50.0), ('2026-06-03T09:00:00', 45.0), ('2026-06-04T09:00:00', 50.0)]
+
+
+def test_price_at_and_range_since(tmp_path):
+    with _store(tmp_path) as store:
+        for day, price in enumerate((50.0, 40.0, 55.0, 45.0)):
+            store.record([_deal(price)], START + day * DAY)
+        assert store.price_at(START - DAY) == {}
+        assert store.price_at(START + DAY + timedelta(hours=12)) == {'GCW|Pro V1': 40.0}
+        assert store.price_at(START, source='Golf Town') == {}
+        # The price current when the window opens counts, older ones don't
+        assert store.range_since(START + DAY + timedelta(hours=12)) == {'GCW|Pro V1': (40.0, 55.0)}
+        assert store.range_since(START + 2 * DAY) == {'GCW|Pro V1': (45.0, 55.0)}
+
+
+def test_signals_of_known_and_new_products(tmp_path):
+    with _store(tmp_path) as store:
+        store.record([_deal(50.0)], START)
+        store.record([_deal(40.0), _deal(25.0, name='Glove')], START + 2 * DAY)
+        signals = store.signals([_deal(40.0), _deal(25.0, name='Glove'), _deal(9.0, name='Tee')],
+                                now=START + 2 * DAY + timedelta(hours=1))
+    assert signals == {
+        'GCW|Pro V1': {'low_price': 40.0, 'high_price': 50.0, 'previous_price': 50.0},
+        # Seen for the first time within the last day: no previous price
+        'GCW|Glove': {'low_price': 25.0, 'high_price': 25.0},
+    }
+
+
+def test_name_keyed_history_moves_to_the_sku(tmp_path):
+    with _store(tmp_path) as store:
+        store.record([_deal(50.0)], START)
+        store.db.execute("PRAGMA user_version = 1")
+    with _store(tmp_path) as store:
+        assert store.record([_deal(50.0, sku='PV1')], START + DAY) == 0
+        assert store.product_history('GCW|PV1') == [('2026-06-01T09:00:00', 50.0)]
@@ -0,0 +1,128 @@
+"""
+HTTP Engine Tests
+Conditional GETs and the circuit breaker, against the fault-injecting fixture server
+"""
+
+import asyncio
+import time
+
+from conftest import read_fixture, serving_path
+from fault_server import Faults
+
+from golfdeals.cache import ResponseCache
+from golfdeals.http import HttpEngine
+from golfdeals.limits import CircuitBreaker, RetryPolicy, SharedLimit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _engine(**kwargs):
+    return HttpEngine(retry=RetryPolicy(attempts=1), **kwargs)
+
+
+def test_unchanged_page_is_answered_from_the_cache(serve, tmp_path):
+    _, base, counts = serve()
+    url = base + serving_path('gcw_gloves.html')
+    cache = ResponseCache(str(tmp_path))
+    with _engine(cache=cache) as engine:
+        first, = engine.fetch_many([url])
+        second, = engine.fetch_many([url])
+
+    assert (first.status, first.from_cache) == (200, False)
+    assert (second.status, second.from_cache) == (304, True)
+    assert second.text == first.text == read_fixture('gcw_gloves.html')
+    assert second.size == 0
+    assert counts['200'] == 1 and counts['304'] == 1
+
+
+def test_offline_replays_the_cache_only(serve, tmp_path):
+    _, base, counts = serve()
+    url = base + serving_path('golf_town_shoes.html')
+    cache = ResponseCache(str(tmp_path))
+    with _engine(cache=cache) as engine:
+        engine.fetch_many([url])
+    cache.save()
+
+    with _engine(cache=ResponseCache(str(tmp_path)), offline=True) as engine:
+        cached, missing = engine.fetch_many([url, base + '/never-fetched.htm'])
+    assert cached.from_cache and cached.text == read_fixture('golf_town_shoes.html')
+    assert missing.error == 'not in cache (offline)'
+    assert counts['requests'] == 1
+
+
+def test_breaker_opens_after_threshold_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=3, reset_after=30, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record(False)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_lets_one_trial_through_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_after=30, clock=clock)
+    breaker.record(False)
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # A failed trial opens the circuit for another full period
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_engine_fails_fast_while_a_host_is_down_and_recovers(serve):
+    faults, base, counts = serve(Faults(down=True))
+    urls = [base + f"/sale/{n}.htm" for n in range(5)]
+
+    async def fetch_in_turn(engine):
+        return [await engine.fetch(url) for url in urls]
+
+    with _engine(concurrency=1, breaker_threshold=2, breaker_reset=0.2) as engine:
+        results = asyncio.run(fetch_in_turn(engine))
+        assert [result.status for result in results[:2]] == [503, 503]
+        assert all('circuit open' in result.error for result in results[2:])
+        assert counts['requests'] == 2
+
+        faults.down = False
+        time.sleep(0.25)
+        recovered = asyncio.run(fetch_in_turn(engine))
+    assert all(result.ok for result in recovered)
+    assert counts['requests'] == 2 + len(urls)
+
+
+def test_engines_share_one_in_flight_cap(serve):
+    _, base, _ = serve(Faults(latency=0.2))
+    shared = SharedLimit(1)
+    engines = [_engine(concurrency=4, shared=shared), _engine(concurrency=4, shared=shared)]
+
+    async def fetch_everything():
+        return await asyncio.gather(*(engine.fetch(f"{base}/sale/{n}.htm")
+                                      for engine in engines for n in range(2)))
+
+    started = time.perf_counter()
+    results = asyncio.run(fetch_everything())
+    elapsed = time.perf_counter() - started
+    for engine in engines:
+        engine.close()
+    assert all(result.ok for result in results)
+    # Four requests one at a time, not two engines running two each in parallel
+    assert elapsed >= 0.75
@@ -0,0 +1,90 @@
+"""
+Matching And Product Key Tests
+Same-named products with different SKUs must stay apart on the fixture pages
+"""
+
+import dataclasses
+
+import pytest
+from conftest import FIXTURE_NAMES, read_fixture, rules_for
+
+from golfdeals.matching import assign_product_ids, best_offers, dedupe
+from golfdeals.parsing import parse_page
+from golfdeals.records import make_deal, product_key
+from golfdeals.snapshot import diff_deals, digest
+
+
+def _deals(name):
+    return parse_page(read_fixture(name), 'https://shop.example/sale/', rules_for(name)).deals
+
+
+def _by_sku(deals, sku):
+    return next(deal for deal in deals if deal.sku == sku)
+
+
+@pytest.mark.parametrize('name', FIXTURE_NAMES)
+def test_fixture_pages_repeat_names_under_different_skus(name):
+    names = [deal.product_name for deal in _deals(name)]
+    assert len(set(names)) < len(names)
+
+
+@pytest.mark.parametrize('name', FIXTURE_NAMES)
+def test_product_key_tells_skus_apart(name):
+    deals = _deals(name)
+    assert len({product_key(deal) for deal in deals}) == len(deals)
+
+
+def test_product_key_falls_back_to_the_name():
+    deal = make_deal('Cobra StaSof Glove', 20.0, 10.0, 10.0, 50.0, 'https://x', 'Golf Town')
+    assert product_key(deal) == 'Golf Town|Cobra StaSof Glove'
+    assert product_key(dataclasses.replace(deal, sku='123')) == 'Golf Town|123'
+    assert product_key(deal.to_dict()) == product_key(deal)
+
+
+def test_dedupe_keeps_every_fixture_listing():
+    deals = assign_product_ids(deal for name in FIXTURE_NAMES for deal in _deals(name))
+    assert dedupe(deals) == deals
+
+
+def test_matched_listings_share_an_id_but_keep_their_rows():
+    gloves = assign_product_ids(_deals('gcw_gloves.html'))
+    sized, plain = _by_sku(gloves, 'GCW120004'), _by_sku(gloves, 'GCW120027')
+    assert sized.product_name == 'Cobra StaSof Glove - Size L'
+    assert plain.product_name == 'Cobra StaSof Glove'
+    assert sized.product_id == plain.product_id
+    assert sized in dedupe(gloves) and plain in dedupe(gloves)
+    price, _, retailers = best_offers(gloves)[sized.product_id]
+    assert price == min(sized.sale_price, plain.sale_price)
+    assert retailers == 1
+
+
+def test_dedupe_collapses_exact_repeats_only():
+    clubs = _deals('golf_town_clubs.html')
+    putter = _by_sku(clubs, '2100001')
+    # The same listing seen again from another category, a little cheaper
+    repeat = dataclasses.replace(putter, sale_price=putter.sale_price - 1, category='Putters')
+    kept = dedupe(clubs + [repeat])
+    assert len(kept) == len(clubs)
+    assert repeat in kept and putter not in kept
+    assert _by_sku(kept, '2100013').product_name.startswith('Adidas Spider GT Putter')
+
+
+def test_dedupe_matches_names_without_skus():
+    first = make_deal('FootJoy  StaSof Glove', 20.0, 12.0, 8.0, 40.0, 'https://x/1', 'GCW')
+    second = make_deal("Foot Joy StaSof Glove", 20.0, 11.0, 9.0, 45.0, 'https://x/2', 'GCW')
+    other = make_deal('FootJoy StaSof Glove', 20.0, 10.0, 10.0, 50.0, 'https://y/1', 'Golf Town')
+    assert dedupe([first, second, other]) == [second, other]
+
+
+def test_snapshot_digest_ignores_order_and_diff_keys_by_sku():
+    deals = _deals('gcw_shoes.html')
+    assert digest(deals) == digest(list(reversed(deals)))
+
+    repriced = [dataclasses.replace(deal, sale_price=deal.sale_price - 1)
+                if deal.sku == 'GCW110041' else deal for deal in deals[1:]]
+    diff = diff_deals(deals, repriced)
+    assert diff.removed == [product_key(deals[0])]
+    assert diff.changed == ['Golf Clearance Warehouse|GCW110041']
+    assert diff.added == []
+    assert not diff.unchanged
+    assert diff_deals(deals, deals).unchanged
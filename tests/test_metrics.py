@@ -0,0 +1,93 @@
+"""
+Run Metrics Tests
+Per-host and per-retailer summaries, warnings, and the report in JSON and Prometheus text
+"""
+
+import json
+
+from golfdeals.http import FetchResult
+from golfdeals.metrics import RunMetrics, percentile
+from golfdeals.parsing import ParseResult
+
+GCW = 'https://gcw.example/sale/'
+GT = 'https://gt.example/sale/'
+
+
+def _metrics():
+    metrics = RunMetrics()
+    metrics.record_fetch(FetchResult(GCW + '1', 200, size=1000, elapsed=0.4), cached=True)
+    metrics.record_fetch(FetchResult(GCW + '2', 304, from_cache=True, elapsed=0.1), cached=True)
+    metrics.record_fetch(FetchResult(GCW + '3', 200, from_cache=True, elapsed=0.0))
+    metrics.record_fetch(FetchResult(GT + '1', 503, error='HTTP 503', elapsed=0.2, attempts=3))
+    metrics.record_parse('gcw', GCW + '1', ParseResult(deals=[object()] * 9, matches=10, failures=1,
+                                                       elapsed=0.01))
+    metrics.record_parse('gcw', GCW + '2', deals=4)
+    metrics.record_parse('gt', GT + '2', ParseResult(matches=5, failures=2, elapsed=0.02))
+    metrics.set_categories([{'category': 'Golf Town Shoes', 'ok': False}])
+    return metrics
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([4, 1, 3, 2], 50) == 2
+    assert percentile([4, 1, 3, 2], 95) == 4
+    assert percentile([7], 1) == 7
+
+
+def test_summary_per_host_and_retailer():
+    summary = _metrics().summary()
+    gcw = summary['fetch']['gcw.example']
+    assert (gcw['requests'], gcw['errors'], gcw['bytes']) == (3, 0, 1000)
+    assert gcw['status'] == {'200': 2, '304': 1}
+    assert gcw['cache'] == {'miss': 1, 'revalidated': 1, 'hit': 1}
+    # Cache hits never touched the network, so they stay out of the latencies
+    assert (gcw['latency_p50'], gcw['latency_max']) == (0.1, 0.4)
+    assert summary['fetch']['gt.example']['errors'] == 1
+
+    assert summary['parse']['gcw'] == {'pages': 2, 'cached_pages': 1, 'parse_seconds': 0.01,
+                                       'matches': 10, 'failures': 1, 'deals': 13,
+                                       'empty_pages': 0, 'untiled_pages': 0}
+    assert summary['warnings'] == [
+        'gt: 2 of 5 candidates failed to parse',
+        f'gt: no deals found on 1 page(s), e.g. {GT}2',
+        'Golf Town Shoes: every page failed to download',
+    ]
+
+
+def test_stages_add_up_within_a_run_and_replace_loaded_ones(tmp_path):
+    path = str(tmp_path / 'run_report.json')
+    metrics = _metrics()
+    metrics.stages['fetch'] = 5.0
+    metrics.write_json(path)
+
+    loaded = RunMetrics.load(path)
+    assert loaded.summary() == metrics.summary()
+    with loaded.stage('fetch'):
+        pass
+    with loaded.stage('render'):
+        pass
+    with loaded.stage('render'):
+        pass
+    assert loaded.stages['fetch'] < 1.0
+    assert set(loaded.stages) == {'fetch', 'render'}
+    with open(path) as f:
+        assert json.load(f)['fetches'][3]['attempt'] == 3
+    assert RunMetrics.load(str(tmp_path / 'missing.json')).fetches == []
+
+
+def test_prometheus_text():
+    metrics = _metrics()
+    metrics.stages['fetch'] = 1.5
+    text = metrics.prometheus_text()
+    lines = text.splitlines()
+    assert '# TYPE golfdeals_fetch_requests_total counter' in lines
+    assert 'golfdeals_fetch_requests_total{host="gcw.example",status="304"} 1' in lines
+    assert 'golfdeals_fetch_cache_total{host="gcw.example",result="revalidated"} 1' in lines
+    assert 'golfdeals_fetch_latency_seconds{host="gcw.example",quantile="1"} 0.4' in lines
+    assert 'golfdeals_parse_failures_total{retailer="gt"} 2' in lines
+    assert 'golfdeals_stage_seconds{stage="fetch"} 1.5' in lines
+    assert 'golfdeals_warnings{} 3' in lines
+    assert text.endswith('\n')
+    # Every sample follows its metric's HELP and TYPE lines
+    names = {line.split()[2] for line in lines if line.startswith('# TYPE')}
+    assert all(line.split('{')[0] in names for line in lines if not line.startswith('#'))
@@ -0,0 +1,68 @@
+"""
+Parse Engine Tests
+Deals read from the fixture pages, with each extraction backend
+"""
+
+import functools
+
+import pytest
+from conftest import FIXTURE_NAMES, read_fixture, rules_for
+from make_fixtures import expected_deals
+
+from golfdeals import parsing
+from golfdeals.extract import BACKENDS, extract_text
+from golfdeals.metrics import RunMetrics
+
+URL = 'https://shop.example/sale/clearance/'
+
+
+@pytest.mark.parametrize('backend', [None, *BACKENDS])
+@pytest.mark.parametrize('name', FIXTURE_NAMES)
+def test_parse_output_per_backend(monkeypatch, name, backend):
+    if backend is not None:
+        monkeypatch.setattr(parsing, 'extract_text', functools.partial(extract_text, backend=backend))
+    result = parsing.parse_page(read_fixture(name), URL, rules_for(name))
+    expected = expected_deals(name)
+    found = [(deal.product_name, deal.sale_price) for deal in result.deals]
+
+    # GCW pages hold one record with a broken "Our Price" on purpose
+    assert len(found) + result.failures == len(expected)
+    assert set(found) <= set(expected)
+    assert result.failures == (1 if name.startswith('gcw') else 0)
+    for deal in result.deals:
+        assert deal.sku
+        assert deal.url.startswith('https://shop.example/') and deal.url != URL
+        assert deal.image.startswith('https://shop.example/')
+        assert 0 < deal.sale_price < deal.original_price
+
+
+def test_deals_link_to_their_own_tile():
+    result = parsing.parse_page(read_fixture('gcw_gloves.html'), URL, rules_for('gcw_gloves.html'))
+    for deal in result.deals:
+        assert deal.sku.lower() in deal.url
+        assert deal.sku in deal.image
+
+
+def test_root_relative_and_relative_links_resolve():
+    html = ('<div class="v-product" data-sku="A1"><a href="/a-p/a1.htm">A Glove</a>'
+            ' · Our Price: $20.00 · Sale Price: $10.00 · You save $10.00</div>'
+            '<div class="v-product" data-sku="B2"><a href="b-p/b2.htm">B Glove</a>'
+            ' · Our Price: $20.00 · Sale Price: $15.00 · You save $5.00</div>')
+    deals = parsing.parse_page(html, URL, rules_for('gcw')).deals
+    assert [deal.url for deal in deals] == ['https://shop.example/a-p/a1.htm',
+                                             'https://shop.example/sale/clearance/b-p/b2.htm']
+    assert [deal.discount_pct for deal in deals] == [50.0, 25.0]
+
+
+def test_pages_without_tiles_are_flagged_and_reported():
+    # A redesign drops the tile class: the page is still read, as one text
+    html = read_fixture('gcw_gloves.html').replace('v-product', 'product-card')
+    result = parsing.parse_page(html, URL, rules_for('gcw'))
+    assert result.untiled and result.deals
+    assert not parsing.parse_page(read_fixture('gcw_gloves.html'), URL, rules_for('gcw')).untiled
+
+    metrics = RunMetrics()
+    metrics.record_parse('gcw', URL, result)
+    summary = metrics.summary()
+    assert summary['parse']['gcw']['untiled_pages'] == 1
+    assert any('no product tiles on 1 page(s)' in warning for warning in summary['warnings'])
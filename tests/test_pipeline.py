@@ -0,0 +1,49 @@
+"""
+Parse Pool Tests
+Pages parsed in worker processes must come back as if parsed in-process
+"""
+
+import asyncio
+
+import pytest
+from conftest import FIXTURE_NAMES, read_fixture, rules_for
+
+from golfdeals.parsing import parse_page
+from golfdeals.pipeline import ParsePool
+
+URL = 'https://shop.example/sale/clearance/'
+
+
+def _names(result):
+    return [(deal.product_name, deal.sale_price, deal.url) for deal in result.deals]
+
+
+def test_pool_results_match_in_process_parsing():
+    pages = [(read_fixture(name), rules_for(name)) for name in FIXTURE_NAMES] * 3
+
+    async def parse_all(pool):
+        return await asyncio.gather(*(pool.parse(text, URL, rules) for text, rules in pages))
+
+    # More pages than workers plus queue slots, so parse has to wait for room
+    with ParsePool(workers=2, max_pending=1) as pool:
+        results = asyncio.run(parse_all(pool))
+        # The same pool serves a later event loop
+        again = asyncio.run(parse_all(pool))
+
+    expected = [_names(parse_page(text, URL, rules)) for text, rules in pages]
+    assert [_names(result) for result in results] == expected
+    assert [_names(result) for result in again] == expected
+    assert all(result.matches for result in results)
+
+
+def test_worker_errors_reach_the_caller_and_the_pool_keeps_going():
+    name = FIXTURE_NAMES[0]
+
+    async def parse_both(pool):
+        with pytest.raises(AttributeError):
+            await pool.parse(read_fixture(name), URL, None)
+        return await pool.parse(read_fixture(name), URL, rules_for(name))
+
+    with ParsePool(workers=1) as pool:
+        result = asyncio.run(parse_both(pool))
+    assert result.deals
@@ -0,0 +1,82 @@
+"""
+Publishing Tests
+Unchanged deals skip the dashboard, and the workflow is told whether anything changed
+"""
+
+import argparse
+import os
+
+import pytest
+
+from golfdeals import publish
+from golfdeals.records import Deal
+from golfdeals.snapshot import diff_deals
+
+
+def _deal(name, sale, original=60.0, source='GCW'):
+    return Deal(name, original, sale, original - sale, round((original - sale) / original * 100, 1),
+                f"https://gcw.example/{name}", source)
+
+
+DEALS = [_deal('pro-v1', 30.0), _deal('glove', 20.0), _deal('driver', 450.0, 500.0, 'Golf Town')]
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / 'github_output'
+    monkeypatch.setenv('GITHUB_OUTPUT', str(output))
+    return tmp_path / 'docs', output
+
+
+def _args(*argv):
+    parser = argparse.ArgumentParser()
+    publish.add_arguments(parser)
+    return parser.parse_args(['--no-history', *argv])
+
+
+def _runs(path):
+    """Each run's step outputs, as a dict"""
+    runs = []
+    for line in path.read_text().splitlines():
+        name, value = line.split('=', 1)
+        if name == 'changed':
+            runs.append({})
+        runs[-1][name] = value
+    return runs
+
+
+def test_unchanged_deals_skip_the_dashboard(docs):
+    directory, output = docs
+    assert publish.run(_args(), list(DEALS)) is True
+    index = directory / 'index.html'
+    built = index.stat().st_mtime_ns
+    os.utime(index, ns=(built - 10**9, built - 10**9))
+
+    # The same deals in another order are no change
+    assert publish.run(_args(), list(reversed(DEALS))) is False
+    assert index.stat().st_mtime_ns == built - 10**9
+
+    first, second = _runs(output)
+    assert first['changed'] == 'true' and first['added'] == '3'
+    assert second == {'changed': 'false', 'added': '0', 'removed': '0', 'price_changed': '0',
+                      'digest': first['digest']}
+
+
+def test_changed_or_forced_runs_rebuild(docs):
+    _, output = docs
+    publish.run(_args(), list(DEALS))
+    assert publish.run(_args('--force'), list(DEALS)) is True
+
+    repriced = [_deal('pro-v1', 25.0), *DEALS[1:], _deal('balls', 40.0)]
+    assert publish.run(_args(), repriced) is True
+    runs = _runs(output)
+    assert runs[1]['changed'] == 'false'
+    assert (runs[2]['changed'], runs[2]['added'], runs[2]['price_changed']) == ('true', '1', '1')
+
+
+def test_diff_ignores_order_and_float_formatting():
+    same = [_deal('glove', 20.0), _deal('pro-v1', 30.000000001)]
+    assert diff_deals(DEALS[:2], same).unchanged
+    diff = diff_deals(DEALS[:2], [_deal('pro-v1', 29.0)])
+    assert (diff.added, diff.removed, diff.changed) == ([], ['GCW|glove'], ['GCW|pro-v1'])
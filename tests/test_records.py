@@ -0,0 +1,63 @@
+"""
+Deal Record Tests
+DealBatch keeps every field of its deals and answers stats, tiers and ordering from its columns
+"""
+
+from golfdeals.records import Deal, DealBatch, product_key, tier_for
+
+
+def _deals():
+    return [
+        Deal('Pro V1', 60.0, 30.0, 30.0, 50, 'https://gcw.example/balls', 'GCW', 'p1', 'Balls',
+             'PV1', '/pv1.jpg', True),
+        Deal('Glove', 40.0, 28.0, 12.0, 30.0, 'https://gcw.example/gloves', 'GCW', category='Gloves'),
+        Deal('Driver', 500.0, 450.0, 50.0, 10, 'https://gt.example/clubs', 'Golf Town'),
+        Deal('Putter', 200.0, 140.0, 60.0, 30, 'https://gt.example/clubs', 'Golf Town'),
+        Deal('Tees', 10.0, 8.05, 1.95, 19.5, 'https://gcw.example/balls', 'GCW'),
+    ]
+
+
+def test_rows_read_back_as_the_deals_they_came_from():
+    batch = DealBatch(_deals())
+    assert len(batch) == 5
+    assert list(batch) == _deals()
+    # Whole-number discounts stay ints, so posts and exports print them the same way
+    assert [type(deal.discount_pct) for deal in batch] == [int, float, int, int, float]
+    assert DealBatch(batch).to_dicts() == [deal.to_dict() for deal in _deals()]
+    assert DealBatch([deal.to_dict() for deal in _deals()])[0] == _deals()[0]
+
+
+def test_repeated_strings_are_stored_once():
+    batch = DealBatch(_deals())
+    assert batch.sources == ['GCW', 'Golf Town']
+    assert batch.url_ids[0] == batch.url_ids[4] and batch.url_ids[2] == batch.url_ids[3]
+
+
+def test_tiers_and_stats():
+    assert [tier_for(pct) for pct in (80, 50, 49.9, 30, 20, 19.5, 0)] == [
+        'excellent', 'excellent', 'great', 'great', 'good', 'fair', 'fair']
+    batch = DealBatch(_deals())
+    assert batch.tier_counts() == {'excellent': 1, 'great': 2, 'good': 0, 'fair': 2}
+    stats = batch.stats()
+    assert stats['total_deals'] == 5
+    assert stats['avg_discount'] == (50 + 30 + 10 + 30 + 19.5) / 5
+    assert stats['max_discount'] == 50
+    assert stats['total_savings'] == 30 + 12 + 50 + 60 + 1.95
+    assert (stats['excellent_deals'], stats['great_deals']) == (1, 2)
+    assert DealBatch().stats() == {'total_deals': 0, 'avg_discount': 0, 'max_discount': 0,
+                                   'total_savings': 0, 'excellent_deals': 0, 'great_deals': 0,
+                                   'tiers': {'excellent': 0, 'great': 0, 'good': 0, 'fair': 0}}
+
+
+def test_ordering_by_discount_keeps_ties_in_order():
+    batch = DealBatch(_deals())
+    assert batch.order_by_discount() == [0, 1, 3, 4, 2]
+    assert [deal.product_name for deal in batch.sorted_by_discount()] == [
+        'Pro V1', 'Glove', 'Putter', 'Tees', 'Driver']
+
+
+def test_product_key_prefers_the_sku():
+    pro_v1, glove = _deals()[:2]
+    assert product_key(pro_v1) == 'GCW|PV1'
+    assert product_key(glove) == 'GCW|Glove'
+    assert product_key(glove.to_dict()) == 'GCW|Glove'
@@ -0,0 +1,68 @@
+"""
+Storage Tests
+Deal files round-trip, and NDJSON output survives a run that dies mid-write
+"""
+
+import json
+
+import pytest
+
+from golfdeals.records import Deal
+from golfdeals.storage import (NdjsonDealWriter, iter_ndjson_deals, iter_raw_deals, load_deals_json,
+                               load_raw_deals, save_deals_json, save_raw_deals)
+
+
+def _deals(n=3):
+    return [Deal(f"Glove {i}", 40.0, 20.0 + i, 20.0 - i, 50 - i, f"https://gcw.example/{i}", 'GCW',
+                 category='Gloves', sku=f"G{i}") for i in range(n)]
+
+
+def test_ndjson_writer_appends_one_line_per_deal(tmp_path):
+    path = str(tmp_path / 'out' / 'raw_deals.ndjson')
+    deals = _deals(5)
+    with NdjsonDealWriter(path) as writer:
+        writer.write(deals[:2])
+        # Every batch is on disk before the next one arrives
+        assert list(iter_ndjson_deals(path)) == deals[:2]
+        writer.write(deals[2:])
+        writer.write([])
+    assert writer.count == 5
+    with open(path) as f:
+        assert [json.loads(line)['sku'] for line in f] == ['G0', 'G1', 'G2', 'G3', 'G4']
+    assert list(iter_raw_deals(path)) == deals
+
+
+def test_ndjson_writer_starts_a_fresh_file(tmp_path):
+    path = str(tmp_path / 'raw_deals.ndjson')
+    with NdjsonDealWriter(path) as writer:
+        writer.write(_deals(3))
+    with NdjsonDealWriter(path) as writer:
+        writer.write(_deals(1))
+    assert len(list(iter_ndjson_deals(path))) == 1
+
+
+def test_reader_skips_a_truncated_last_line(tmp_path):
+    path = tmp_path / 'raw_deals.ndjson'
+    lines = [json.dumps(deal.to_dict()) for deal in _deals(2)]
+    path.write_text(lines[0] + '\n\n' + lines[1] + '\n' + lines[1][:25])
+    assert [deal.sku for deal in iter_ndjson_deals(str(path))] == ['G0', 'G1']
+
+
+def test_reader_rejects_a_broken_line_in_the_middle(tmp_path):
+    path = tmp_path / 'raw_deals.ndjson'
+    line = json.dumps(_deals(1)[0].to_dict())
+    path.write_text(line[:25] + '\n' + line + '\n')
+    with pytest.raises(ValueError):
+        list(iter_ndjson_deals(str(path)))
+
+
+def test_json_files_round_trip(tmp_path):
+    raw, published = str(tmp_path / 'raw_deals.json'), str(tmp_path / 'deals.json')
+    save_raw_deals(_deals(), raw, timestamp='2026-10-01T09:00:00')
+    assert load_raw_deals(raw) == _deals()
+    assert list(iter_raw_deals(raw)) == _deals()
+
+    save_deals_json(iter(_deals()), published)
+    assert load_deals_json(published) == _deals()
+    save_deals_json([], published)
+    assert load_deals_json(published) == []
@@ -0,0 +1,117 @@
+"""
+Watch Scheduler Tests
+Learned intervals and the rolling request budget, on a fake clock
+"""
+
+import pytest
+
+from golfdeals.watch import DAY, HOUR, RETRY_DELAY, PollScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _scheduler(tmp_path, clock, **kwargs):
+    kwargs.setdefault('min_interval', HOUR)
+    kwargs.setdefault('max_interval', 7 * DAY)
+    return PollScheduler(str(tmp_path / 'schedule.json'), clock=clock, **kwargs)
+
+
+def test_new_categories_are_due_at_once(tmp_path, clock):
+    scheduler = _scheduler(tmp_path, clock)
+    scheduler.add('a')
+    scheduler.add('b')
+    assert scheduler.wait_time() == 0
+    assert sorted(scheduler.pop_due()) == ['a', 'b']
+    assert scheduler.wait_time() is None
+
+
+def test_interval_halves_on_change_and_grows_when_unchanged(tmp_path, clock):
+    scheduler = _scheduler(tmp_path, clock)
+    scheduler.add('a')
+    scheduler.pop_due()
+    # The first check has nothing to compare with
+    assert scheduler.record('a', 'one', 1)
+    assert scheduler.states['a'].interval == DAY
+    assert scheduler.states['a'].next_due == clock.now + DAY
+
+    assert scheduler.record('a', 'two', 1)
+    assert scheduler.states['a'].interval == DAY / 2
+    assert not scheduler.record('a', 'two', 1)
+    assert scheduler.states['a'].interval == DAY * 0.75
+    assert scheduler.states['a'].changes == 1
+
+
+def test_interval_stays_within_bounds(tmp_path, clock):
+    scheduler = _scheduler(tmp_path, clock, min_interval=2 * HOUR, max_interval=2 * DAY)
+    scheduler.add('a')
+    for n in range(10):
+        scheduler.record('a', str(n), 1)
+    assert scheduler.states['a'].interval == 2 * HOUR
+    for _ in range(10):
+        scheduler.record('a', 'same', 1)
+    assert scheduler.states['a'].interval == 2 * DAY
+
+
+def test_failed_check_retries_sooner_without_learning(tmp_path, clock):
+    scheduler = _scheduler(tmp_path, clock)
+    scheduler.add('a')
+    scheduler.record('a', 'one', 1)
+    assert not scheduler.record('a', None, 1)
+    assert scheduler.states['a'].interval == DAY
+    assert scheduler.states['a'].digest == 'one'
+    assert scheduler.states['a'].next_due == clock.now + RETRY_DELAY
+
+
+def test_budget_holds_back_due_categories(tmp_path, clock):
+    scheduler = _scheduler(tmp_path, clock, budget=10)
+    for key in 'abc':
+        scheduler.add(key)
+    scheduler.states['a'].cost = 4
+    scheduler.states['b'].cost = 4
+    scheduler.states['c'].cost = 4
+
+    due = scheduler.pop_due()
+    assert len(due) == 2
+    for key in due:
+        scheduler.record(key, 'x', 4)
+    assert scheduler.spent() == 8
+
+    # The third check fits once the first requests are a day old
+    assert scheduler.wait_time() == DAY
+    assert scheduler.pop_due() == []
+    clock.now += DAY
+    assert scheduler.spent() == 0
+    # c has waited longest; a and b are due again but only one more fits
+    assert scheduler.pop_due() == ['c', 'a']
+
+
+def test_one_check_may_exceed_the_whole_budget(tmp_path, clock):
+    scheduler = _scheduler(tmp_path, clock, budget=2)
+    scheduler.add('big')
+    scheduler.states['big'].cost = 5
+    assert scheduler.pop_due() == ['big']
+
+
+def test_state_survives_a_restart(tmp_path, clock):
+    scheduler = _scheduler(tmp_path, clock)
+    scheduler.add('a')
+    scheduler.record('a', 'one', 3)
+    scheduler.record('a', 'two', 2)
+    scheduler.save()
+
+    restarted = _scheduler(tmp_path, clock)
+    restarted.add('a')
+    assert restarted.states['a'] == scheduler.states['a']
+    assert restarted.spent() == 5
+    assert restarted.wait_time() == DAY / 2